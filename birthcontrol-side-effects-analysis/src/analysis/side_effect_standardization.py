@@ -5,6 +5,8 @@ Shared standardization rules for side effect names across the project.
 This module ensures consistent naming conventions are applied in all scripts.
 """
 
+import re
+
 # Standardization rules for side effect names
 # Maps various forms to standardized canonical names
 STANDARDIZATION_RULES = {
@@ -57,6 +59,9 @@ STANDARDIZATION_RULES = {
     "menstrual pain": "painful periods"
 }
 
+# Case-insensitive view of the rules, built once at import
+_RULES_LOWER = {variant.lower(): canonical for variant, canonical in STANDARDIZATION_RULES.items()}
+
 def standardize_side_effect(side_effect_name: str) -> str:
     """
     Standardize a side effect name to its canonical form.
@@ -71,13 +76,31 @@ def standardize_side_effect(side_effect_name: str) -> str:
     if side_effect_name in STANDARDIZATION_RULES:
         return STANDARDIZATION_RULES[side_effect_name]
 
-    # Also check lowercase version
-    lower = side_effect_name.lower()
-    if lower in STANDARDIZATION_RULES:
-        return STANDARDIZATION_RULES[lower]
-
+    # Then match case-insensitively against every rule
     # Return original if no standardization rule found
-    return side_effect_name
+    return _RULES_LOWER.get(side_effect_name.lower(), side_effect_name)
+
+def variant_key(side_effect_name: str) -> str:
+    """
+    Grouping key for spelling variants of the same side effect name.
+
+    Lowercases, treats hyphens/underscores/slashes as spaces, collapses
+    whitespace and drops a plural "s" from the last word, so "Mood-Swing"
+    and "mood swings" share a key. Deliberately not fuzzy: near-identical
+    names like "increased libido" / "decreased libido" stay apart.
+
+    Args:
+        side_effect_name: The side effect name (ideally already standardized)
+
+    Returns:
+        Normalized key for grouping
+    """
+    words = [word for word in re.split(r'[\s\-_/]+', side_effect_name.lower()) if word]
+    if words:
+        last = words[-1]
+        if len(last) > 3 and last.endswith('s') and not last.endswith(('ss', 'us', 'is')):
+            words[-1] = last[:-1]
+    return ' '.join(words)
 
 def get_all_variants(canonical_name: str) -> list:
     """
@@ -14,62 +14,183 @@ import json
 import numpy as np
 import pandas as pd
 from scipy import stats
-from scipy.stats import spearmanr, chi2_contingency
+from scipy.stats import chi2_contingency
 from statsmodels.stats.multitest import multipletests
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; plots are only saved to disk
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _average_ranks(values):
+        """Rank values from 1..n, giving tied values their average rank."""
+        n = values.size
+        order = np.argsort(values, kind='mergesort')
+        ranks = np.empty(n, dtype=np.float64)
+
+        i = 0
+        while i < n:
+            j = i
+            while j + 1 < n and values[order[j + 1]] == values[order[i]]:
+                j += 1
+            average = 0.5 * (i + j) + 1.0
+            for k in range(i, j + 1):
+                ranks[order[k]] = average
+            i = j + 1
+
+        return ranks
+
+    @njit(cache=True)
+    def _spearman_rho_jit(x, y):
+        """Spearman ρ as the Pearson correlation of tie-averaged ranks."""
+        rank_x = _average_ranks(x)
+        rank_y = _average_ranks(y)
+        dx = rank_x - rank_x.mean()
+        dy = rank_y - rank_y.mean()
+        return (dx * dy).sum() / np.sqrt((dx * dx).sum() * (dy * dy).sum())
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """JSON encoder that converts NumPy scalars and arrays to Python types."""
+
+    def default(self, o):
+        if isinstance(o, np.integer):
+            return int(o)
+        if isinstance(o, np.floating):
+            return float(o)
+        if isinstance(o, np.bool_):
+            return bool(o)
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        return super().default(o)
+
 
 class StatisticalValidator:
     """Statistical validation of side effect discoveries."""
 
-    def __init__(self, validated_data_path: str):
+    def __init__(self, validated_data_path: str, stats_path: str = 'data/patterns/stats.json'):
         """
         Initialize with validated side effect data.
 
         Args:
             validated_data_path: Path to validated side effects database JSON
+            stats_path: Path to pattern stats JSON providing total_posts
         """
         if not os.path.exists(validated_data_path):
             raise FileNotFoundError(f"Validated data not found: {validated_data_path}")
 
-        with open(validated_data_path, 'r') as f:
-            self.data = json.load(f)
-
-        self.df = pd.DataFrame([
-            {
-                'side_effect': item['side_effect'],
-                'patient_frequency': item['reddit_data']['frequency'],
-                'mention_count': item['reddit_data']['mention_count'],
-                'post_count': item['reddit_data']['post_count'],
-                'paper_count': item['pubmed_data']['paper_count'],
-                'surprise_score': item['surprise_score'],
-                'evidence_tier': item['evidence_tier'],
-                'tier_label': item['tier_label'],
-                'category': item['reddit_data'].get('category', 'unknown')
-            }
-            for item in self.data
-        ])
+        if ORJSON_AVAILABLE:
+            with open(validated_data_path, 'rb') as f:
+                self.data = orjson.loads(f.read())
+        else:
+            with open(validated_data_path, 'r') as f:
+                self.data = json.load(f)
+
+        # Build the frame column-wise in a single pass over the records
+        columns = {
+            'side_effect': [],
+            'patient_frequency': [],
+            'mention_count': [],
+            'post_count': [],
+            'paper_count': [],
+            'surprise_score': [],
+            'evidence_tier': [],
+            'tier_label': [],
+            'category': []
+        }
+        for item in self.data:
+            reddit_data = item['reddit_data']
+            columns['side_effect'].append(item['side_effect'])
+            columns['patient_frequency'].append(reddit_data['frequency'])
+            columns['mention_count'].append(reddit_data['mention_count'])
+            columns['post_count'].append(reddit_data['post_count'])
+            columns['paper_count'].append(item['pubmed_data']['paper_count'])
+            columns['surprise_score'].append(item['surprise_score'])
+            columns['evidence_tier'].append(item['evidence_tier'])
+            columns['tier_label'].append(item['tier_label'])
+            columns['category'].append(reddit_data.get('category', 'unknown'))
+
+        self.df = pd.DataFrame(columns)
+
+        self.total_posts = self._load_total_posts(stats_path)
 
         print(f"✓ Loaded {len(self.df)} validated side effects")
 
-    def spearman_correlation_analysis(self):
+    @staticmethod
+    def _load_total_posts(stats_path: str, default: int = 537) -> int:
+        """Read total_posts from the pattern stats file, falling back to a default."""
+        try:
+            with open(stats_path, 'r') as f:
+                stats_json = json.load(f)
+            return stats_json.get('total_posts', default)
+        except (OSError, ValueError):
+            return default
+
+    def _column_arrays(self):
+        """
+        Extract the columns used by the analyses as NumPy arrays.
+
+        run_full_analysis builds this once and passes it to each test, so
+        the DataFrame is only touched a single time.
+        """
+        return {
+            'side_effect': self.df['side_effect'].to_numpy(),
+            'patient_frequency': self.df['patient_frequency'].to_numpy(),
+            'paper_count': self.df['paper_count'].to_numpy(),
+            'surprise_score': self.df['surprise_score'].to_numpy(),
+            'mention_count': self.df['mention_count'].to_numpy(dtype=int),
+            'evidence_tier': self.df['evidence_tier'].to_numpy()
+        }
+
+    def spearman_correlation_analysis(self, arrays=None):
         """
         Calculate Spearman correlation between patient frequency and research coverage.
 
         Similar to EDS approach comparing Reddit mentions vs PubMed coverage.
+
+        Args:
+            arrays: Optional precomputed column arrays from _column_arrays()
         """
+        if arrays is None:
+            arrays = self._column_arrays()
+
         print("\n" + "=" * 70)
         print("📊 Spearman Correlation Analysis")
         print("=" * 70)
 
         # Extract frequencies
-        patient_freq = self.df['patient_frequency'].values
-        research_coverage = self.df['paper_count'].values
+        patient_freq = arrays['patient_frequency']
+        research_coverage = arrays['paper_count']
+
+        # Spearman ρ is undefined for constant or non-finite inputs, so skip
+        # the ranking and the plot rather than reporting NaN
+        skip_reason = self._degenerate_input_reason(patient_freq, research_coverage)
+        if skip_reason:
+            print(f"\n  ⚠️  Skipping correlation: {skip_reason}")
+            return {
+                'spearman_rho': float('nan'),
+                'p_value': float('nan'),
+                'significant': False,
+                'skipped': skip_reason
+            }
 
-        # Calculate Spearman correlation
-        correlation, p_value = spearmanr(patient_freq, research_coverage)
+        # Calculate Spearman correlation (Pearson correlation on ranks)
+        correlation, p_value = self._spearman(patient_freq, research_coverage)
 
         print(f"\nPatient Frequency vs Research Coverage:")
         print(f"  Spearman ρ = {correlation:.4f}")
@@ -105,42 +226,87 @@ class StatisticalValidator:
             'significant': p_value < 0.05
         }
 
+    @staticmethod
+    def _degenerate_input_reason(x, y):
+        """Return why x/y cannot be correlated, or None if they can."""
+        if len(x) < 3:
+            return "fewer than 3 side effects"
+        if not (np.isfinite(x).all() and np.isfinite(y).all()):
+            return "non-finite input"
+        if np.ptp(x) == 0 or np.ptp(y) == 0:
+            return "constant input"
+        return None
+
+    @staticmethod
+    def _spearman(x, y):
+        """
+        Spearman ρ and two-sided p-value, computed from ranks.
+
+        Equivalent to scipy.stats.spearmanr for 1-D inputs, but skips its
+        masked-array handling and derives the p-value directly from the
+        t statistic t = ρ * sqrt((n - 2) / (1 - ρ²)). When numba is
+        installed, ρ comes from a JIT-compiled kernel.
+        """
+        if NUMBA_AVAILABLE:
+            x = np.asarray(x, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            correlation = float(_spearman_rho_jit(x, y))
+        else:
+            correlation = float(np.corrcoef(stats.rankdata(x), stats.rankdata(y))[0, 1])
+
+        n = len(x)
+        dof = n - 2
+        if dof <= 0 or np.isnan(correlation):
+            return correlation, float('nan')
+
+        denom = max(1.0 - correlation ** 2, 1e-300)
+        t_stat = correlation * np.sqrt(dof / denom)
+        p_value = float(2 * stats.t.sf(abs(t_stat), dof))
+
+        return correlation, p_value
+
     def _plot_correlation(self, x, y, correlation, p_value):
         """Plot correlation with regression line."""
         os.makedirs('data/analysis', exist_ok=True)
 
-        plt.figure(figsize=(10, 6))
-        plt.scatter(x, y, alpha=0.6, s=100, c='steelblue')
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.scatter(x, y, alpha=0.6, s=100, c='steelblue')
 
-        # Add regression line
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
-        plt.plot(x, p(x), "r--", alpha=0.8, linewidth=2, label='Trend line')
+        # Add regression line (undefined when x is constant)
+        if np.ptp(x) > 0:
+            z = np.polyfit(x, y, 1)
+            p = np.poly1d(z)
+            ax.plot(x, p(x), "r--", alpha=0.8, linewidth=2, label='Trend line')
+            ax.legend()
 
-        plt.xlabel('Patient Report Frequency', fontsize=12)
-        plt.ylabel('Number of Research Papers', fontsize=12)
-        plt.title(f'Patient Reports vs Research Coverage\nSpearman ρ = {correlation:.4f}, p = {p_value:.4f}',
-                  fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.3)
-        plt.legend()
+        ax.set_xlabel('Patient Report Frequency', fontsize=12)
+        ax.set_ylabel('Number of Research Papers', fontsize=12)
+        ax.set_title(f'Patient Reports vs Research Coverage\nSpearman ρ = {correlation:.4f}, p = {p_value:.4f}',
+                     fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
 
         # Save plot
-        plt.tight_layout()
-        plt.savefig('data/analysis/correlation_analysis.png', dpi=300)
+        fig.savefig('data/analysis/correlation_analysis.png', dpi=150, bbox_inches='tight')
         print(f"\n💾 Saved correlation plot to data/analysis/correlation_analysis.png")
-        plt.close()
+        plt.close(fig)
 
-    def surprise_score_distribution_test(self):
+    def surprise_score_distribution_test(self, arrays=None):
         """
         Test if surprise scores differ significantly from expected distribution.
 
         Uses chi-square goodness of fit test.
+
+        Args:
+            arrays: Optional precomputed column arrays from _column_arrays()
         """
+        if arrays is None:
+            arrays = self._column_arrays()
+
         print("\n" + "=" * 70)
         print("📊 Surprise Score Distribution Analysis")
         print("=" * 70)
 
-        surprise_scores = self.df['surprise_score'].values
+        surprise_scores = arrays['surprise_score']
 
         # Categorize surprise scores
         low = sum(surprise_scores < 0.1)
@@ -179,32 +345,45 @@ class StatisticalValidator:
             }
         }
 
-    def evidence_tier_contingency_test(self):
+    def evidence_tier_contingency_test(self, arrays=None):
         """
         Test association between evidence tier and surprise score category.
 
         Uses chi-square contingency test.
+
+        Args:
+            arrays: Optional precomputed column arrays from _column_arrays()
         """
+        if arrays is None:
+            arrays = self._column_arrays()
+
         print("\n" + "=" * 70)
         print("📊 Evidence Tier vs Surprise Score Analysis")
         print("=" * 70)
 
-        # Create contingency table
-        tiers = self.df['evidence_tier'].values
-        surprise_cats = pd.cut(
-            self.df['surprise_score'],
-            bins=[-np.inf, 0.1, 0.3, np.inf],
-            labels=['Low', 'Medium', 'High']
+        # Create contingency table: tiers as rows, surprise categories
+        # Low (<= 0.1), Medium (0.1-0.3], High (> 0.3) as columns
+        tier_idx, tiers = pd.factorize(arrays['evidence_tier'], sort=True)
+        surprise_idx = np.searchsorted([0.1, 0.3], arrays['surprise_score'], side='left')
+
+        counts = np.zeros((len(tiers), 3), dtype=np.int64)
+        np.add.at(counts, (tier_idx, surprise_idx), 1)
+
+        # Keep only surprise categories that were observed
+        observed = counts.any(axis=0)
+        counts = counts[:, observed]
+        contingency_table = pd.DataFrame(
+            counts,
+            index=pd.Index(tiers, name='evidence_tier'),
+            columns=pd.Index(np.array(['Low', 'Medium', 'High'])[observed], name='surprise_score')
         )
-
-        contingency_table = pd.crosstab(tiers, surprise_cats)
         print(f"\nContingency Table:")
         print(contingency_table)
 
         # Chi-square test (if table has enough data)
         if contingency_table.size >= 4:
             try:
-                chi2, p_value, dof, expected = chi2_contingency(contingency_table)
+                chi2, p_value, dof, expected = chi2_contingency(counts)
 
                 print(f"\nChi-square contingency test:")
                 print(f"  χ² = {chi2:.4f}")
@@ -236,32 +415,29 @@ class StatisticalValidator:
                 'contingency_table': contingency_table.to_dict()
             }
 
-    def multiple_testing_correction(self):
+    def multiple_testing_correction(self, arrays=None):
         """
         Apply Bonferroni correction for multiple comparisons.
 
         Addresses the issue that running many tests increases false positive rate.
+
+        Args:
+            arrays: Optional precomputed column arrays from _column_arrays()
         """
+        if arrays is None:
+            arrays = self._column_arrays()
+
         print("\n" + "=" * 70)
         print("📊 Multiple Testing Correction (Bonferroni)")
         print("=" * 70)
 
-        # Get total posts from data
-        try:
-            with open('data/patterns/stats.json', 'r') as f:
-                stats = json.load(f)
-                total_posts = stats.get('total_posts', 537)
-        except:
-            total_posts = 537
-
-        mean_freq = self.df['patient_frequency'].mean()
+        total_posts = self.total_posts
+        freqs = arrays['patient_frequency']
+        mean_freq = freqs.mean()
 
         # One-sample binomial test for each side effect against mean
         p_values = []
-        for _, row in self.df.iterrows():
-            freq = row['patient_frequency']
-            n_mentions = row['mention_count']
-
+        for n_mentions in arrays['mention_count'].tolist():
             # Using binomial test (more appropriate for proportions)
             p_val = stats.binom_test(n_mentions, total_posts, mean_freq, alternative='two-sided')
             p_values.append(p_val)
@@ -275,24 +451,27 @@ class StatisticalValidator:
             method='bonferroni'
         )
 
+        n_rejected = int(rejected.sum())
+
         print(f"\nMultiple Testing Results:")
         print(f"  Total tests: {len(p_values)}")
         print(f"  Significant before correction: {sum(p_values < 0.05)}")
-        print(f"  Significant after Bonferroni: {sum(rejected)}")
+        print(f"  Significant after Bonferroni: {n_rejected}")
 
         # Show significant side effects
-        if sum(rejected) > 0:
+        sig_idx = np.nonzero(rejected)[0]
+        significant_side_effects = arrays['side_effect'][sig_idx].tolist()
+
+        if n_rejected > 0:
             print(f"\n  Side effects significantly different from mean frequency:")
-            for i, (side_effect, is_sig) in enumerate(zip(self.df['side_effect'], rejected)):
-                if is_sig:
-                    freq = self.df.iloc[i]['patient_frequency']
-                    print(f"    - {side_effect}: {freq*100:.2f}% (p_adj < 0.05)")
+            for side_effect, freq in zip(significant_side_effects, freqs[sig_idx]):
+                print(f"    - {side_effect}: {freq*100:.2f}% (p_adj < 0.05)")
 
         return {
             'n_tests': len(p_values),
-            'n_significant_uncorrected': int(sum(p_values < 0.05)),
-            'n_significant_corrected': int(sum(rejected)),
-            'significant_side_effects': self.df[rejected]['side_effect'].tolist()
+            'n_significant_uncorrected': int((p_values < 0.05).sum()),
+            'n_significant_corrected': n_rejected,
+            'significant_side_effects': significant_side_effects
         }
 
     def run_full_analysis(self):
@@ -303,21 +482,29 @@ class StatisticalValidator:
 
         results = {}
 
+        # Extract the analysis columns once and share them across tests
+        arrays = self._column_arrays()
+
         # Run all tests
-        results['correlation'] = self.spearman_correlation_analysis()
-        results['surprise_distribution'] = self.surprise_score_distribution_test()
-        results['tier_contingency'] = self.evidence_tier_contingency_test()
-        results['multiple_testing'] = self.multiple_testing_correction()
+        results['correlation'] = self.spearman_correlation_analysis(arrays)
+        results['surprise_distribution'] = self.surprise_score_distribution_test(arrays)
+        results['tier_contingency'] = self.evidence_tier_contingency_test(arrays)
+        results['multiple_testing'] = self.multiple_testing_correction(arrays)
 
         # Save results
         os.makedirs('data/analysis', exist_ok=True)
 
-        with open('data/analysis/statistical_validation_results.json', 'w') as f:
-            # Convert numpy types to Python types for JSON serialization
-            results_serializable = json.loads(
-                json.dumps(results, default=lambda x: float(x) if isinstance(x, (np.floating, np.integer)) else x)
-            )
-            json.dump(results_serializable, f, indent=2)
+        output_path = 'data/analysis/statistical_validation_results.json'
+        if ORJSON_AVAILABLE:
+            # orjson serializes numpy scalars natively; tier keys are ints
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    results,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(results, f, indent=2, cls=NumpyJSONEncoder)
 
         print("\n" + "=" * 70)
         print("📊 Analysis Complete!")
@@ -16,9 +16,46 @@ This is the SAME technique Amazon uses for "Customers who bought X also bought Y
 
 from typing import List, Dict, Tuple, Set
 from collections import Counter, defaultdict
-from itertools import combinations
+from itertools import chain, combinations
 import json
 
+import numpy as np
+import pandas as pd
+
+try:
+    from mlxtend.frequent_patterns import fpgrowth
+    MLXTEND_AVAILABLE = True
+except ImportError:
+    MLXTEND_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Upper bound on posts × candidates × words cells broadcast at once when
+# counting support, so large candidate levels are processed in chunks
+SUPPORT_CHUNK_CELLS = 1 << 24
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _count_supports_jit(post_masks, candidate_masks, out):
+        """Native subset-test loop, parallel over candidates."""
+        n_posts, n_words = post_masks.shape
+        for j in prange(candidate_masks.shape[0]):
+            count = 0
+            for i in range(n_posts):
+                contained = True
+                for w in range(n_words):
+                    if (post_masks[i, w] & candidate_masks[j, w]) != candidate_masks[j, w]:
+                        contained = False
+                        break
+                if contained:
+                    count += 1
+            out[j] = count
+
 
 class AssociationRulesMiner:
     """
@@ -76,13 +113,17 @@ class AssociationRulesMiner:
         print(f"📊 Mining patterns from {total_posts} posts with symptoms...")
 
         # Step 2: Calculate support for individual symptoms
-        symptom_counts = Counter()
-        for symptom_set in symptom_sets:
-            for symptom in symptom_set:
-                symptom_counts[symptom] += 1
+        symptom_counts = Counter(chain.from_iterable(symptom_sets))
 
         # Step 3: Find frequent itemsets (pairs, triplets, etc.)
-        frequent_itemsets = self._find_frequent_itemsets(symptom_sets, symptom_counts)
+        symptom_ids = {symptom: i for i, symptom in enumerate(sorted(symptom_counts))}
+        if MLXTEND_AVAILABLE:
+            # FP-growth (no candidate generation) when mlxtend is installed
+            frequent_itemsets = self._find_frequent_itemsets_fpgrowth(symptom_sets, symptom_ids)
+        else:
+            # Otherwise Apriori over per-post symptom bitmasks
+            post_masks = self._encode_symptom_sets(symptom_sets, symptom_ids)
+            frequent_itemsets = self._find_frequent_itemsets(post_masks, symptom_counts, symptom_ids)
 
         print(f"✓ Found {len(frequent_itemsets)} frequent symptom combinations")
 
@@ -96,15 +137,45 @@ class AssociationRulesMiner:
 
         return rules
 
+    @staticmethod
+    def _one_hot(
+        symptom_sets: List[Set[str]],
+        symptom_ids: Dict[str, int],
+        n_columns: int
+    ) -> np.ndarray:
+        """Boolean (posts, n_columns) matrix with True where a post mentions a symptom."""
+        onehot = np.zeros((len(symptom_sets), n_columns), dtype=bool)
+        for row, symptom_set in enumerate(symptom_sets):
+            onehot[row, [symptom_ids[symptom] for symptom in symptom_set]] = True
+        return onehot
+
+    @staticmethod
+    def _encode_symptom_sets(
+        symptom_sets: List[Set[str]],
+        symptom_ids: Dict[str, int]
+    ) -> np.ndarray:
+        """
+        Encode symptom sets as rows of uint64 bitmask words.
+
+        Bit i of a row is set when the post mentions symptom i, so a
+        vocabulary of V symptoms needs (V + 63) // 64 words per post.
+        """
+        n_words = max(1, (len(symptom_ids) + 63) // 64)
+        onehot = AssociationRulesMiner._one_hot(symptom_sets, symptom_ids, n_words * 64)
+        packed = np.packbits(onehot, axis=1, bitorder='little')
+        return packed.view('<u8').astype(np.uint64)
+
     def _find_frequent_itemsets(
         self,
-        symptom_sets: List[Set[str]],
-        symptom_counts: Counter
+        post_masks: np.ndarray,
+        symptom_counts: Counter,
+        symptom_ids: Dict[str, int]
     ) -> Dict[Tuple[str, ...], int]:
         """
         Find all symptom combinations that meet minimum support threshold.
 
-        This implements a simplified Apriori algorithm.
+        This implements a simplified Apriori algorithm. A post supports a
+        candidate when (post_mask & candidate_mask) == candidate_mask.
         """
         frequent_itemsets = {}
 
@@ -120,24 +191,74 @@ class AssociationRulesMiner:
             if not candidates:
                 break  # No more candidates
 
-            # Count support for each candidate
-            for symptom_set in symptom_sets:
-                for candidate in candidates:
-                    if set(candidate).issubset(symptom_set):
-                        if candidate not in frequent_itemsets:
-                            frequent_itemsets[candidate] = 0
-                        frequent_itemsets[candidate] += 1
-
-            # Remove candidates below minimum support
-            to_remove = [
-                itemset for itemset, count in frequent_itemsets.items()
-                if len(itemset) == k and count < self.min_support
-            ]
-            for itemset in to_remove:
-                del frequent_itemsets[itemset]
+            # Count support for every candidate at once, keeping only frequent ones
+            candidate_masks = self._encode_symptom_sets(candidates, symptom_ids)
+            supports = self._count_supports(post_masks, candidate_masks)
+
+            for candidate, support in zip(candidates, supports.tolist()):
+                if support >= self.min_support:
+                    frequent_itemsets[candidate] = support
 
         return frequent_itemsets
 
+    def _find_frequent_itemsets_fpgrowth(
+        self,
+        symptom_sets: List[Set[str]],
+        symptom_ids: Dict[str, int]
+    ) -> Dict[Tuple[str, ...], int]:
+        """
+        Find frequent itemsets with mlxtend's FP-growth.
+
+        Returns the same mapping as _find_frequent_itemsets: sorted symptom
+        tuples (up to 5 symptoms) to the number of posts containing them.
+        """
+        total_posts = len(symptom_sets)
+        # fpgrowth rejects a relative support above 1 (Apriori just finds nothing)
+        if self.min_support > total_posts:
+            return {}
+
+        onehot = pd.DataFrame(
+            self._one_hot(symptom_sets, symptom_ids, len(symptom_ids)),
+            columns=list(symptom_ids)
+        )
+
+        frequent = fpgrowth(
+            onehot,
+            min_support=self.min_support / total_posts,
+            use_colnames=True,
+            max_len=5
+        )
+
+        return {
+            tuple(sorted(itemset)): int(round(support * total_posts))
+            for support, itemset in zip(frequent['support'], frequent['itemsets'])
+        }
+
+    @staticmethod
+    def _count_supports(post_masks: np.ndarray, candidate_masks: np.ndarray) -> np.ndarray:
+        """
+        Count how many posts contain each candidate itemset.
+
+        Uses the numba kernel when available. Otherwise broadcasts
+        (posts, 1, words) against (1, candidates, words) and sums the subset
+        test over posts, chunking candidates to bound memory.
+        """
+        if NUMBA_AVAILABLE:
+            supports = np.empty(len(candidate_masks), dtype=np.int64)
+            _count_supports_jit(post_masks, candidate_masks, supports)
+            return supports
+
+        n_posts, n_words = post_masks.shape
+        chunk_size = max(1, SUPPORT_CHUNK_CELLS // max(1, n_posts * n_words))
+
+        supports = np.empty(len(candidate_masks), dtype=np.int64)
+        for start in range(0, len(candidate_masks), chunk_size):
+            block = candidate_masks[start:start + chunk_size]
+            hits = np.all((post_masks[:, None, :] & block[None, :, :]) == block[None, :, :], axis=2)
+            supports[start:start + chunk_size] = hits.sum(axis=0)
+
+        return supports
+
     def _generate_candidates(
         self,
         frequent_itemsets: Dict[Tuple[str, ...], int],
@@ -147,23 +268,33 @@ class AssociationRulesMiner:
         Generate candidate k-itemsets from (k-1)-itemsets.
 
         Example: From ['acne'], ['hair_loss'] → generate ['acne', 'hair_loss']
-        """
-        # Get all (k-1)-itemsets
-        prev_itemsets = [
-            itemset for itemset in frequent_itemsets.keys()
-            if len(itemset) == k - 1
-        ]
-
-        # Combine pairs that share (k-2) items
-        candidates = set()
-        for i in range(len(prev_itemsets)):
-            for j in range(i + 1, len(prev_itemsets)):
-                # Merge two itemsets
-                merged = tuple(sorted(set(prev_itemsets[i]) | set(prev_itemsets[j])))
-                if len(merged) == k:
-                    candidates.add(merged)
 
-        return list(candidates)
+        Uses the classic Apriori join: two sorted (k-1)-itemsets are merged
+        only when they share their first k-2 symptoms, so each candidate is
+        generated exactly once. Candidates with an infrequent (k-1)-subset
+        are pruned, since they cannot meet minimum support.
+        """
+        # Group (k-1)-itemsets by their shared (k-2)-prefix
+        prefix_groups = defaultdict(list)
+        for itemset in frequent_itemsets:
+            if len(itemset) == k - 1:
+                prefix_groups[itemset[:-1]].append(itemset[-1])
+
+        candidates = []
+        for prefix, tails in prefix_groups.items():
+            tails.sort()
+            for i, first in enumerate(tails):
+                for second in tails[i + 1:]:
+                    candidate = prefix + (first, second)
+
+                    # Apriori pruning: every (k-1)-subset must be frequent
+                    if all(
+                        candidate[:j] + candidate[j + 1:] in frequent_itemsets
+                        for j in range(k - 2)
+                    ):
+                        candidates.append(candidate)
+
+        return candidates
 
     def _generate_rules(
         self,
@@ -174,6 +305,9 @@ class AssociationRulesMiner:
         """
         Generate association rules from frequent itemsets.
 
+        Itemset keys must be sorted tuples (as produced by both itemset
+        finders), so every antecedent/consequent split is a direct lookup.
+
         For each itemset like {A, B, C}, generate rules:
         - A → B, C
         - B → A, C
@@ -189,30 +323,23 @@ class AssociationRulesMiner:
 
             # Try all possible splits into antecedent → consequent
             for i in range(1, len(itemset)):
-                # Generate all combinations of size i as antecedent
-                for antecedent_tuple in combinations(itemset, i):
-                    antecedent = set(antecedent_tuple)
-                    consequent = set(itemset) - antecedent
+                # Generate all combinations of size i as antecedent. Itemsets
+                # are sorted tuples, so both sides are already valid keys.
+                for antecedent in combinations(itemset, i):
+                    antecedent_set = set(antecedent)
+                    consequent = tuple(item for item in itemset if item not in antecedent_set)
 
                     # Calculate metrics
-                    antecedent_support = frequent_itemsets.get(tuple(sorted(antecedent)), 0)
+                    antecedent_support = frequent_itemsets.get(antecedent)
+                    consequent_support = frequent_itemsets.get(consequent)
 
-                    if antecedent_support == 0:
+                    if not antecedent_support or not consequent_support:
                         continue
 
                     confidence = support_count / antecedent_support
 
                     # Calculate lift
-                    consequent_prob = sum(
-                        freq for items, freq in frequent_itemsets.items()
-                        if set(items) == consequent
-                    ) / total_posts if len(consequent) == 1 else (
-                        frequent_itemsets.get(tuple(sorted(consequent)), 0) / total_posts
-                    )
-
-                    if consequent_prob == 0:
-                        continue
-
+                    consequent_prob = consequent_support / total_posts
                     lift = confidence / consequent_prob
 
                     # Filter by thresholds
@@ -248,11 +375,8 @@ class AssociationRulesMiner:
             if len(symptoms) >= min_cluster_size:
                 symptom_sets.append(symptoms)
 
-        # Count exact matches
-        cluster_counts = Counter()
-        for symptom_set in symptom_sets:
-            # Convert to sorted tuple for hashing
-            cluster_counts[tuple(sorted(symptom_set))] += 1
+        # Count exact matches (sorted tuples for hashing)
+        cluster_counts = Counter(tuple(sorted(symptom_set)) for symptom_set in symptom_sets)
 
         # Filter and format
         clusters = [
@@ -282,32 +406,33 @@ class AssociationRulesMiner:
             "edges": [{"source": "A", "target": "B", "weight": lift}, ...]
         }
         """
-        # Build nodes (unique symptoms)
-        symptoms = set()
-        symptom_frequency = Counter()
-
-        for rule in rules:
-            for symptom in rule['antecedent'] + rule['consequent']:
-                symptoms.add(symptom)
-                symptom_frequency[symptom] += rule['support']
-
+        rules_df = pd.DataFrame(
+            rules,
+            columns=['antecedent', 'consequent', 'support', 'confidence', 'lift']
+        )
+
+        # Build nodes (unique symptoms), weighted by the support of every
+        # rule they appear in
+        appearances = pd.concat([
+            rules_df[['antecedent', 'support']].explode('antecedent')
+                .rename(columns={'antecedent': 'id'}),
+            rules_df[['consequent', 'support']].explode('consequent')
+                .rename(columns={'consequent': 'id'})
+        ])
+        node_frequency = appearances.groupby('id', sort=False)['support'].sum()
         nodes = [
-            {"id": symptom, "frequency": symptom_frequency[symptom]}
-            for symptom in symptoms
+            {"id": symptom, "frequency": int(frequency)}
+            for symptom, frequency in node_frequency.items()
         ]
 
-        # Build edges (relationships)
-        edges = []
-        for rule in rules:
-            for ant in rule['antecedent']:
-                for cons in rule['consequent']:
-                    edges.append({
-                        "source": ant,
-                        "target": cons,
-                        "weight": rule['lift'],
-                        "confidence": rule['confidence'],
-                        "support": rule['support']
-                    })
+        # Build edges (relationships): one per antecedent × consequent pair
+        edges = (
+            rules_df.explode('antecedent')
+            .explode('consequent')
+            .rename(columns={'antecedent': 'source', 'consequent': 'target', 'lift': 'weight'})
+            [['source', 'target', 'weight', 'confidence', 'support']]
+            .to_dict(orient='records')
+        )
 
         graph_data = {"nodes": nodes, "edges": edges}
 
@@ -34,9 +34,11 @@ class Config:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 
+    # NCBI E-utilities (optional; raises PubMed rate limit to 10 requests/sec)
+    NCBI_API_KEY = os.getenv('NCBI_API_KEY')
+
     # Data Collection Settings
     MAX_POSTS_PER_SUBREDDIT = int(os.getenv('MAX_POSTS_PER_SUBREDDIT', 100))
-    RATE_LIMIT_DELAY = float(os.getenv('RATE_LIMIT_DELAY', 2.0))
 
     # Project paths
     PROJECT_ROOT = project_root
@@ -44,6 +46,7 @@ class Config:
     RAW_DATA_DIR = DATA_DIR / 'raw'
     PROCESSED_DATA_DIR = DATA_DIR / 'processed'
     INTERIM_DATA_DIR = DATA_DIR / 'interim'
+    CACHE_DIR = DATA_DIR / 'cache'
     OUTPUTS_DIR = project_root / 'outputs'
 
     @classmethod
@@ -58,7 +61,6 @@ class Config:
         """Print a summary of the configuration without sensitive data."""
         print(f"Reddit credentials are configured: {cls.validate_reddit_credentials()}")
         print(f"Max posts per subreddit: {cls.MAX_POSTS_PER_SUBREDDIT}")
-        print(f"Rate limit delay: {cls.RATE_LIMIT_DELAY}")
         print(f"Data directory paths:")
         print(f"  Raw data: {cls.RAW_DATA_DIR}")
         print(f"  Processed data: {cls.PROCESSED_DATA_DIR}")
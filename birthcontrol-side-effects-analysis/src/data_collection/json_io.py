@@ -0,0 +1,69 @@
+"""
+JSON I/O Helpers
+================
+JSON reading and atomic JSON / JSON Lines writing shared by the collectors
+and validators (with orjson when available).
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def read_json(path):
+    """Load a JSON file (with orjson when available)."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def json_bytes(data, indent: bool = True) -> bytes:
+    """Serialize data as UTF-8 JSON, indented by 2 unless indent is False (with orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+@contextmanager
+def atomic_open(path, mode: str):
+    """
+    Open a temporary sibling of path for writing and move it into place on success.
+
+    Readers never see a half-written file, and a failed write leaves any
+    previous version untouched.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path, data, indent: bool = True):
+    """Atomically write data as UTF-8 JSON (with orjson when available)."""
+    with atomic_open(path, 'wb') as f:
+        f.write(json_bytes(data, indent))
+
+
+def write_jsonl(path, records: List[Dict]):
+    """Atomically write records as JSON Lines (one compact object per line)."""
+    if ORJSON_AVAILABLE:
+        with atomic_open(path, 'wb') as f:
+            f.writelines(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
+        return
+    with atomic_open(path, 'w') as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
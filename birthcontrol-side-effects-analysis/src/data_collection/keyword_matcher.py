@@ -0,0 +1,79 @@
+"""
+Keyword Matcher
+===============
+Single-pass multi-keyword matching shared by the Reddit collector and the
+evidence validators.
+"""
+
+import re
+from typing import Iterator, List
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a word character for whole-word keyword matching."""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    Finds which keywords appear in a text (case-insensitively).
+
+    With pyahocorasick installed all keywords are matched in a single
+    pass over the text; otherwise each keyword is searched with its own
+    precompiled regex. whole_words=False also matches keywords inside
+    longer words (e.g. "pain" in "painful").
+    """
+
+    def __init__(self, keywords: List[str], whole_words: bool = True):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.whole_words = whole_words
+
+        # pyahocorasick can't search an automaton with no words
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            boundary = r'\b' if whole_words else ''
+            self._patterns = [
+                (keyword, re.compile(boundary + re.escape(keyword) + boundary))
+                for keyword in self.keywords
+            ]
+
+    def _iter_found(self, text: str) -> Iterator[str]:
+        """Yield keywords as they are found in (lowercased) text; may repeat."""
+        if self._automaton is None:
+            for keyword, pattern in self._patterns:
+                if pattern.search(text):
+                    yield keyword
+            return
+
+        last = len(text) - 1
+        for end, keyword in self._automaton.iter(text):
+            if self.whole_words:
+                start = end - len(keyword) + 1
+                if ((start > 0 and _is_word_char(text[start - 1])) or
+                        (end < last and _is_word_char(text[end + 1]))):
+                    continue
+            yield keyword
+
+    def match(self, text: str) -> List[str]:
+        """Return the keywords found in text, in keyword-list order."""
+        if not self.keywords:
+            return []
+        found = set(self._iter_found(text.lower()))
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def contains_any(self, text: str) -> bool:
+        """Whether text contains any of the keywords (stops at the first match)."""
+        if not self.keywords:
+            return False
+        return next(self._iter_found(text.lower()), None) is not None
@@ -7,12 +7,173 @@ for birth control side effect relationships.
 PubMed E-utilities API: https://www.ncbi.nlm.nih.gov/books/NBK25501/
 """
 
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 from datetime import datetime
-import xml.etree.ElementTree as ET
+from urllib.parse import urlencode
+from lxml import etree as ET
+
+try:
+    from .rate_limiter import TokenBucket
+except ImportError:
+    # Running as a script
+    from rate_limiter import TokenBucket
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Prevalence mentions like "67% of patients" or "73% prevalence"
+PREVALENCE_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*%\s*(?:of\s+)?(?:patients?|women|users?|subjects?|individuals?|participants?)?'
+)
+# Birth control terms that make a prevalence mention relevant
+BIRTH_CONTROL_PATTERN = re.compile(r'birth control|contraceptive')
+
+# Elements read from each PubmedArticle, collected in one subtree walk
+ARTICLE_FIELD_TAGS = ('PMID', 'ArticleTitle', 'AbstractText', 'Author', 'Year', 'Title', 'ArticleId')
+
+
+def _extract_article(article) -> Dict:
+    """
+    Extract paper fields from a PubmedArticle element.
+
+    Walks the article subtree once for all field elements instead of one
+    .find() per field; the first match in document order wins, as with find().
+    """
+    found = {}
+    abstract_parts = None
+    authors = []
+    authors_seen = 0
+
+    for node in article.iter(ARTICLE_FIELD_TAGS):
+        tag = node.tag
+
+        if tag == 'AbstractText':
+            if abstract_parts is None:
+                abstract_parts = []
+            if node.text:
+                abstract_parts.append(node.text)
+
+        elif tag == 'Author':
+            # First 3 authors
+            if authors_seen < 3:
+                authors_seen += 1
+                last_name = node.find("LastName")
+                first_name = node.find("ForeName")
+                if last_name is not None:
+                    name = last_name.text
+                    if first_name is not None:
+                        name = f"{first_name.text} {name}"
+                    authors.append(name)
+
+        elif tag == 'Year':
+            if node.getparent().tag == 'PubDate':
+                found.setdefault('year', node.text)
+        elif tag == 'Title':
+            if node.getparent().tag == 'Journal':
+                found.setdefault('journal', node.text)
+        elif tag == 'ArticleId':
+            if node.get('IdType') == 'doi':
+                found.setdefault('doi', node.text)
+        else:
+            found.setdefault(tag, node.text)
+
+    pmid = found.get('PMID')
+
+    return {
+        "pmid": pmid,
+        "title": found.get('ArticleTitle', "No title"),
+        "abstract": " ".join(abstract_parts) if abstract_parts is not None else None,
+        "authors": authors,
+        "year": found.get('year'),
+        "journal": found.get('journal'),
+        "doi": found.get('doi'),
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+    }
+
+
+def _parse_efetch_xml(source: Union[bytes, BinaryIO]) -> Tuple[List[Dict], bool]:
+    """
+    Parse PubMed XML response into structured data.
+
+    Articles are parsed incrementally with lxml's iterparse and cleared
+    once extracted, so memory stays flat regardless of batch size.
+    Defined at module level so worker processes can run it.
+
+    Args:
+        source: EFetch XML as bytes, or a binary stream (e.g. response.raw)
+
+    Returns:
+        (paper dictionaries, whether the whole document parsed); a truncated
+        document keeps the articles read before the break but must not be cached
+    """
+    papers = []
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    try:
+        context = ET.iterparse(source, events=('end',), tag='PubmedArticle')
+
+        for _, article in context:
+            papers.append(_extract_article(article))
+
+            # Free the parsed article and any already-processed siblings
+            article.clear(keep_tail=True)
+            while article.getprevious() is not None:
+                del article.getparent()[0]
+
+    except ET.ParseError as e:
+        print(f"   ⚠️  XML parsing error: {e}")
+        return papers, False
+
+    return papers, True
+
+
+class _RateLimitedRetry(Retry):
+    """urllib3 Retry that takes a token from the fetcher's bucket before each resend."""
+
+    def __init__(self, *args, bucket: Optional[TokenBucket] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bucket = bucket
+
+    def new(self, **kw) -> "_RateLimitedRetry":
+        retry = super().new(**kw)
+        retry.bucket = self.bucket
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.bucket is not None:
+            self.bucket.acquire()
 
 
 class PubMedFetcher:
@@ -25,17 +186,132 @@ class PubMedFetcher:
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None):
+    # Cache lifetimes (seconds) for ESearch PMID lists and parsed EFetch papers
+    SEARCH_CACHE_TTL = 24 * 60 * 60
+    FETCH_CACHE_TTL = 7 * 24 * 60 * 60
+
+    # NCBI's recommended maximum number of PMIDs per EFetch request
+    EFETCH_BATCH_SIZE = 200
+
+    # Async retries on throttling / server errors, mirroring the session's Retry
+    ASYNC_RETRY_STATUSES = (429, 500, 502, 503, 504)
+    ASYNC_MAX_RETRIES = 3
+
+    # Worker threads for concurrent requests when aiohttp isn't in use
+    REQUEST_THREADS = 8
+
+    # Downloaded EFetch XML (bytes) above which parsing is spread across worker
+    # processes; below it (every current caller) parsing in-process is faster
+    # than starting the pool
+    PARSE_PROCESS_MIN_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None,
+                 redis_url: Optional[str] = None, cache_dir: Optional[str] = None):
         """
         Initialize PubMed fetcher.
 
         Args:
             api_key: Optional NCBI API key for higher rate limits
+                (defaults to the NCBI_API_KEY environment variable)
             email: Your email (NCBI requests this for courtesy)
+            redis_url: Optional Redis URL for caching responses
+                (defaults to the REDIS_URL environment variable)
+            cache_dir: Optional directory for caching responses on disk
+                when Redis isn't configured
         """
-        self.api_key = api_key
+        self.api_key = api_key or os.getenv("NCBI_API_KEY")
         self.email = email
-        self.rate_limit_delay = 0.34 if api_key else 0.34  # ~3 requests/sec without key
+        # NCBI allows 10 requests/sec with a key, 3 without
+        self.rate_limit_delay = 0.1 if self.api_key else 0.34
+        # One bucket for every request this fetcher makes (sync, threaded or
+        # async); capacity 1 so there's never a burst above NCBI's rate
+        self._bucket = TokenBucket(capacity=1, refill_rate=1 / self.rate_limit_delay)
+
+        # Failed or truncated requests so far. Failures come back as empty
+        # results, so callers compare this before and after a lookup to tell
+        # "no papers" apart from "couldn't fetch" (e.g. before caching)
+        self.request_errors = 0
+        self._error_lock = threading.Lock()
+
+        # Shared session: keeps the connection to NCBI alive between calls
+        # and retries transient failures with backoff (resends count
+        # against the same rate limit as first attempts)
+        self.session = requests.Session()
+        retry = _RateLimitedRetry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                                  bucket=self._bucket)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        self.session.headers.update({"Accept-Encoding": "gzip"})
+
+        # Optional Redis response cache, shared across runs
+        self.cache = None
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url and REDIS_AVAILABLE:
+            self.cache = redis.Redis(connection_pool=redis.ConnectionPool.from_url(redis_url))
+        self.cache_dir = cache_dir
+
+    def _record_error(self) -> None:
+        """Count a failed or truncated request (thread-safe)."""
+        with self._error_lock:
+            self.request_errors += 1
+
+    def _cache_key(self, kind: str, params: Dict[str, str]) -> str:
+        """Build a cache key from request parameters (credentials excluded)."""
+        items = sorted((k, v) for k, v in params.items() if k not in ("api_key", "email"))
+        return f"pm:{kind}:" + hashlib.sha1(urlencode(items).encode()).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Return a cached value, or None on a miss or if no cache is configured."""
+        if self.cache is None:
+            return self._disk_cache_get(key)
+        try:
+            hit = self.cache.get(key)
+        except redis.RedisError:
+            return None
+        if hit is None:
+            return None
+        return orjson.loads(hit) if ORJSON_AVAILABLE else json.loads(hit)
+
+    def _cache_set(self, key: str, ttl: int, value) -> None:
+        """Store a value in the cache, ignoring Redis errors."""
+        if self.cache is None:
+            self._disk_cache_set(key, ttl, value)
+            return
+        try:
+            self.cache.setex(key, ttl, orjson.dumps(value) if ORJSON_AVAILABLE else json.dumps(value))
+        except redis.RedisError:
+            pass
+
+    def _disk_cache_path(self, key: str) -> str:
+        """Cache file for a key (one JSON file per request)."""
+        return os.path.join(self.cache_dir, key.replace(":", "_") + ".json")
+
+    def _disk_cache_get(self, key: str):
+        """Return an unexpired value from the disk cache, or None."""
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._disk_cache_path(key), "rb") as f:
+                entry = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires", 0) < time.time():
+            return None
+        return entry.get("value")
+
+    def _disk_cache_set(self, key: str, ttl: int, value) -> None:
+        """Write a value to the disk cache atomically, ignoring I/O errors."""
+        if self.cache_dir is None:
+            return
+        entry = {"expires": time.time() + ttl, "value": value}
+        path = self._disk_cache_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(entry) if ORJSON_AVAILABLE else json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
 
     def search_papers(self, query: str, max_results: int = 20,
                      min_year: Optional[int] = None) -> List[str]:
@@ -50,8 +326,41 @@ class PubMedFetcher:
         Returns:
             List of PubMed IDs (PMIDs)
         """
+        return self._search_papers(query, max_results, min_year)
+
+    def _search_papers(self, query: str, max_results: int, min_year: Optional[int]) -> List[str]:
+        """ESearch for one query, rate limited by the fetcher's token bucket (thread-safe)."""
         print(f"🔍 Searching PubMed: '{query}'")
 
+        params = self._search_params(query, max_results, min_year)
+
+        cache_key = self._cache_key("search", params)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(f"   Found {len(cached)} papers (cached)")
+            return cached
+
+        try:
+            self._bucket.acquire()
+            response = self.session.get(f"{self.BASE_URL}/esearch.fcgi", params=params)
+            response.raise_for_status()
+
+            data = response.json()
+            pmids = data.get("esearchresult", {}).get("idlist", [])
+
+            print(f"   Found {len(pmids)} papers")
+            self._cache_set(cache_key, self.SEARCH_CACHE_TTL, pmids)
+
+            return pmids
+
+        except Exception as e:
+            print(f"   ❌ Error searching PubMed: {e}")
+            self._record_error()
+            return []
+
+    def _search_params(self, query: str, max_results: int,
+                       min_year: Optional[int] = None) -> Dict[str, str]:
+        """Build ESearch query parameters."""
         # Build query with date filter if provided
         if min_year:
             query = f"({query}) AND {min_year}:3000[pdat]"
@@ -59,7 +368,7 @@ class PubMedFetcher:
         params = {
             "db": "pubmed",
             "term": query,
-            "retmax": max_results,
+            "retmax": str(max_results),
             "retmode": "json",
             "sort": "relevance"
         }
@@ -69,22 +378,76 @@ class PubMedFetcher:
         if self.email:
             params["email"] = self.email
 
-        try:
-            response = requests.get(f"{self.BASE_URL}/esearch.fcgi", params=params)
-            response.raise_for_status()
+        return params
 
-            data = response.json()
-            pmids = data.get("esearchresult", {}).get("idlist", [])
+    async def _asearch(self, session, query: str, max_results: int,
+                       min_year: Optional[int]) -> List[str]:
+        """Async ESearch for one query, rate limited by the fetcher's token bucket."""
+        params = self._search_params(query, max_results, min_year)
 
-            print(f"   Found {len(pmids)} papers")
-            time.sleep(self.rate_limit_delay)
+        cache_key = self._cache_key("search", params)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(f"🔍 Searched PubMed: '{query}' → {len(cached)} papers (cached)")
+            return cached
+
+        try:
+            for attempt in range(self.ASYNC_MAX_RETRIES + 1):
+                await self._bucket.acquire_async()
+                async with session.get(f"{self.BASE_URL}/esearch.fcgi", params=params) as response:
+                    if (response.status in self.ASYNC_RETRY_STATUSES
+                            and attempt < self.ASYNC_MAX_RETRIES):
+                        # Exponential backoff: 0.5s, 1s, 2s (capped at 8s)
+                        await asyncio.sleep(min(0.5 * 2 ** attempt, 8))
+                        continue
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                    break
 
+            pmids = data.get("esearchresult", {}).get("idlist", [])
+            print(f"🔍 Searched PubMed: '{query}' → {len(pmids)} papers")
+            self._cache_set(cache_key, self.SEARCH_CACHE_TTL, pmids)
             return pmids
 
         except Exception as e:
-            print(f"   ❌ Error searching PubMed: {e}")
+            print(f"   ❌ Error searching PubMed for '{query}': {e}")
+            self._record_error()
             return []
 
+    async def _search_all_async(self, queries: List[str], max_results: int,
+                                min_year: Optional[int]) -> List[List[str]]:
+        """Run all ESearch queries concurrently under NCBI's request rate."""
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(*[
+                self._asearch(session, query, max_results, min_year)
+                for query in queries
+            ])
+
+    def search_papers_many(self, queries: List[str], max_results: int = 20,
+                           min_year: Optional[int] = None) -> List[List[str]]:
+        """
+        Search PubMed for several queries, concurrently when possible.
+
+        Uses aiohttp when installed and no event loop is already running
+        (e.g. inside Jupyter); otherwise runs the requests on a thread pool.
+        Either way every request takes a token from the fetcher's bucket, so
+        the combined rate stays within NCBI's limit across calls.
+
+        Returns:
+            One list of PMIDs per query, in query order
+        """
+        if AIOHTTP_AVAILABLE:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._search_all_async(queries, max_results, min_year))
+
+        with ThreadPoolExecutor(max_workers=self.REQUEST_THREADS) as executor:
+            return list(executor.map(
+                lambda query: self._search_papers(query, max_results, min_year),
+                queries
+            ))
+
     def fetch_paper_details(self, pmids: List[str]) -> List[Dict]:
         """
         Fetch detailed information for a list of PubMed IDs.
@@ -100,6 +463,17 @@ class PubMedFetcher:
 
         print(f"📄 Fetching details for {len(pmids)} papers...")
 
+        if len(pmids) <= self.EFETCH_BATCH_SIZE:
+            return self._fetch_batch(pmids)
+
+        batches = [
+            pmids[i:i + self.EFETCH_BATCH_SIZE]
+            for i in range(0, len(pmids), self.EFETCH_BATCH_SIZE)
+        ]
+        return self._fetch_batches(batches)
+
+    def _efetch_params(self, pmids: List[str]) -> Dict[str, str]:
+        """Build EFetch query parameters."""
         # EFetch returns XML, we'll parse it
         params = {
             "db": "pubmed",
@@ -112,94 +486,112 @@ class PubMedFetcher:
         if self.email:
             params["email"] = self.email
 
-        try:
-            response = requests.get(f"{self.BASE_URL}/efetch.fcgi", params=params)
-            response.raise_for_status()
+        return params
+
+    def _fetch_batch(self, pmids: List[str]) -> List[Dict]:
+        """Fetch and parse a single EFetch batch, streaming the response."""
+        params = self._efetch_params(pmids)
 
-            # Parse XML response
-            papers = self._parse_pubmed_xml(response.text)
+        cache_key = self._cache_key("fetch", params)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            print(f"   ✓ Fetched {len(cached)} paper details (cached)")
+            return cached
+
+        try:
+            self._bucket.acquire()
+            # Stream the body straight into the parser instead of buffering it
+            with self.session.get(f"{self.BASE_URL}/efetch.fcgi", params=params, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                papers, complete = _parse_efetch_xml(response.raw)
 
             print(f"   ✓ Fetched {len(papers)} paper details")
-            time.sleep(self.rate_limit_delay)
+            if complete:
+                self._cache_set(cache_key, self.FETCH_CACHE_TTL, papers)
+            else:
+                self._record_error()
 
             return papers
 
         except Exception as e:
             print(f"   ❌ Error fetching paper details: {e}")
+            self._record_error()
             return []
 
-    def _parse_pubmed_xml(self, xml_text: str) -> List[Dict]:
+    def _fetch_batches(self, batches: List[List[str]]) -> List[Dict]:
         """
-        Parse PubMed XML response into structured data.
-
-        Args:
-            xml_text: XML response from EFetch
+        Fetch several EFetch batches.
 
-        Returns:
-            List of paper dictionaries
+        Uncached batches are downloaded concurrently on a thread pool under the
+        fetcher's token bucket (NCBI's rate limit). The XML is parsed in-process,
+        or across worker processes once it exceeds PARSE_PROCESS_MIN_BYTES.
         """
-        papers = []
-
-        try:
-            root = ET.fromstring(xml_text)
-
-            for article in root.findall(".//PubmedArticle"):
-                paper = {}
-
-                # PMID
-                pmid = article.find(".//PMID")
-                paper["pmid"] = pmid.text if pmid is not None else None
-
-                # Title
-                title = article.find(".//ArticleTitle")
-                paper["title"] = title.text if title is not None else "No title"
-
-                # Abstract
-                abstract_parts = article.findall(".//AbstractText")
-                if abstract_parts:
-                    abstract = " ".join([
-                        part.text for part in abstract_parts
-                        if part.text
-                    ])
-                    paper["abstract"] = abstract
+        results = [None] * len(batches)
+        to_download = {}  # batch index -> (cache key, params)
+
+        for i, batch in enumerate(batches):
+            params = self._efetch_params(batch)
+            cache_key = self._cache_key("fetch", params)
+
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                to_download[i] = (cache_key, params)
+
+        def download(i: int, params: Dict[str, str]) -> Optional[bytes]:
+            try:
+                self._bucket.acquire()
+                response = self.session.get(f"{self.BASE_URL}/efetch.fcgi", params=params)
+                response.raise_for_status()
+                return response.content
+            except Exception as e:
+                print(f"   ❌ Error fetching paper details (batch {i + 1}/{len(batches)}): {e}")
+                self._record_error()
+                return None
+
+        pending = {}  # batch index -> (cache key, XML bytes)
+        if to_download:
+            with ThreadPoolExecutor(max_workers=min(len(to_download), self.REQUEST_THREADS)) as executor:
+                contents = executor.map(
+                    lambda item: download(item[0], item[1][1]),
+                    to_download.items()
+                )
+                for (i, (cache_key, _)), content in zip(to_download.items(), contents):
+                    if content is None:
+                        results[i] = []
+                    else:
+                        pending[i] = (cache_key, content)
+
+        if pending:
+            xml_batches = [xml for _, xml in pending.values()]
+            workers = min(len(pending), os.cpu_count() or 1)
+
+            if workers > 1 and sum(len(xml) for xml in xml_batches) >= self.PARSE_PROCESS_MIN_BYTES:
+                # Spawned rather than forked: this process has just run a thread pool
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context("spawn")) as executor:
+                    parsed = list(executor.map(_parse_efetch_xml, xml_batches))
+            else:
+                parsed = [_parse_efetch_xml(xml) for xml in xml_batches]
+
+            for (i, (cache_key, _)), (papers, complete) in zip(pending.items(), parsed):
+                results[i] = papers
+                if complete:
+                    self._cache_set(cache_key, self.FETCH_CACHE_TTL, papers)
                 else:
-                    paper["abstract"] = None
-
-                # Authors
-                authors = article.findall(".//Author")
-                author_list = []
-                for author in authors[:3]:  # First 3 authors
-                    last_name = author.find("LastName")
-                    first_name = author.find("ForeName")
-                    if last_name is not None:
-                        name = last_name.text
-                        if first_name is not None:
-                            name = f"{first_name.text} {name}"
-                        author_list.append(name)
-                paper["authors"] = author_list
-
-                # Publication year
-                pub_date = article.find(".//PubDate/Year")
-                paper["year"] = pub_date.text if pub_date is not None else None
-
-                # Journal
-                journal = article.find(".//Journal/Title")
-                paper["journal"] = journal.text if journal is not None else None
+                    self._record_error()
 
-                # DOI
-                doi_elem = article.find(".//ArticleId[@IdType='doi']")
-                paper["doi"] = doi_elem.text if doi_elem is not None else None
-
-                # PubMed URL
-                paper["url"] = f"https://pubmed.ncbi.nlm.nih.gov/{paper['pmid']}/"
-
-                papers.append(paper)
-
-        except ET.ParseError as e:
-            print(f"   ⚠️  XML parsing error: {e}")
+        papers = list(chain.from_iterable(results))
+        print(f"   ✓ Fetched {len(papers)} paper details")
 
         return papers
 
+    def _parse_pubmed_xml(self, source: Union[bytes, BinaryIO]) -> List[Dict]:
+        """Parse PubMed EFetch XML (bytes or binary stream) into paper dictionaries."""
+        return _parse_efetch_xml(source)[0]
+
     def search_side_effect_birth_control_relationship(self, side_effect: str,
                                                      max_results: int = 10) -> List[Dict]:
         """
@@ -212,28 +604,75 @@ class PubMedFetcher:
         Returns:
             List of paper details
         """
+        queries = self._relationship_queries(side_effect)
+        results = self.search_papers_many(queries, max_results=max_results, min_year=2010)
+
+        # Fetch details for unique PMIDs
+        pmids_list = self._merge_pmids(results, max_results)
+        papers = self.fetch_paper_details(pmids_list)
+
+        return papers
+
+    def batch_search(self, side_effects: List[str],
+                     max_results: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Search for papers about many side effects with as few requests as possible.
+
+        All ESearch queries run together (concurrently when aiohttp is
+        installed), then the union of PMIDs is fetched with one EFetch per
+        EFETCH_BATCH_SIZE PMIDs instead of one EFetch per side effect.
+
+        Args:
+            side_effects: Side effect names
+            max_results: Max papers per side effect
+
+        Returns:
+            Dict mapping each side effect to its paper details
+            (same papers as search_side_effect_birth_control_relationship)
+        """
+        side_effects = list(dict.fromkeys(side_effects))
+        query_groups = [self._relationship_queries(side_effect) for side_effect in side_effects]
+
+        results = self.search_papers_many(
+            [query for queries in query_groups for query in queries],
+            max_results=max_results,
+            min_year=2010
+        )
+
+        pmids_by_side_effect = {}
+        offset = 0
+        for side_effect, queries in zip(side_effects, query_groups):
+            pmids_by_side_effect[side_effect] = self._merge_pmids(
+                results[offset:offset + len(queries)], max_results
+            )
+            offset += len(queries)
+
+        all_pmids = list(dict.fromkeys(chain.from_iterable(pmids_by_side_effect.values())))
+        papers_by_pmid = {paper["pmid"]: paper for paper in self.fetch_paper_details(all_pmids)}
+
+        return {
+            side_effect: [papers_by_pmid[pmid] for pmid in pmids if pmid in papers_by_pmid]
+            for side_effect, pmids in pmids_by_side_effect.items()
+        }
+
+    @staticmethod
+    def _relationship_queries(side_effect: str) -> List[str]:
+        """ESearch queries pairing a side effect with birth control terms."""
         # Build comprehensive search query
         # Try different birth control terms
-        queries = [
+        return [
             f'("birth control" OR "contraceptive" OR "oral contraceptive" OR "hormonal contraception") AND "{side_effect}"',
             f'"combined oral contraceptive" AND "{side_effect}"',
             f'("COC pill" OR "hormonal IUD" OR "progestin") AND "{side_effect}"'
         ]
 
-        all_pmids = set()
-
-        for query in queries:
-            pmids = self.search_papers(query, max_results=max_results, min_year=2010)
-            all_pmids.update(pmids)
-
-            if len(all_pmids) >= max_results:
-                break
-
-        # Fetch details for unique PMIDs
-        pmids_list = list(all_pmids)[:max_results]
-        papers = self.fetch_paper_details(pmids_list)
-
-        return papers
+    @staticmethod
+    def _merge_pmids(results: List[List[str]], max_results: int) -> List[str]:
+        """Unique PMIDs in query order (the first query is the broadest)."""
+        all_pmids = {}
+        for pmids in results:
+            all_pmids.update(dict.fromkeys(pmids))
+        return list(all_pmids)[:max_results]
 
     def extract_prevalence_data(self, paper: Dict, side_effect: str) -> Optional[Dict]:
         """
@@ -252,25 +691,20 @@ class PubMedFetcher:
         abstract = paper["abstract"].lower()
         side_effect_lower = side_effect.lower()
 
-        # Simple pattern matching for prevalence
+        # Simple pattern matching for prevalence (precompiled at module load)
         # Look for: "67% of patients", "73% prevalence", etc.
-        import re
-
-        # Pattern: number + % + context
-        pattern = r'(\d+(?:\.\d+)?)\s*%\s*(?:of\s+)?(?:patients?|women|users?|subjects?|individuals?|participants?)?'
-        matches = re.finditer(pattern, abstract)
-
         prevalence_data = []
-        for match in matches:
-            # Get surrounding context
+        for match in PREVALENCE_PATTERN.finditer(abstract):
+            # Search the surrounding context in place; only slice it out
+            # for mentions that are kept
             start = max(0, match.start() - 50)
             end = min(len(abstract), match.end() + 50)
-            context = abstract[start:end]
 
-            if side_effect_lower in context or "birth control" in context or "contraceptive" in context:
+            if (abstract.find(side_effect_lower, start, end) != -1
+                    or BIRTH_CONTROL_PATTERN.search(abstract, start, end)):
                 prevalence_data.append({
                     "percentage": float(match.group(1)),
-                    "context": context.strip()
+                    "context": abstract[start:end].strip()
                 })
 
         if prevalence_data:
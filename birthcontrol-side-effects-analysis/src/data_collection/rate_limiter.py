@@ -0,0 +1,82 @@
+"""
+Rate Limiters
+=============
+Token bucket rate limiters shared by the Reddit and PubMed collectors.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Tokens refill continuously at `refill_rate` per second up to `capacity`;
+    acquire() only sleeps when the bucket is empty, so time already spent
+    processing a post counts towards the rate limit. Safe to share
+    between threads, and between threads and asyncio tasks via acquire_async().
+    """
+
+    def __init__(self, capacity: float = 60, refill_rate: float = 1.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: float = 1) -> float:
+        """Consume n tokens (going into debt if needed); return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+            self._last_refill = now
+
+            self._tokens -= n
+            return max(0.0, -self._tokens / self.refill_rate)
+
+    def acquire(self, n: float = 1) -> None:
+        """Block until n tokens are available, then consume them."""
+        delay = self.reserve(n)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, n: float = 1) -> None:
+        """Wait (without blocking the event loop) until n tokens are available, then consume them."""
+        delay = self.reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter for asyncio tasks.
+
+    Tokens refill continuously at `rate` per second up to `capacity`
+    (1 by default, so there is no initial burst above `rate`); acquire()
+    waits only as long as needed for the next token, so concurrent
+    requests share a single global request rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: float = 1) -> None:
+        """Wait until n tokens are available, then consume them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+
+                await asyncio.sleep((n - self._tokens) / self.rate)
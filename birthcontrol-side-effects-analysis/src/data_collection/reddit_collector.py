@@ -10,18 +10,41 @@ LEARNING CONCEPTS:
 - Structured data extraction
 """
 
+import asyncio
+import hashlib
+import pickle
 import praw
 import json
-import time
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from tqdm import tqdm
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import asyncpraw
+    ASYNCPRAW_AVAILABLE = True
+except ImportError:
+    ASYNCPRAW_AVAILABLE = False
+
 # Add parent directory to path to import config
 sys.path.append(str(Path(__file__).parent.parent))
 from config import Config
+from data_collection.rate_limiter import AsyncTokenBucket, TokenBucket
+from data_collection.keyword_matcher import KeywordMatcher
 
 
 class RedditCollector:
@@ -32,8 +55,14 @@ class RedditCollector:
     In ML/AI projects, separating data collection from processing is crucial.
     """
 
-    def __init__(self):
-        """Initialize Reddit API connection with authentication."""
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize Reddit API connection with authentication.
+
+        Args:
+            use_cache: Reuse search results saved earlier the same day
+                (stored under Config.CACHE_DIR)
+        """
 
         # Validate credentials before attempting connection
         if not Config.validate_reddit_credentials():
@@ -55,6 +84,11 @@ class RedditCollector:
             read_only=True
         )
 
+        # Reddit allows 60 requests/minute for OAuth clients
+        self._bucket = TokenBucket(capacity=60, refill_rate=1.0)
+
+        self.cache_dir = Config.CACHE_DIR if use_cache else None
+
         print(f"✓ Connected to Reddit as: {self.reddit.user.me() if not self.reddit.read_only else 'Read-Only User'}")
 
     def search_subreddit(
@@ -87,13 +121,23 @@ class RedditCollector:
         # Create search query combining keywords with OR
         # Example: "(depression OR anxiety OR mood)"
         search_query = ' OR '.join(keywords)
+        keyword_matcher = KeywordMatcher(keywords)
+        # One collection timestamp for the whole search batch
+        collected_at = datetime.now().isoformat()
 
         print(f"\n📊 Searching r/{subreddit_name} for: {search_query}")
         print(f"   Limit: {max_posts} posts | Time: {time_filter}")
 
+        cache_path = self._search_cache_path(subreddit_name, search_query, max_posts, time_filter)
+        cached_posts = self._load_cached_search(cache_path)
+        if cached_posts is not None:
+            print(f"✓ Loaded {len(cached_posts)} cached posts for r/{subreddit_name}")
+            return cached_posts
+
         try:
             # Search returns a generator - efficient for large datasets
             # We use .search() instead of .hot() or .new() for keyword filtering
+            self._bucket.acquire()
             search_results = subreddit.search(
                 search_query,
                 limit=max_posts,
@@ -106,22 +150,179 @@ class RedditCollector:
 
                 # Extract structured data from the post
                 # This is the first step in any NLP pipeline: data structuring
-                post_data = self._extract_post_data(post)
+                post_data = self._extract_post_data(
+                    post, keyword_matcher=keyword_matcher, collected_at=collected_at
+                )
                 collected_posts.append(post_data)
 
-                # ETHICAL CONSIDERATION: Rate limiting
-                # Reddit API has rate limits. We add delays to be respectful.
-                # This also prevents overwhelming the server.
-                time.sleep(Config.RATE_LIMIT_DELAY)
+            print(f"✓ Collected {len(collected_posts)} posts from r/{subreddit_name}")
+            self._save_cached_search(cache_path, collected_posts)
+
+        except Exception as e:
+            print(f"✗ Error collecting from r/{subreddit_name}: {e}")
+
+        return collected_posts
+
+    def _search_cache_path(
+        self,
+        subreddit_name: str,
+        search_query: str,
+        max_posts: int,
+        time_filter: str
+    ) -> Optional[Path]:
+        """
+        Cache file for a search, or None when caching is disabled.
+
+        LEARNING: Development caching
+        - Re-running the collector the same day reuses the saved results
+          instead of repeating every Reddit request
+        - Keys include today's date, so results refresh daily
+        """
+        if self.cache_dir is None:
+            return None
+
+        query_hash = hashlib.sha1(search_query.encode('utf-8')).hexdigest()[:16]
+        key = f"{subreddit_name.lower()}_{query_hash}_{time_filter}_{max_posts}_{date.today().isoformat()}"
+        return self.cache_dir / f"reddit_search_{key}.pkl"
+
+    @staticmethod
+    def _load_cached_search(cache_path: Optional[Path]) -> Optional[List[Dict]]:
+        """Load cached search results, or None on a miss."""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"  Warning: Could not read cache {cache_path.name}: {e}")
+            return None
+
+    @staticmethod
+    def _save_cached_search(cache_path: Optional[Path], posts: List[Dict]):
+        """Save search results for reuse later the same day."""
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(posts, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"  Warning: Could not write cache {cache_path.name}: {e}")
+
+    def collect_subreddits(
+        self,
+        subreddit_names: List[str],
+        keywords: List[str],
+        max_posts: int = 100,
+        time_filter: str = 'all'
+    ) -> List[List[Dict]]:
+        """
+        Search several subreddits, concurrently when asyncpraw is installed.
+
+        LEARNING: Concurrent I/O
+        - Collection is mostly waiting on the network, so the subreddits
+          are searched at the same time with asyncio
+        - A single shared token bucket keeps the combined request rate
+          within Reddit's limit
+
+        Args:
+            subreddit_names: Subreddits to search
+            keywords: List of keywords to search for
+            max_posts: Maximum number of posts to collect per subreddit
+            time_filter: 'all', 'year', 'month', 'week', 'day'
+
+        Returns:
+            One list of post dictionaries per subreddit, in input order
+        """
+        if ASYNCPRAW_AVAILABLE:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(
+                    self._collect_subreddits_async(subreddit_names, keywords, max_posts, time_filter)
+                )
+
+        return [
+            self.search_subreddit(name, keywords, max_posts=max_posts, time_filter=time_filter)
+            for name in subreddit_names
+        ]
+
+    async def _collect_subreddits_async(
+        self,
+        subreddit_names: List[str],
+        keywords: List[str],
+        max_posts: int,
+        time_filter: str
+    ) -> List[List[Dict]]:
+        """Search all subreddits concurrently through one asyncpraw session."""
+        # Reddit allows 60 requests/minute for OAuth clients, shared by all tasks
+        bucket = AsyncTokenBucket(rate=1.0, capacity=60)
+
+        async with asyncpraw.Reddit(
+            client_id=Config.REDDIT_CLIENT_ID,
+            client_secret=Config.REDDIT_CLIENT_SECRET,
+            user_agent=Config.REDDIT_USER_AGENT,
+            read_only=True
+        ) as reddit:
+            return await asyncio.gather(*[
+                self._asearch_subreddit(reddit, bucket, name, keywords, max_posts, time_filter)
+                for name in subreddit_names
+            ])
+
+    async def _asearch_subreddit(
+        self,
+        reddit,
+        bucket: AsyncTokenBucket,
+        subreddit_name: str,
+        keywords: List[str],
+        max_posts: int,
+        time_filter: str
+    ) -> List[Dict]:
+        """Async version of search_subreddit using a shared asyncpraw client."""
+        collected_posts = []
+        search_query = ' OR '.join(keywords)
+        keyword_matcher = KeywordMatcher(keywords)
+        # One collection timestamp for the whole search batch
+        collected_at = datetime.now().isoformat()
+
+        print(f"\n📊 Searching r/{subreddit_name} for: {search_query}")
+        print(f"   Limit: {max_posts} posts | Time: {time_filter}")
+
+        cache_path = self._search_cache_path(subreddit_name, search_query, max_posts, time_filter)
+        cached_posts = self._load_cached_search(cache_path)
+        if cached_posts is not None:
+            print(f"✓ Loaded {len(cached_posts)} cached posts for r/{subreddit_name}")
+            return cached_posts
+
+        try:
+            subreddit = await reddit.subreddit(subreddit_name)
+
+            await bucket.acquire()
+            search_results = subreddit.search(
+                search_query,
+                limit=max_posts,
+                time_filter=time_filter,
+                sort='relevance'
+            )
+
+            async for post in search_results:
+                post_data = self._extract_post_data(
+                    post, include_comments=False, keyword_matcher=keyword_matcher, collected_at=collected_at
+                )
+                post_data['top_comments'] = await self._aextract_top_comments(post, bucket, max_comments=5)
+                collected_posts.append(post_data)
 
             print(f"✓ Collected {len(collected_posts)} posts from r/{subreddit_name}")
+            self._save_cached_search(cache_path, collected_posts)
 
         except Exception as e:
             print(f"✗ Error collecting from r/{subreddit_name}: {e}")
 
         return collected_posts
 
-    def _extract_post_data(self, post, include_comments: bool = True) -> Dict:
+    def _extract_post_data(self, post, include_comments: bool = True,
+                           keyword_matcher: Optional[KeywordMatcher] = None,
+                           collected_at: Optional[str] = None) -> Dict:
         """
         Extract relevant fields from a Reddit post object.
 
@@ -133,34 +334,44 @@ class RedditCollector:
         Args:
             post: PRAW Submission object
             include_comments: Whether to extract top comments (slower but richer data)
+            keyword_matcher: If given, record which search keywords the post mentions
+            collected_at: ISO timestamp of the collection run (defaults to now)
         """
 
+        # LEARNING: Lazy loading
+        # PRAW fetches the full submission (an extra API request) the first time
+        # an attribute missing from the search listing is accessed. Reading the
+        # listing data directly means metadata never costs a request; optional
+        # fields missing from the listing are stored as None instead.
+        fields = vars(post)
+        selftext = fields.get('selftext', '')
+
         post_data = {
             # Post identifiers (for deduplication)
-            'id': post.id,
-            'created_utc': post.created_utc,
-            'created_date': datetime.fromtimestamp(post.created_utc).isoformat(),
+            'id': fields['id'],
+            'created_utc': fields['created_utc'],
+            'created_date': datetime.fromtimestamp(fields['created_utc']).isoformat(),
 
             # Content (what we'll analyze with NLP/LLMs)
-            'title': post.title,
-            'selftext': post.selftext,  # Post body text
-            'text_length': len(post.selftext),
+            'title': fields['title'],
+            'selftext': selftext,  # Post body text
+            'text_length': len(selftext),
 
             # Metadata (useful for filtering and quality assessment)
-            'subreddit': str(post.subreddit),
-            'score': post.score,  # Upvotes - downvotes
-            'upvote_ratio': post.upvote_ratio,
-            'num_comments': post.num_comments,
+            'subreddit': str(fields['subreddit']),
+            'score': fields.get('score'),  # Upvotes - downvotes
+            'upvote_ratio': fields.get('upvote_ratio'),
+            'num_comments': fields.get('num_comments'),
 
             # Post characteristics
-            'is_self': post.is_self,  # Text post vs. link
-            'link_flair_text': post.link_flair_text,  # Subreddit flair
+            'is_self': fields.get('is_self'),  # Text post vs. link
+            'link_flair_text': fields.get('link_flair_text'),  # Subreddit flair
 
             # URL (for reference, not scraping)
-            'permalink': f"https://reddit.com{post.permalink}",
+            'permalink': f"https://reddit.com{fields['permalink']}",
 
             # Collection metadata
-            'collected_at': datetime.now().isoformat(),
+            'collected_at': collected_at or datetime.now().isoformat(),
 
             # PRIVACY NOTE: We deliberately DO NOT collect:
             # - author username (PII)
@@ -168,6 +379,11 @@ class RedditCollector:
             # - exact geolocation data
         }
 
+        # Record which symptom keywords actually appear in the post
+        # (Reddit's search also matches stemmed and partial terms)
+        if keyword_matcher is not None:
+            post_data['matched_keywords'] = keyword_matcher.match(f"{post_data['title']} {selftext}")
+
         # Optionally extract top comments
         # This is slower but provides richer context for analysis
         if include_comments:
@@ -199,26 +415,14 @@ class RedditCollector:
             # PRAW lazily loads comments. replace_more(limit=0) loads all top-level
             # Setting limit=0 means "don't load any 'load more comments' sections"
             # This is faster but might miss some comments - good for our use case
+            # ETHICAL CONSIDERATION: Rate limiting
+            # Each comment fetch is an API request, so wait for a token first
+            # rather than sleeping a fixed delay after every post.
+            self._bucket.acquire()
             post.comments.replace_more(limit=0)
 
             # Get top-level comments (not replies)
-            top_comments = post.comments[:max_comments]
-
-            for comment in top_comments:
-                # Skip deleted, removed, or low-quality comments
-                # We filter for score >= 1 to keep reasonably valued comments
-                if (hasattr(comment, 'body') and
-                    comment.body not in ['[deleted]', '[removed]'] and
-                    comment.score >= 1):  # ← Quality filter!
-
-                    comment_data = {
-                        'id': comment.id,
-                        'text': comment.body,
-                        'score': comment.score,
-                        'created_utc': comment.created_utc,
-                        # We deliberately don't include author for privacy
-                    }
-                    comments_data.append(comment_data)
+            comments_data = self._comment_records(post.comments[:max_comments])
 
         except Exception as e:
             # If comment extraction fails, don't crash the whole collection
@@ -227,6 +431,48 @@ class RedditCollector:
 
         return comments_data
 
+    async def _aextract_top_comments(self, post, bucket: AsyncTokenBucket, max_comments: int = 5) -> List[Dict]:
+        """Async version of _extract_top_comments for asyncpraw submissions."""
+
+        comments_data = []
+
+        try:
+            # asyncpraw search results don't include comments; load() fetches them
+            await bucket.acquire()
+            await post.load()
+            await post.comments.replace_more(limit=0)
+
+            comments_data = self._comment_records(post.comments[:max_comments])
+
+        except Exception as e:
+            print(f"  Warning: Could not extract comments: {e}")
+
+        return comments_data
+
+    @staticmethod
+    def _comment_records(comments) -> List[Dict]:
+        """Convert top-level comments into dictionaries, skipping low-quality ones."""
+
+        comments_data = []
+
+        for comment in comments:
+            # Skip deleted, removed, or low-quality comments
+            # We filter for score >= 1 to keep reasonably valued comments
+            if (hasattr(comment, 'body') and
+                comment.body not in ['[deleted]', '[removed]'] and
+                comment.score >= 1):  # ← Quality filter!
+
+                comment_data = {
+                    'id': comment.id,
+                    'text': comment.body,
+                    'score': comment.score,
+                    'created_utc': comment.created_utc,
+                    # We deliberately don't include author for privacy
+                }
+                comments_data.append(comment_data)
+
+        return comments_data
+
     def save_posts(self, posts: List[Dict], filename: str):
         """
         Save collected posts to JSON file.
@@ -239,18 +485,97 @@ class RedditCollector:
 
         filepath = Config.RAW_DATA_DIR / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(posts, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(posts, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(posts, f, indent=2, ensure_ascii=False)
 
         print(f"✓ Saved {len(posts)} posts to {filepath}")
 
         # Print summary statistics
-        total_text_length = sum(p['text_length'] for p in posts)
-        avg_score = sum(p['score'] for p in posts) / len(posts) if posts else 0
+        total_text_length = 0
+        total_score = 0
+        for post in posts:
+            total_text_length += post['text_length']
+            total_score += post['score'] or 0  # None if missing from the listing
+        avg_score = total_score / len(posts) if posts else 0
 
         print(f"  Total text collected: {total_text_length:,} characters")
         print(f"  Average post score: {avg_score:.1f}")
 
+    def save_posts_jsonl(self, posts: List[Dict], filename: str):
+        """
+        Save collected posts as JSON Lines (one post object per line).
+
+        Later deduplication runs can then read post IDs line by line
+        instead of parsing the whole file as one list.
+        """
+
+        filepath = Config.RAW_DATA_DIR / filename
+
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                for post in posts:
+                    f.write(orjson.dumps(post))
+                    f.write(b'\n')
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                for post in posts:
+                    f.write(json.dumps(post, ensure_ascii=False))
+                    f.write('\n')
+
+        print(f"✓ Saved {len(posts)} posts to {filepath}")
+
+    def save_posts_parquet(self, posts: List[Dict], filename: str):
+        """
+        Save collected posts as a zstd-compressed Parquet file.
+
+        LEARNING: Columnar Storage
+        - Parquet stores each field as its own compressed column
+        - Readers can load just the columns they need (e.g. only 'id'
+          for deduplication) without touching the post text
+        """
+
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Parquet output: pip install pyarrow")
+
+        filepath = (Config.RAW_DATA_DIR / filename).with_suffix('.parquet')
+
+        table = pa.Table.from_pylist(posts)
+        pq.write_table(table, filepath, compression='zstd')
+
+        print(f"✓ Saved {len(posts)} posts to {filepath}")
+
+
+def load_post_ids(file_path: Path) -> Set[str]:
+    """
+    Read the post IDs from a saved collection file.
+
+    Handles JSON list files (save_posts), JSON Lines files
+    (save_posts_jsonl) and Parquet files (save_posts_parquet). JSON Lines
+    files are parsed one post at a time; Parquet files read only the
+    'id' column.
+
+    Args:
+        file_path: Path to a .json, .jsonl or .parquet collection file
+
+    Returns:
+        Set of post IDs in the file
+    """
+    if file_path.suffix == '.parquet':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to read Parquet files: pip install pyarrow")
+        return set(pq.read_table(file_path, columns=['id']).column('id').to_pylist())
+
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+    with open(file_path, 'rb') as f:
+        if file_path.suffix == '.jsonl':
+            return {loads(line)['id'] for line in f if line.strip()}
+        return {post['id'] for post in loads(f.read())}
+
 
 def main():
     """
@@ -275,14 +600,13 @@ def main():
 
     # Look for any existing data files
     data_dir = Path(Config.RAW_DATA_DIR)
-    existing_files = list(data_dir.glob('reddit_*_posts_*.json'))
+    existing_files = (list(data_dir.glob('reddit_*_posts_*.json')) +
+                      list(data_dir.glob('reddit_*_posts_*.jsonl')) +
+                      list(data_dir.glob('reddit_*_posts_*.parquet')))
 
     for file_path in existing_files:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-                for post in existing_data:
-                    existing_ids.add(post['id'])
+            existing_ids.update(load_post_ids(file_path))
         except Exception as e:
             print(f"  Warning: Could not load {file_path.name}: {e}")
 
@@ -344,14 +668,15 @@ def main():
     all_posts = []
     duplicates_skipped = 0
 
-    for subreddit in subreddits:
-        posts = collector.search_subreddit(
-            subreddit_name=subreddit,
-            keywords=symptom_keywords,
-            max_posts=150,  # Increased for better pattern discovery
-            time_filter='year'  # Last year of posts
-        )
+    # Subreddits are searched concurrently; results come back in list order
+    subreddit_posts = collector.collect_subreddits(
+        subreddits,
+        keywords=symptom_keywords,
+        max_posts=150,  # Increased for better pattern discovery
+        time_filter='year'  # Last year of posts
+    )
 
+    for posts in subreddit_posts:
         # Deduplicate
         for post in posts:
             if post['id'] not in existing_ids:
@@ -12,15 +12,22 @@ Pipeline:
 5. Output validated side effect database
 """
 
-import json
+import argparse
+import hashlib
 import os
 import sys
+import time
 from typing import List, Dict, Optional
 from collections import defaultdict
 
+import numpy as np
+
 # Add parent directory to path to import PubMedFetcher
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
 from data_collection.pubmed_fetcher import PubMedFetcher
+from data_collection.json_io import read_json, write_json, write_jsonl
+from data_collection.keyword_matcher import KeywordMatcher
 
 
 class EvidenceValidator:
@@ -50,6 +57,8 @@ class EvidenceValidator:
         "depression",
         "decreased libido"
     ]
+    # Matches any FDA-listed term in one pass over a side effect name
+    _FDA_MATCHER = KeywordMatcher(FDA_LISTED_SIDE_EFFECTS, whole_words=False)
 
     # Thresholds for evidence tiers
     TIER_2_PUBMED_THRESHOLD = 3      # 3+ papers = research-backed
@@ -59,9 +68,55 @@ class EvidenceValidator:
     HIGH_SURPRISE_THRESHOLD = 0.7    # 70%+ surprise = "hidden side effect"
     MEDIUM_SURPRISE_THRESHOLD = 0.4  # 40-70% = moderate surprise
 
-    def __init__(self, pubmed_email: Optional[str] = None):
-        """Initialize validator with PubMed fetcher."""
-        self.pubmed = PubMedFetcher(email=pubmed_email)
+    # How long cached PubMed results stay valid (seconds)
+    PUBMED_CACHE_TTL = 7 * 24 * 60 * 60
+
+    def __init__(self, pubmed_email: Optional[str] = None,
+                 pubmed_api_key: Optional[str] = None,
+                 cache_dir: Optional[str] = 'data/cache/pubmed',
+                 refresh_cache: bool = False):
+        """
+        Initialize validator with PubMed fetcher.
+
+        Args:
+            pubmed_email: Email sent to NCBI with each request
+            pubmed_api_key: NCBI API key (raises the rate limit from 3 to 10
+                requests/sec; defaults to the NCBI_API_KEY environment variable)
+            cache_dir: Directory for cached PubMed results (None disables caching)
+            refresh_cache: Ignore cached results but still save fresh ones
+        """
+        self.pubmed = PubMedFetcher(api_key=pubmed_api_key, email=pubmed_email)
+        self.cache_dir = cache_dir
+        self.refresh_cache = refresh_cache
+
+    def _cache_path(self, side_effect: str, max_results: int) -> str:
+        """Cache file for a side effect's PubMed results."""
+        key = hashlib.blake2b(f"{side_effect}|{max_results}".encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached_pubmed(self, side_effect: str, max_results: int) -> Optional[Dict]:
+        """Return cached PubMed results if present and not expired."""
+        if self.cache_dir is None or self.refresh_cache:
+            return None
+
+        path = self._cache_path(side_effect, max_results)
+        try:
+            if time.time() - os.path.getmtime(path) > self.PUBMED_CACHE_TTL:
+                return None
+            return read_json(path)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cached_pubmed(self, side_effect: str, max_results: int, pubmed_data: Dict):
+        """Store PubMed results for later runs."""
+        if self.cache_dir is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_json(self._cache_path(side_effect, max_results), pubmed_data, indent=False)
+        except OSError as e:
+            print(f"   ⚠️  Could not cache PubMed results for '{side_effect}': {e}")
 
     def load_reddit_data(self, filepath: str = 'data/analysis/llm_side_effect_stats.json') -> List[Dict]:
         """
@@ -83,8 +138,7 @@ class EvidenceValidator:
             alt_path = 'data/patterns/stats.json'
             if os.path.exists(alt_path):
                 print(f"   Loading from {alt_path}")
-                with open(alt_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(alt_path)
 
                 # Convert pattern stats to side effect format
                 side_effects = []
@@ -103,8 +157,7 @@ class EvidenceValidator:
                 print("   ❌ No side effect data found")
                 return []
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(filepath)
 
         print(f"   ✓ Loaded {len(data)} side effects from Reddit")
         return data
@@ -120,13 +173,68 @@ class EvidenceValidator:
         Returns:
             Dict with paper count and details
         """
+        cached = self._load_cached_pubmed(side_effect, max_results)
+        if cached is not None:
+            print(f"   🔬 PubMed results for '{side_effect}' loaded from cache")
+            return cached
+
         print(f"   🔬 Searching PubMed for '{side_effect}'...")
 
+        errors_before = self.pubmed.request_errors
         papers = self.pubmed.search_side_effect_birth_control_relationship(
             side_effect,
             max_results=max_results
         )
 
+        pubmed_data = self._summarize_papers(side_effect, papers)
+        # A failed request looks like "no papers"; only cache clean lookups
+        if self.pubmed.request_errors == errors_before:
+            self._save_cached_pubmed(side_effect, max_results, pubmed_data)
+        return pubmed_data
+
+    def search_pubmed_for_side_effects(self, side_effects: List[str],
+                                       max_results: int = 10) -> List[Dict]:
+        """
+        Search PubMed for several side effects at once.
+
+        The lookups are batched (see PubMedFetcher.batch_search): the searches
+        run concurrently and all papers are fetched in shared EFetch requests.
+
+        Args:
+            side_effects: Side effects to search for
+            max_results: Max papers to fetch per side effect
+
+        Returns:
+            One dict with paper count and details per side effect, in input order
+        """
+        results = [self._load_cached_pubmed(side_effect, max_results) for side_effect in side_effects]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        print(f"🔬 Searching PubMed for {len(missing)} side effects "
+              f"({len(side_effects) - len(missing)} cached)...")
+
+        if missing:
+            errors_before = self.pubmed.request_errors
+            papers_by_side_effect = self.pubmed.batch_search(
+                [side_effects[i] for i in missing],
+                max_results=max_results
+            )
+            # Any failed request may have emptied any side effect's results
+            # (the EFetch batches are shared), so cache nothing from this batch
+            cache_results = self.pubmed.request_errors == errors_before
+            if not cache_results:
+                print("   ⚠️  Some PubMed requests failed; these results won't be cached")
+
+            for i in missing:
+                papers = papers_by_side_effect[side_effects[i]]
+                results[i] = self._summarize_papers(side_effects[i], papers)
+                if cache_results:
+                    self._save_cached_pubmed(side_effects[i], max_results, results[i])
+
+        return results
+
+    def _summarize_papers(self, side_effect: str, papers: List[Dict]) -> Dict:
+        """Bundle PubMed papers for a side effect with any prevalence findings."""
         # Extract prevalence data if available
         prevalence_findings = []
         for paper in papers:
@@ -154,17 +262,33 @@ class EvidenceValidator:
         Returns:
             Surprise score (0-1)
         """
-        # Normalize paper count to 0-1 scale (cap at 10 papers)
-        research_coverage = min(paper_count / 10.0, 1.0)
+        return float(self.calculate_surprise_scores_batch(
+            np.array([reddit_freq], dtype=float),
+            np.array([paper_count], dtype=float)
+        )[0])
+
+    @staticmethod
+    def calculate_surprise_scores_batch(freqs: np.ndarray,
+                                        paper_counts: np.ndarray) -> np.ndarray:
+        """
+        Vectorized surprise scores for many side effects at once.
 
-        # Calculate surprise: high patient frequency + low research coverage
-        surprise = reddit_freq * (1 - research_coverage)
+        Args:
+            freqs: Reddit mention frequencies (0-1)
+            paper_counts: PubMed paper counts, aligned with freqs
 
-        return round(surprise, 3)
+        Returns:
+            Array of surprise scores rounded to 3 decimals
+        """
+        # Normalize paper count to 0-1 scale (cap at 10 papers), then weight
+        # patient frequency by the missing research coverage
+        research_coverage = np.minimum(paper_counts / 10.0, 1.0)
+        return np.round(freqs * (1 - research_coverage), 3)
 
     def assign_evidence_tier(self, side_effect: str,
                            mention_count: int,
-                           paper_count: int) -> tuple:
+                           paper_count: int,
+                           side_effect_lower: Optional[str] = None) -> tuple:
         """
         Assign evidence tier based on multiple sources.
 
@@ -172,15 +296,17 @@ class EvidenceValidator:
             side_effect: Side effect name
             mention_count: Number of Reddit mentions
             paper_count: Number of PubMed papers
+            side_effect_lower: Precomputed normalized name (lowercased, stripped)
 
         Returns:
             Tuple of (tier_number, tier_label)
         """
         # Normalize side effect name for comparison
-        side_effect_lower = side_effect.lower().strip()
+        if side_effect_lower is None:
+            side_effect_lower = side_effect.lower().strip()
 
         # Tier 1: FDA-listed
-        if any(fda_effect in side_effect_lower for fda_effect in self.FDA_LISTED_SIDE_EFFECTS):
+        if self._is_fda_listed(side_effect_lower):
             return (1, "🏆 FDA-Listed")
 
         # Tier 2: Research-backed (3+ papers)
@@ -194,14 +320,23 @@ class EvidenceValidator:
         # Tier 4: Emerging pattern
         return (4, "⚠️ Emerging Pattern")
 
+    def _is_fda_listed(self, side_effect_lower: str) -> bool:
+        """Whether a (lowercased) side effect name contains an FDA-listed term."""
+        return self._FDA_MATCHER.contains_any(side_effect_lower)
+
     def validate_all_side_effects(self, side_effects: List[Dict],
-                                  total_posts: int) -> List[Dict]:
+                                  total_posts: int,
+                                  fetch_fda_listed: bool = True) -> List[Dict]:
         """
         Validate all side effects with PubMed research.
 
         Args:
             side_effects: List of side effect stats from Reddit
             total_posts: Total number of Reddit posts analyzed
+            fetch_fda_listed: Also query PubMed for FDA-listed side effects.
+                Their tier doesn't depend on papers, so skipping them saves
+                requests, at the cost of reporting 0 papers (and hence a
+                higher surprise score) for them.
 
         Returns:
             List of validated side effects with evidence tiers
@@ -213,7 +348,37 @@ class EvidenceValidator:
 
         validated = []
 
-        for i, side_effect_data in enumerate(side_effects, 1):
+        # PubMed lookups are I/O-bound: run them all concurrently up front,
+        # then score each side effect in order
+        names = [side_effect_data['side_effect'] for side_effect_data in side_effects]
+        # Normalize each name once for the FDA-list checks below
+        names_lower = [name.lower().strip() for name in names]
+        if fetch_fda_listed:
+            all_pubmed_data = self.search_pubmed_for_side_effects(names, max_results=10)
+        else:
+            # Tier 1 is decided by the FDA list alone: only look up the rest
+            to_fetch = [i for i, name_lower in enumerate(names_lower)
+                        if not self._is_fda_listed(name_lower)]
+            print(f"Skipping PubMed for {len(names) - len(to_fetch)} FDA-listed side effects")
+            all_pubmed_data = [
+                {'paper_count': 0, 'papers': [], 'prevalence_findings': []}
+                for _ in names
+            ]
+            fetched = self.search_pubmed_for_side_effects(
+                [names[i] for i in to_fetch], max_results=10
+            )
+            for i, pubmed_data in zip(to_fetch, fetched):
+                all_pubmed_data[i] = pubmed_data
+        print()
+
+        # Score every side effect in one vectorized call
+        surprise_scores = self.calculate_surprise_scores_batch(
+            np.array([se.get('frequency', 0) for se in side_effects], dtype=float),
+            np.array([pd['paper_count'] for pd in all_pubmed_data], dtype=float)
+        ).tolist()
+
+        for i, (side_effect_data, pubmed_data, surprise_score, side_effect_lower) in enumerate(
+                zip(side_effects, all_pubmed_data, surprise_scores, names_lower), 1):
             side_effect = side_effect_data['side_effect']
             mention_count = side_effect_data.get('mention_count', 0)
             post_count = side_effect_data.get('post_count', 0)
@@ -222,17 +387,12 @@ class EvidenceValidator:
             print(f"[{i}/{len(side_effects)}] Validating: {side_effect}")
             print(f"   Reddit: {mention_count} mentions, {post_count} posts ({frequency*100:.1f}%)")
 
-            # Search PubMed
-            pubmed_data = self.search_pubmed_for_side_effect(side_effect, max_results=10)
-
-            # Calculate surprise score
-            surprise_score = self.calculate_surprise_score(frequency, pubmed_data['paper_count'])
-
             # Assign evidence tier
             tier, tier_label = self.assign_evidence_tier(
                 side_effect,
                 mention_count,
-                pubmed_data['paper_count']
+                pubmed_data['paper_count'],
+                side_effect_lower=side_effect_lower
             )
 
             print(f"   PubMed: {pubmed_data['paper_count']} papers")
@@ -268,6 +428,9 @@ class EvidenceValidator:
             }
 
             validated.append(validated_entry)
+            # Release this side effect's full paper records (abstracts included);
+            # the entry only keeps the top-5 paper stubs
+            all_pubmed_data[i - 1] = None
             print()
 
         # Sort by surprise score (highest first)
@@ -277,57 +440,70 @@ class EvidenceValidator:
         return validated
 
     def save_validated_database(self, validated_side_effects: List[Dict],
-                               output_path: str = 'data/validated'):
+                               output_path: str = 'data/validated',
+                               output_format: str = 'json'):
         """
         Save validated side effect database.
 
+        Files are written to a temporary path and moved into place, so an
+        interrupted run never leaves a truncated database behind.
+
         Args:
             validated_side_effects: List of validated side effects
             output_path: Directory to save results
+            output_format: 'json' (indented array, read by the downstream
+                analysis scripts) or 'jsonl' (one compact record per line)
         """
+        if output_format not in ('json', 'jsonl'):
+            raise ValueError(f"Unknown output format: {output_format}")
+
         os.makedirs(output_path, exist_ok=True)
 
         # Save full database
-        filename = f'{output_path}/validated_side_effects_database.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(validated_side_effects, f, indent=2, ensure_ascii=False)
+        filename = f'{output_path}/validated_side_effects_database.{output_format}'
+        if output_format == 'jsonl':
+            write_jsonl(filename, validated_side_effects)
+        else:
+            write_json(filename, validated_side_effects)
 
         print(f"\n💾 Saved validated database:")
         print(f"   {filename}")
 
-        # Create summary stats
-        summary = {
-            'total_side_effects': len(validated_side_effects),
-            'by_tier': {},
-            'high_surprise': [
-                {
+        # Create summary stats in a single pass over the database
+        by_tier = {}
+        high_surprise = []
+        research_gaps = []
+        threshold = self.HIGH_SURPRISE_THRESHOLD
+        for se in validated_side_effects:
+            tier = se['tier_label']
+            by_tier[tier] = by_tier.get(tier, 0) + 1
+
+            if se['surprise_score'] >= threshold:
+                high_surprise.append({
                     'side_effect': se['side_effect'],
                     'surprise_score': se['surprise_score'],
-                    'tier': se['tier_label']
-                }
-                for se in validated_side_effects
-                if se['surprise_score'] >= self.HIGH_SURPRISE_THRESHOLD
-            ],
-            'research_gaps': [
-                {
+                    'tier': tier
+                })
+
+            mention_count = se['reddit_data']['mention_count']
+            paper_count = se['pubmed_data']['paper_count']
+            if mention_count > 20 and paper_count < 3:
+                research_gaps.append({
                     'side_effect': se['side_effect'],
-                    'reddit_mentions': se['reddit_data']['mention_count'],
-                    'pubmed_papers': se['pubmed_data']['paper_count']
-                }
-                for se in validated_side_effects
-                if se['reddit_data']['mention_count'] > 20 and se['pubmed_data']['paper_count'] < 3
-            ]
-        }
+                    'reddit_mentions': mention_count,
+                    'pubmed_papers': paper_count
+                })
 
-        # Count by tier
-        for se in validated_side_effects:
-            tier = se['tier_label']
-            summary['by_tier'][tier] = summary['by_tier'].get(tier, 0) + 1
+        summary = {
+            'total_side_effects': len(validated_side_effects),
+            'by_tier': by_tier,
+            'high_surprise': high_surprise,
+            'research_gaps': research_gaps
+        }
 
         # Save summary
         summary_filename = f'{output_path}/validation_summary.json'
-        with open(summary_filename, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        write_json(summary_filename, summary)
 
         print(f"   {summary_filename}")
 
@@ -341,40 +517,69 @@ class EvidenceValidator:
         print(f"   Research gaps identified: {len(summary['research_gaps'])}")
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options (all optional; defaults match the pipeline)."""
+    parser = argparse.ArgumentParser(description="Validate Reddit side effects against PubMed.")
+    parser.add_argument('--input', default='data/analysis/llm_side_effect_stats.json',
+                        help="Reddit side effect stats JSON")
+    parser.add_argument('--output-dir', default='data/validated',
+                        help="Directory for the validated database and summary")
+    parser.add_argument('--limit', type=int, default=30,
+                        help="Validate only the top N side effects (default: 30)")
+    parser.add_argument('--jsonl', action='store_true',
+                        help="Write the database as JSON Lines instead of an indented array")
+    parser.add_argument('--skip-fda-pubmed', action='store_true',
+                        help="Skip PubMed lookups for FDA-listed (Tier 1) side effects")
+    # Cached PubMed results are reused for a week unless told otherwise
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument('--no-cache', action='store_true',
+                       help="Never read or write the PubMed cache")
+    cache.add_argument('--refresh-cache', action='store_true',
+                       help="Re-query PubMed and overwrite the cache")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for evidence validation."""
+    args = parse_args(argv)
 
     print("\n🔬 Birth Control Side Effects Evidence Validation")
     print("=" * 60)
 
     # Initialize validator
-    validator = EvidenceValidator(pubmed_email="your_email@example.com")
+    validator = EvidenceValidator(
+        pubmed_email="your_email@example.com",
+        pubmed_api_key=Config.NCBI_API_KEY,
+        cache_dir=None if args.no_cache else 'data/cache/pubmed',
+        refresh_cache=args.refresh_cache
+    )
 
     # Load Reddit data
-    side_effects = validator.load_reddit_data()
+    side_effects = validator.load_reddit_data(args.input)
 
     if not side_effects:
         print("\n❌ No side effect data found!")
         print("   Run: python src/analysis/llm_side_effect_extractor.py")
         return
 
-    # Limit to top 30 side effects (to avoid timeout)
-    print(f"\n📊 Limiting validation to top 30 side effects (from {len(side_effects)} total)")
-    side_effects = side_effects[:30]
+    # Limit to the top side effects (to avoid timeout)
+    print(f"\n📊 Limiting validation to top {args.limit} side effects (from {len(side_effects)} total)")
+    side_effects = side_effects[:args.limit]
 
     # Get total posts (try to load from stats.json)
     try:
-        with open('data/patterns/stats.json', 'r') as f:
-            stats = json.load(f)
-            total_posts = stats.get('total_posts', 537)
+        stats = read_json('data/patterns/stats.json')
+        total_posts = stats.get('total_posts', 537)
     except:
         total_posts = 537  # Default
 
     # Validate all side effects
-    validated = validator.validate_all_side_effects(side_effects, total_posts)
+    validated = validator.validate_all_side_effects(side_effects, total_posts,
+                                                    fetch_fda_listed=not args.skip_fda_pubmed)
 
     # Save results
-    validator.save_validated_database(validated)
+    validator.save_validated_database(validated, args.output_dir,
+                                      output_format='jsonl' if args.jsonl else 'json')
 
     print("\n✅ Evidence validation complete!")
     print("\n💡 Next step: Run statistical analysis")
@@ -5,22 +5,26 @@ Validates long-term birth control side effects against PubMed research
 with enhanced source tracking and clinical significance assessment.
 """
 
-import json
+import argparse
 import os
 import sys
-import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from collections import defaultdict
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data_collection.pubmed_fetcher import PubMedFetcher
-from analysis.side_effect_standardization import standardize_side_effect, STANDARDIZATION_RULES
+from data_collection.json_io import atomic_open, json_bytes, read_json
+from data_collection.keyword_matcher import KeywordMatcher
+from analysis.side_effect_standardization import standardize_side_effect, variant_key, STANDARDIZATION_RULES
 
 # Constants
 DEFAULT_LONG_TERM_POSTS = 179  # Total posts from long-term users (5+ years)
 SURPRISE_MAX_PAPERS = 15  # Maximum papers for surprise score calculation
+PUBMED_CACHE_DIR = Path(__file__).parent.parent.parent / 'data' / 'cache' / 'pubmed'
 
 
 class LongTermEvidenceValidator:
@@ -45,9 +49,55 @@ class LongTermEvidenceValidator:
         "vision", "blindness"
     ]
 
-    def __init__(self, pubmed_email: Optional[str] = None):
-        """Initialize with PubMed fetcher."""
-        self.pubmed = PubMedFetcher(email=pubmed_email)
+    # Terms marking effects that significantly affect quality of life
+    MODERATE_TERMS = [
+        "chronic", "severe", "persistent", "lasting",
+        "migraine", "pain", "bleeding", "weight"
+    ]
+
+    # Papers mentioning these aren't about birth control side effects
+    EXCLUDE_KEYWORDS = [
+        'coffee', 'caffeine', 'covid-19', 'sars-cov-2', 'coronavirus',
+        'pneumococcal', 'cytomegalovirus', 'congenital heart',
+        'pneumonia vaccine', 'vaccination', 'vaccine safety'
+    ]
+
+    # Relevant papers must mention at least one of these
+    BC_KEYWORDS = [
+        'contraceptive', 'contraception', 'birth control',
+        'oral contraceptive', 'hormonal contraceptive',
+        'combined oral contraceptive', 'progestin', 'estrogen',
+        'levonorgestrel', 'ethinyl estradiol', 'depo-provera',
+        'mirena', 'iud', 'implant', 'nuvaring', 'patch'
+    ]
+
+    # Each keyword list is scanned in a single pass over the text
+    _EXCLUDE_MATCHER = KeywordMatcher(EXCLUDE_KEYWORDS, whole_words=False)
+    _BC_MATCHER = KeywordMatcher(BC_KEYWORDS, whole_words=False)
+    _SIGNIFICANT_MATCHER = KeywordMatcher(CLINICALLY_SIGNIFICANT, whole_words=False)
+    _MODERATE_MATCHER = KeywordMatcher(MODERATE_TERMS, whole_words=False)
+
+    # Long-term PubMed queries: (label, query template, max results)
+    LONG_TERM_QUERIES = [
+        ("long-term", "oral contraceptive {side_effect} long-term", 8),
+        ("chronic", "birth control {side_effect} chronic", 5),
+        ("years", "hormonal contraception {side_effect} years", 5),
+    ]
+
+    def __init__(self, pubmed_email: Optional[str] = None,
+                 cache_dir: Optional[str] = str(PUBMED_CACHE_DIR),
+                 verbose: bool = True):
+        """
+        Initialize with PubMed fetcher.
+
+        Args:
+            pubmed_email: Email sent to NCBI with each request
+            cache_dir: Directory for cached PubMed responses (None disables caching)
+            verbose: Print per-effect and per-query details (progress and
+                summaries are always printed)
+        """
+        self.pubmed = PubMedFetcher(email=pubmed_email, cache_dir=cache_dir)
+        self.verbose = verbose
 
     def load_long_term_stats(self, filepath: str = 'data/analysis/long_term_side_effects_top20.json') -> List[Dict]:
         """Load top long-term side effects for validation."""
@@ -60,8 +110,7 @@ class LongTermEvidenceValidator:
             print(f"   ❌ File not found: {filepath}")
             return []
 
-        with open(full_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(full_path)
 
         print(f"   ✓ Loaded {len(data)} long-term side effects")
 
@@ -81,19 +130,30 @@ class LongTermEvidenceValidator:
         - Libido variations
         - Heavy bleeding variations
         - Mood variations
+        - Spelling variants of the same name ("mood-swing" / "mood swings")
         """
-        # Group side effects by standardized name using shared module
+        # Group side effects by standardized name using shared module,
+        # then by spelling variant of that name
         merged = defaultdict(list)
+        standard_names = defaultdict(list)
 
         for effect in side_effects:
             original_name = effect['side_effect']
             # Use shared standardization function
             standard_name = standardize_side_effect(original_name)
-            merged[standard_name].append(effect)
+            key = variant_key(standard_name)
+            merged[key].append(effect)
+            standard_names[key].append(standard_name)
 
         # Combine data for merged effects
         deduplicated = []
-        for standard_name, effects_list in merged.items():
+        for key, effects_list in merged.items():
+            # Name a merged group after its most reported spelling
+            standard_name = max(
+                zip(standard_names[key], effects_list),
+                key=lambda pair: pair[1].get('post_count', 0)
+            )[0]
+
             if len(effects_list) == 1:
                 # No merging needed
                 deduplicated.append(effects_list[0])
@@ -101,57 +161,56 @@ class LongTermEvidenceValidator:
                 # Merge multiple entries
                 print(f"   🔄 Merging {len(effects_list)} entries for: {standard_name}")
 
-                # Combine statistics
-                combined = {
-                    'side_effect': standard_name,
-                    'mention_count': sum(e.get('mention_count', 0) for e in effects_list),
-                    'post_count': sum(e.get('post_count', 0) for e in effects_list),
-                    'frequency': max(e.get('frequency', 0) for e in effects_list),
-                    'category': effects_list[0].get('category', 'unknown'),
-                    'examples': [],
-                    'temporal_contexts': [],
-                    'avg_years_when_appeared': None,
-                    'persists_after_stopping': None,
-                    'severity_distribution': {}
-                }
+                # Combine statistics in a single pass over the entries
+                mention_count = 0
+                post_count = 0
+                examples = {}  # first 3 unique, in order
+                contexts = {}  # first 3 unique non-empty, in order
+                years_sum = 0
+                years_n = 0
+                persistence = None  # true if any say true
+                severity_distribution = {}
 
-                # Combine examples (take first 3 unique)
-                seen_examples = set()
                 for effect in effects_list:
+                    mention_count += effect.get('mention_count', 0)
+                    post_count += effect.get('post_count', 0)
+
                     for example in effect.get('examples', []):
-                        if example not in seen_examples and len(combined['examples']) < 3:
-                            combined['examples'].append(example)
-                            seen_examples.add(example)
+                        if len(examples) == 3:
+                            break
+                        examples[example] = None
+
+                    for ctx in effect.get('temporal_contexts', []):
+                        if len(contexts) == 3:
+                            break
+                        if ctx:
+                            contexts[ctx] = None
+
+                    years = effect.get('avg_years_when_appeared')
+                    if years:
+                        years_sum += years
+                        years_n += 1
+
+                    persists = effect.get('persists_after_stopping')
+                    if persists is not None:
+                        persistence = bool(persistence) or bool(persists)
 
-                # Combine temporal contexts and deduplicate
-                for effect in effects_list:
-                    combined['temporal_contexts'].extend(effect.get('temporal_contexts', []))
-                # Remove duplicates while preserving order
-                seen = set()
-                unique_contexts = []
-                for ctx in combined['temporal_contexts']:
-                    if ctx and ctx not in seen:
-                        unique_contexts.append(ctx)
-                        seen.add(ctx)
-                combined['temporal_contexts'] = unique_contexts[:3]
-
-                # Average years when appeared
-                years_list = [e.get('avg_years_when_appeared') for e in effects_list if e.get('avg_years_when_appeared')]
-                if years_list:
-                    combined['avg_years_when_appeared'] = round(sum(years_list) / len(years_list), 1)
-
-                # Persistence after stopping (true if any say true)
-                persistence_list = [e.get('persists_after_stopping') for e in effects_list if e.get('persists_after_stopping') is not None]
-                if persistence_list:
-                    combined['persists_after_stopping'] = any(persistence_list)
-
-                # Combine severity distribution
-                for effect in effects_list:
                     for severity, count in effect.get('severity_distribution', {}).items():
-                        combined['severity_distribution'][severity] = combined['severity_distribution'].get(severity, 0) + count
+                        severity_distribution[severity] = severity_distribution.get(severity, 0) + count
 
-                # Recalculate frequency
-                combined['frequency'] = round(combined['post_count'] / DEFAULT_LONG_TERM_POSTS, 3)
+                combined = {
+                    'side_effect': standard_name,
+                    'mention_count': mention_count,
+                    'post_count': post_count,
+                    # Recalculate frequency from the merged post count
+                    'frequency': round(post_count / DEFAULT_LONG_TERM_POSTS, 3),
+                    'category': effects_list[0].get('category', 'unknown'),
+                    'examples': list(examples),
+                    'temporal_contexts': list(contexts),
+                    'avg_years_when_appeared': round(years_sum / years_n, 1) if years_n else None,
+                    'persists_after_stopping': persistence,
+                    'severity_distribution': severity_distribution
+                }
 
                 deduplicated.append(combined)
 
@@ -178,37 +237,16 @@ class LongTermEvidenceValidator:
         abstract = (paper.get('abstract') or '').lower()
         combined = title + ' ' + abstract
 
-        # Exclude obvious non-BC papers
-        exclude_keywords = [
-            'coffee', 'caffeine', 'covid-19', 'sars-cov-2', 'coronavirus',
-            'pneumococcal', 'cytomegalovirus', 'congenital heart',
-            'pneumonia vaccine', 'vaccination', 'vaccine safety'
-        ]
-        for keyword in exclude_keywords:
-            if keyword in combined:
-                return False
-
-        # Must mention birth control/contraceptive
-        bc_keywords = [
-            'contraceptive', 'contraception', 'birth control',
-            'oral contraceptive', 'hormonal contraceptive',
-            'combined oral contraceptive', 'progestin', 'estrogen',
-            'levonorgestrel', 'ethinyl estradiol', 'depo-provera',
-            'mirena', 'iud', 'implant', 'nuvaring', 'patch'
-        ]
-
-        has_bc_keyword = any(keyword in combined for keyword in bc_keywords)
-
-        # If no BC keyword, it's not relevant
-        if not has_bc_keyword:
+        # Check if side effect is mentioned (cheapest and most selective, so first)
+        if side_effect.lower() not in combined:
             return False
 
-        # Check if side effect is mentioned
-        side_effect_lower = side_effect.lower()
-        if side_effect_lower not in combined:
+        # Exclude obvious non-BC papers
+        if self._EXCLUDE_MATCHER.contains_any(combined):
             return False
 
-        return True
+        # Must mention birth control/contraceptive
+        return self._BC_MATCHER.contains_any(combined)
 
     def search_pubmed_long_term(self, side_effect: str) -> Dict:
         """
@@ -221,50 +259,65 @@ class LongTermEvidenceValidator:
 
         Returns papers with full metadata for citation.
         """
-        all_papers = {}
-        total_count = 0
-
-        print(f"   🔬 Searching PubMed for '{side_effect}' (long-term focus)...")
-
-        # Query 1: Long-term oral contraceptive use
-        query1 = f'oral contraceptive {side_effect} long-term'
-        pmids1 = self.pubmed.search_papers(query1, max_results=8, min_year=2010)
-        papers1 = self.pubmed.fetch_paper_details(pmids1)
-
-        for paper in papers1:
-            if self.is_relevant_paper(paper, side_effect):
-                all_papers[paper['pmid']] = paper
-        print(f"      Query 1 (long-term): {len(papers1)} papers, {len([p for p in papers1 if self.is_relevant_paper(p, side_effect)])} relevant")
-
-        # Query 2: Chronic effects
-        query2 = f'birth control {side_effect} chronic'
-        pmids2 = self.pubmed.search_papers(query2, max_results=5, min_year=2010)
-        papers2 = self.pubmed.fetch_paper_details(pmids2)
+        return self.search_pubmed_long_term_many([side_effect])[0]
 
-        for paper in papers2:
-            if self.is_relevant_paper(paper, side_effect):
-                all_papers[paper['pmid']] = paper
-        print(f"      Query 2 (chronic): {len(papers2)} papers, {len([p for p in papers2 if self.is_relevant_paper(p, side_effect)])} relevant")
-
-        # Query 3: Years of use
-        query3 = f'hormonal contraception {side_effect} years'
-        pmids3 = self.pubmed.search_papers(query3, max_results=5, min_year=2010)
-        papers3 = self.pubmed.fetch_paper_details(pmids3)
-
-        for paper in papers3:
-            if self.is_relevant_paper(paper, side_effect):
-                all_papers[paper['pmid']] = paper
-        print(f"      Query 3 (years): {len(papers3)} papers, {len([p for p in papers3 if self.is_relevant_paper(p, side_effect)])} relevant")
+    def search_pubmed_long_term_many(self, side_effects: List[str]) -> List[Dict]:
+        """
+        Run the long-term queries for several side effects at once.
 
-        papers_list = list(all_papers.values())
-        total_count = len(papers_list)
+        Each query kind is searched for every side effect together
+        (concurrently when aiohttp is installed), then the union of PMIDs
+        is fetched in shared EFetch batches.
 
-        print(f"      ✓ Total unique relevant papers: {total_count}")
+        Returns:
+            One {'paper_count', 'papers'} dict per side effect, in input order
+        """
+        print(f"   🔬 Searching PubMed for {len(side_effects)} side effects (long-term focus)...")
+
+        # pmid_lists[q][i]: PMIDs for query q of side effect i
+        pmid_lists = [
+            self.pubmed.search_papers_many(
+                [template.format(side_effect=side_effect) for side_effect in side_effects],
+                max_results=max_results,
+                min_year=2010
+            )
+            for _, template, max_results in self.LONG_TERM_QUERIES
+        ]
 
-        return {
-            'paper_count': total_count,
-            'papers': papers_list
-        }
+        all_pmids = list(dict.fromkeys(
+            pmid for lists in pmid_lists for pmids in lists for pmid in pmids
+        ))
+        papers_by_pmid = {paper['pmid']: paper for paper in self.pubmed.fetch_paper_details(all_pmids)}
+
+        results = []
+        for i, side_effect in enumerate(side_effects):
+            if self.verbose:
+                print(f"   🔬 PubMed results for '{side_effect}' (long-term focus):")
+            all_papers = {}
+            # Queries overlap, so score each paper against this side effect once
+            relevance = {}
+
+            for n, ((label, _, _), lists) in enumerate(zip(self.LONG_TERM_QUERIES, pmid_lists), 1):
+                papers = [papers_by_pmid[pmid] for pmid in lists[i] if pmid in papers_by_pmid]
+                for paper in papers:
+                    if paper['pmid'] not in relevance:
+                        relevance[paper['pmid']] = self.is_relevant_paper(paper, side_effect)
+                relevant = [paper for paper in papers if relevance[paper['pmid']]]
+                for paper in relevant:
+                    all_papers[paper['pmid']] = paper
+                if self.verbose:
+                    print(f"      Query {n} ({label}): {len(papers)} papers, {len(relevant)} relevant")
+
+            papers_list = list(all_papers.values())
+            if self.verbose:
+                print(f"      ✓ Total unique relevant papers: {len(papers_list)}")
+
+            results.append({
+                'paper_count': len(papers_list),
+                'papers': papers_list
+            })
+
+        return results
 
     def assess_clinical_significance(self, side_effect: str) -> str:
         """
@@ -275,18 +328,12 @@ class LongTermEvidenceValidator:
         side_effect_lower = side_effect.lower()
 
         # High significance: serious health outcomes
-        for sig_term in self.CLINICALLY_SIGNIFICANT:
-            if sig_term in side_effect_lower:
-                return "High"
+        if self._SIGNIFICANT_MATCHER.contains_any(side_effect_lower):
+            return "High"
 
         # Moderate: affects quality of life significantly
-        moderate_terms = [
-            "chronic", "severe", "persistent", "lasting",
-            "migraine", "pain", "bleeding", "weight"
-        ]
-        for term in moderate_terms:
-            if term in side_effect_lower:
-                return "Moderate"
+        if self._MODERATE_MATCHER.contains_any(side_effect_lower):
+            return "Moderate"
 
         return "Low"
 
@@ -305,13 +352,19 @@ class LongTermEvidenceValidator:
 
     def calculate_surprise_score(self, reddit_freq: float, paper_count: int) -> float:
         """Calculate surprise score for long-term effects."""
+        return float(self.calculate_surprise_scores_batch(
+            np.array([reddit_freq], dtype=float),
+            np.array([paper_count], dtype=float)
+        )[0])
+
+    @staticmethod
+    def calculate_surprise_scores_batch(freqs: np.ndarray, paper_counts: np.ndarray) -> np.ndarray:
+        """Vectorized surprise scores for many long-term effects, rounded to 3 decimals."""
         # Cap research coverage at SURPRISE_MAX_PAPERS papers for long-term (higher threshold)
-        research_coverage = min(paper_count / SURPRISE_MAX_PAPERS, 1.0)
+        research_coverage = np.minimum(paper_counts / SURPRISE_MAX_PAPERS, 1.0)
 
         # Surprise = patient frequency × lack of research
-        surprise = reddit_freq * (1 - research_coverage)
-
-        return round(surprise, 3)
+        return np.round(freqs * (1 - research_coverage), 3)
 
     def validate_all_long_term_effects(self, side_effects: List[Dict],
                                       total_posts: int) -> List[Dict]:
@@ -332,17 +385,29 @@ class LongTermEvidenceValidator:
 
         validated = []
 
-        for i, effect_data in enumerate(side_effects, 1):
+        # Search PubMed for every effect up front so the requests can overlap;
+        # the fetcher's rate limiting replaces the per-effect sleep
+        all_pubmed_data = self.search_pubmed_long_term_many(
+            [effect_data['side_effect'] for effect_data in side_effects]
+        )
+        print()
+
+        # Score every effect in one vectorized call
+        surprise_scores = self.calculate_surprise_scores_batch(
+            np.array([effect_data.get('frequency', 0) for effect_data in side_effects], dtype=float),
+            np.array([pubmed_data['paper_count'] for pubmed_data in all_pubmed_data], dtype=float)
+        ).tolist()
+
+        for i, (effect_data, pubmed_data, surprise_score) in enumerate(
+                zip(side_effects, all_pubmed_data, surprise_scores), 1):
             side_effect = effect_data['side_effect']
             mention_count = effect_data.get('mention_count', 0)
             post_count = effect_data.get('post_count', 0)
             frequency = effect_data.get('frequency', 0)
 
-            print(f"[{i}/{len(side_effects)}] Validating: {side_effect}")
-            print(f"   Reddit: {mention_count} mentions, {post_count} posts ({frequency*100:.1f}%)")
-
-            # Search PubMed with long-term queries
-            pubmed_data = self.search_pubmed_long_term(side_effect)
+            if self.verbose:
+                print(f"[{i}/{len(side_effects)}] Validating: {side_effect}")
+                print(f"   Reddit: {mention_count} mentions, {post_count} posts ({frequency*100:.1f}%)")
 
             # Assess clinical significance
             clinical_sig = self.assess_clinical_significance(side_effect)
@@ -350,13 +415,11 @@ class LongTermEvidenceValidator:
             # Determine validation status
             validation_status = self.determine_validation_status(pubmed_data['paper_count'])
 
-            # Calculate surprise score
-            surprise_score = self.calculate_surprise_score(frequency, pubmed_data['paper_count'])
-
-            print(f"   PubMed: {pubmed_data['paper_count']} papers found")
-            print(f"   Status: {validation_status}")
-            print(f"   Clinical Significance: {clinical_sig}")
-            print(f"   Surprise: {surprise_score:.3f}")
+            if self.verbose:
+                print(f"   PubMed: {pubmed_data['paper_count']} papers found")
+                print(f"   Status: {validation_status}")
+                print(f"   Clinical Significance: {clinical_sig}")
+                print(f"   Surprise: {surprise_score:.3f}")
 
             # Create validated entry with full source tracking
             validated_entry = {
@@ -391,10 +454,11 @@ class LongTermEvidenceValidator:
             }
 
             validated.append(validated_entry)
-            print()
-
-            # Rate limiting for PubMed API
-            time.sleep(1.0)
+            # Release this effect's full paper records (abstracts included);
+            # the entry only keeps the top-10 citation stubs
+            all_pubmed_data[i - 1] = None
+            if self.verbose:
+                print()
 
         # Sort by surprise score (highest first)
         validated.sort(key=lambda x: x['surprise_score'], reverse=True)
@@ -410,8 +474,8 @@ class LongTermEvidenceValidator:
 
         # Save full validated database
         db_file = output_dir / 'validated_long_term_effects.json'
-        with open(db_file, 'w', encoding='utf-8') as f:
-            json.dump(validated_effects, f, indent=2, ensure_ascii=False)
+        with atomic_open(db_file, 'wb') as f:
+            f.write(json_bytes(validated_effects))
 
         print(f"\n💾 Saved validated database:")
         print(f"   {db_file.relative_to(project_root)}")
@@ -488,10 +552,11 @@ class LongTermEvidenceValidator:
         # Top effects for frontend display
         summary['top_effects'] = validated_effects[:20]
 
-        # Save summary
+        # Save summary (serialized once, shared with the frontend copy)
+        summary_payload = json_bytes(summary)
         summary_file = output_dir / 'validation_summary.json'
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with atomic_open(summary_file, 'wb') as f:
+            f.write(summary_payload)
 
         print(f"   {summary_file.relative_to(project_root)}")
 
@@ -500,8 +565,8 @@ class LongTermEvidenceValidator:
         frontend_dir.mkdir(parents=True, exist_ok=True)
 
         frontend_file = frontend_dir / 'long_term_validation_summary.json'
-        with open(frontend_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with atomic_open(frontend_file, 'wb') as f:
+            f.write(summary_payload)
 
         print(f"   {frontend_file.relative_to(project_root)}")
 
@@ -518,15 +583,24 @@ class LongTermEvidenceValidator:
         print(f"   Research gaps identified: {len(summary['research_gaps'])}")
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Validate long-term side effects against PubMed.")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Hide per-effect and per-query progress details")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
+    args = parse_args(argv)
     project_root = Path(__file__).parent.parent.parent
 
     print("\n🔬 Long-Term Birth Control Side Effects - Evidence Validation")
     print("=" * 60)
 
     # Load long-term side effect stats
-    validator = LongTermEvidenceValidator()
+    validator = LongTermEvidenceValidator(verbose=not args.quiet)
     side_effects = validator.load_long_term_stats()
 
     if not side_effects:
@@ -537,9 +611,8 @@ def main():
     # Get total posts from filter report
     filter_report_file = project_root / 'data/analysis/long_term_filter_report.json'
     if filter_report_file.exists():
-        with open(filter_report_file, 'r', encoding='utf-8') as f:
-            filter_data = json.load(f)
-            total_posts = filter_data['posts_matching_long_term']
+        filter_data = read_json(filter_report_file)
+        total_posts = filter_data['posts_matching_long_term']
     else:
         total_posts = DEFAULT_LONG_TERM_POSTS  # Default from our filtering
 
@@ -6,12 +6,74 @@ Uses LLM to assess if each PubMed paper is genuinely about the side effect
 in relation to birth control, filtering out spurious matches.
 """
 
+import argparse
+import asyncio
+import hashlib
 import os
-from typing import Dict, List
-from openai import OpenAI
+import re
+import sys
+import tempfile
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Tuple
 import json
 import time
-from tqdm import tqdm
+
+# Add parent directory to path to import the shared JSON helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_collection.json_io import read_json, write_json
+
+
+# Birth control vocabulary (method, hormone and brand names); papers whose
+# title and abstract contain none of it are rejected without an API call
+BIRTH_CONTROL_PATTERN = re.compile(
+    r'\b(?:contracept|birth control|pills?\b|hormonal|progest|estrogen|oestrogen|estradiol|'
+    r'ethinyl|levonorgestrel|norgest|norethi|drospirenone|desogestrel|gestodene|'
+    r'dienogest|etonogestrel|cyproterone|medroxyprogesterone|dmpa|depo|iud|ius\b|'
+    r'intrauterine|implant|nexplanon|mirena|nuvaring|vaginal ring|patch|'
+    # Abbreviations: (C)OC(P)s, OCs, LARC(s); a false match only costs an API call
+    r'c?ocps?\b|c?ocs?\b|larcs?\b|'
+    # Common pill and device brands
+    r'yasmin|yaz\b|loestrin|microgynon|marvelon|cerazette|slynd|seasonique|'
+    r'diane-?35|ortho tri-cyclen|kyleena|skyla|liletta|jaydess|annovera|xulane|twirla)',
+    re.IGNORECASE
+)
+
+# Static instructions sent verbatim as the system message of every request, so
+# requests share an identical prefix; per-paper details go in the user message
+_RUBRIC = """You are a medical research analyst assessing paper relevance.
+
+You will be given a side effect and one or more research papers. Decide whether each paper is relevant to that side effect being caused by birth control (BC).
+
+A paper is RELEVANT if it:
+- Studies the side effect in birth control users
+- Discusses mechanisms of how BC causes the side effect
+- Compares the side effect's rates across BC types
+- Reports prevalence/incidence of the side effect in BC users
+- Reviews side effects of BC and mentions the side effect
+
+A paper is NOT RELEVANT if it:
+- Only mentions BC or the side effect in passing/unrelated context
+- Studies the side effect in non-BC populations (pregnancy, abortion, general population)
+- Focuses on unrelated topics that happen to mention the terms
+- Studies BC for reasons unrelated to the side effect
+"""
+
+_STRICTNESS = """
+Be strict: Only mark as relevant if the paper is ACTUALLY studying this side effect in BC context.
+"""
+
+RELEVANCE_SYSTEM_PROMPT = _RUBRIC + """
+Examples:
+- side effect + "timing of pregnancy" = NOT relevant (pregnancy study, not BC side effect study)
+- side effect + "oral contraceptives increase risk" = RELEVANT
+- side effect + "women seeking abortion" = NOT relevant (abortion study, not BC)
+""" + _STRICTNESS
+
+# Compact mode: one example, and replies are just {"r": 0|1, "s": score}
+COMPACT_SYSTEM_PROMPT = _RUBRIC + """
+Example:
+- side effect + "timing of pregnancy" = NOT relevant (pregnancy study, not BC side effect study)
+""" + _STRICTNESS
 
 
 class PubMedRelevanceChecker:
@@ -19,20 +81,361 @@ class PubMedRelevanceChecker:
     Checks relevance of PubMed papers to birth control side effects using LLM
     """
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini"):
+    # Batch API jobs: lists shorter than this use per-paper calls instead
+    BATCH_MIN_PAPERS = 20
+    BATCH_POLL_INTERVAL = 5      # seconds, doubled after each poll
+    BATCH_MAX_POLL_INTERVAL = 300
+    BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    # How long cached assessments stay valid (seconds)
+    CACHE_TTL = 30 * 24 * 60 * 60
+
+    # Retries for rate limits (429), server errors, timeouts and dropped
+    # connections; the OpenAI client backs off exponentially with jitter and
+    # honours Retry-After between attempts
+    MAX_RETRIES = 6
+
+    # Minimum seconds between progress bar redraws
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini",
+                 use_batch_api: bool = False, max_concurrent_requests: int = 8,
+                 cache_dir: Optional[str] = 'data/cache/relevance',
+                 papers_per_prompt: int = 1, compact: bool = False,
+                 prefilter: bool = True, service_tier: Optional[str] = None,
+                 judge_model: Optional[str] = None,
+                 uncertainty_band: Tuple[float, float] = (0.4, 0.7),
+                 target_relevant: Optional[int] = None):
         """
         Initialize with OpenAI API key
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-4o-mini for cost efficiency)
+            use_batch_api: Submit paper lists as OpenAI Batch API jobs (half the
+                cost, but jobs can take up to 24h to complete)
+            max_concurrent_requests: Maximum OpenAI requests in flight at once
+            cache_dir: Directory for cached assessments (None disables caching)
+            papers_per_prompt: Papers assessed per request; above 1 the rubric is
+                sent once for several papers (not used for Batch API jobs)
+            compact: Ask only for a relevant flag and score (no reason or
+                connection text), cutting output tokens per assessment
+            prefilter: Mark papers that never mention birth control as not
+                relevant without calling the API
+            service_tier: OpenAI processing tier sent with each request (e.g.
+                "flex" for cheaper, slower processing on models that support it)
+            judge_model: Optional stronger model that re-assesses papers whose
+                score falls in uncertainty_band
+            uncertainty_band: Scores (low inclusive, high exclusive) that count as
+                borderline and go to judge_model
+            target_relevant: Stop assessing a side effect's papers once this many
+                pass min_relevance (10 already gives full research coverage);
+                the rest are left unassessed. None assesses every paper
         """
+        # The key is only required once a request has to be sent, so runs
+        # served entirely from the cache work without one
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.model = model
+        self.use_batch_api = use_batch_api
+        self.max_concurrent_requests = max_concurrent_requests
+        self.cache_dir = cache_dir
+        self.stats = {'hits': 0, 'misses': 0}
+        self.papers_per_prompt = max(1, papers_per_prompt)
+        self.compact = compact
+        self.prefilter = prefilter
+        self.prefiltered = 0
+        self.service_tier = service_tier
+        self.uncertainty_band = uncertainty_band
+        self.target_relevant = target_relevant
+        self.unassessed = 0
+
+        # Second pass for borderline papers, one paper per request
+        self.judge = None
+        if judge_model:
+            self.judge = PubMedRelevanceChecker(
+                api_key=self.api_key, model=judge_model,
+                max_concurrent_requests=max_concurrent_requests,
+                cache_dir=cache_dir, compact=compact, prefilter=False
+            )
+
+    def _require_api_key(self):
+        """Raise ValueError if no OpenAI API key was given."""
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY or pass api_key parameter")
 
-        self.client = OpenAI(api_key=self.api_key)
-        self.model = model
+    @cached_property
+    def client(self):
+        """OpenAI client, created (and openai imported) on first use."""
+        self._require_api_key()
+        from openai import OpenAI
+
+        return OpenAI(api_key=self.api_key, max_retries=self.MAX_RETRIES)
+
+    @staticmethod
+    def _prompt_abstract(paper: Dict) -> str:
+        """Abstract text for a prompt: title-only placeholder if missing, truncated if long."""
+        # Handle cases where abstract is missing
+        abstract = paper.get('abstract', '')
+        if not abstract or abstract == '[No abstract available]':
+            # Use title only for relevance assessment
+            abstract = f"[Abstract not available. Title only: {paper['title']}]"
+
+        # Truncate abstract if too long (max 1000 chars to save tokens)
+        if len(abstract) > 1000:
+            abstract = abstract[:1000] + "..."
+
+        return abstract
+
+    def _build_request(self, side_effect: str, paper: Dict) -> Dict:
+        """Chat completion parameters for one (side effect, paper) assessment."""
+        abstract = self._prompt_abstract(paper)
+
+        if self.compact:
+            schema = '{"r": 0 or 1 (1 = relevant), "s": relevance score 0.0-1.0}'
+        else:
+            schema = """{
+  "is_relevant": true/false,
+  "relevance_score": 0.0-1.0,
+  "reason": "Brief explanation of why relevant or not (1 sentence)",
+  "connection": "How the paper relates to side effect + BC (if relevant, 1 sentence, or empty string if not relevant)"
+}"""
+
+        prompt = f"""Side effect: {side_effect}
+
+Paper Title: {paper['title']}
+Abstract: {abstract}
+
+Return JSON:
+{schema}
+"""
+
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": COMPACT_SYSTEM_PROMPT if self.compact else RELEVANCE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,  # Low temperature for consistency
+            "max_tokens": 20 if self.compact else 200
+        }
+        if self.service_tier:
+            request["service_tier"] = self.service_tier
+        return request
+
+    def _build_bulk_request(self, side_effect: str, papers: List[Dict]) -> Dict:
+        """Chat completion parameters for assessing several papers in one request."""
+        paper_blocks = "\n\n".join(
+            f"Paper {i}\nTitle: {paper['title']}\nAbstract: {self._prompt_abstract(paper)}"
+            for i, paper in enumerate(papers, 1)
+        )
+
+        if self.compact:
+            result_schema = f'{{"paper_index": 1-{len(papers)}, "r": 0 or 1 (1 = relevant), "s": relevance score 0.0-1.0}}'
+        else:
+            result_schema = f"""{{
+      "paper_index": 1-{len(papers)},
+      "is_relevant": true/false,
+      "relevance_score": 0.0-1.0,
+      "reason": "Brief explanation of why relevant or not (1 sentence)",
+      "connection": "How the paper relates to side effect + BC (if relevant, 1 sentence, or empty string if not relevant)"
+    }}"""
+
+        prompt = f"""Side effect: {side_effect}
+
+{paper_blocks}
+
+Assess each paper independently. Return JSON with one result per paper, in order:
+{{
+  "results": [
+    {result_schema}
+  ]
+}}
+"""
+
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": COMPACT_SYSTEM_PROMPT if self.compact else RELEVANCE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,  # Low temperature for consistency
+            # Compact results carry a paper_index, so allow a little more per paper
+            "max_tokens": (30 if self.compact else 200) * len(papers)
+        }
+        if self.service_tier:
+            request["service_tier"] = self.service_tier
+        return request
+
+    @staticmethod
+    def _parse_bulk_assessments(content: str, papers: List[Dict]) -> List[Dict]:
+        """
+        Parse a multi-paper reply into one assessment per paper, in order.
+
+        Raises:
+            ValueError: If the reply isn't valid JSON, or any paper's result is
+                missing, repeated or outside 1..len(papers)
+        """
+        by_index = {}
+        try:
+            for result in json.loads(content)['results']:
+                index = int(result['paper_index'])
+                # A repeated or unknown index means results can't be trusted to line up
+                if index in by_index or not 1 <= index <= len(papers):
+                    raise ValueError(f"Unexpected paper_index {index} for {len(papers)} papers")
+                by_index[index] = result
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed bulk reply: {e}") from e
+
+        assessments = []
+        for i, paper in enumerate(papers, 1):
+            result = PubMedRelevanceChecker._expand_compact(by_index.pop(i, {}))
+            if 'relevance_score' not in result:
+                raise ValueError(f"No result for paper {i} of {len(papers)}")
+
+            result.pop('paper_index', None)
+            result.setdefault('reason', '')
+            result.setdefault('connection', '')
+            result['pmid'] = paper.get('pmid', '')
+            result['title'] = paper['title']
+            assessments.append(result)
+
+        return assessments
+
+    def _cached_bulk_assessments(self, request: Dict, papers: List[Dict]) -> Optional[List[Dict]]:
+        """Bulk assessments from the cache, or None on a miss."""
+        content = self._load_cached(request)
+        if content is not None:
+            try:
+                assessments = self._parse_bulk_assessments(content, papers)
+            except ValueError:
+                pass
+            else:
+                self.stats['hits'] += 1
+                return assessments
+
+        self.stats['misses'] += 1
+        return None
+
+    def _cache_path(self, request: Dict) -> str:
+        """Cache file for a request (keyed on the full payload: model, prompt and settings)."""
+        # The processing tier doesn't change the answer, so it isn't part of the key
+        payload = {key: value for key, value in request.items() if key != 'service_tier'}
+        payload = json.dumps(payload, sort_keys=True).encode('utf-8')
+        key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, request: Dict) -> Optional[str]:
+        """Return the cached model reply for a request if present and not expired."""
+        if self.cache_dir is None:
+            return None
+
+        path = self._cache_path(request)
+        try:
+            if time.time() - os.path.getmtime(path) > self.CACHE_TTL:
+                return None
+            return read_json(path)['content']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cached(self, request: Dict, content: str):
+        """Store a model reply for later runs."""
+        if self.cache_dir is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_json(self._cache_path(request), {'content': content}, indent=False)
+        except OSError as e:
+            print(f"⚠️  Could not cache assessment: {e}")
+
+    def _cached_assessment(self, request: Dict, paper: Dict) -> Optional[Dict]:
+        """Assessment from the cache, or None on a miss (hits and misses are counted)."""
+        content = self._load_cached(request)
+        if content is None:
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            assessment = self._parse_assessment(content, paper)
+        except ValueError:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return assessment
+
+    @staticmethod
+    def _expand_compact(result: Dict) -> Dict:
+        """Map a compact {"r", "s"} result to the full assessment fields."""
+        if 's' not in result or 'relevance_score' in result:
+            return result
+
+        expanded = {
+            'is_relevant': bool(result['r']) if 'r' in result else False,
+            'relevance_score': float(result['s']),
+            'reason': '',
+            'connection': ''
+        }
+        if 'paper_index' in result:
+            expanded['paper_index'] = result['paper_index']
+        return expanded
+
+    @staticmethod
+    def _parse_assessment(content: str, paper: Dict) -> Dict:
+        """Parse the model's JSON reply and attach the paper's PMID and title."""
+        result = PubMedRelevanceChecker._expand_compact(json.loads(content))
+
+        # Add original paper info
+        result['pmid'] = paper.get('pmid', '')
+        result['title'] = paper['title']
+
+        return result
+
+    @staticmethod
+    def _error_assessment(paper: Dict, error) -> Dict:
+        """Conservative (not relevant) assessment for a paper that failed."""
+        print(f"Error assessing relevance for PMID {paper.get('pmid', 'unknown')}: {error}")
+        return {
+            'is_relevant': False,
+            'relevance_score': 0.0,
+            'reason': f"Error during assessment: {str(error)}",
+            'connection': '',
+            'pmid': paper.get('pmid', ''),
+            'title': paper['title']
+        }
+
+    def _unassessed(self, paper: Dict) -> Dict:
+        """Placeholder for a paper skipped because target_relevant was already reached."""
+        self.unassessed += 1
+        return {
+            'is_relevant': None,
+            'relevance_score': 0.0,
+            'reason': f"Not assessed: {self.target_relevant} relevant papers already found",
+            'connection': '',
+            'pmid': paper.get('pmid', ''),
+            'title': paper['title']
+        }
+
+    def _cheap_prefilter(self, paper: Dict) -> Optional[Dict]:
+        """Not-relevant assessment for a paper with no birth control terms, else None."""
+        if not self.prefilter:
+            return None
+
+        text = f"{paper.get('title') or ''} {paper.get('abstract') or ''}"
+        if BIRTH_CONTROL_PATTERN.search(text):
+            return None
+
+        self.prefiltered += 1
+        return {
+            'is_relevant': False,
+            'relevance_score': 0.0,
+            'reason': "No birth control terms in title or abstract (keyword prefilter)",
+            'connection': '',
+            'pmid': paper.get('pmid', ''),
+            'title': paper['title']
+        }
 
     def assess_relevance(self, side_effect: str, paper: Dict) -> Dict:
         """
@@ -51,81 +454,336 @@ class PubMedRelevanceChecker:
                 'connection': str (if relevant)
             }
         """
-        # Handle cases where abstract is missing
-        abstract = paper.get('abstract', '')
-        if not abstract or abstract == '[No abstract available]':
-            # Use title only for relevance assessment
-            abstract = f"[Abstract not available. Title only: {paper['title']}]"
+        prefiltered = self._cheap_prefilter(paper)
+        if prefiltered is not None:
+            return prefiltered
 
-        # Truncate abstract if too long (max 1000 chars to save tokens)
-        if len(abstract) > 1000:
-            abstract = abstract[:1000] + "..."
+        request = self._build_request(side_effect, paper)
+        cached = self._cached_assessment(request, paper)
+        if cached is not None:
+            return cached
 
-        prompt = f"""Is this research paper relevant to the side effect "{side_effect}" caused by birth control?
+        # Outside the try: a missing API key must fail loudly, not read as "not relevant"
+        client = self.client
+        try:
+            response = client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            assessment = self._parse_assessment(content, paper)
 
-Paper Title: {paper['title']}
-Abstract: {abstract}
+        except Exception as e:
+            # Return conservative assessment on error
+            return self._error_assessment(paper, e)
 
-Return JSON:
-{{
-  "is_relevant": true/false,
-  "relevance_score": 0.0-1.0,
-  "reason": "Brief explanation of why relevant or not (1 sentence)",
-  "connection": "How the paper relates to side effect + BC (if relevant, 1 sentence, or empty string if not relevant)"
-}}
+        self._save_cached(request, content)
+        return assessment
 
-A paper is RELEVANT if it:
-- Studies "{side_effect}" in birth control users
-- Discusses mechanisms of how BC causes "{side_effect}"
-- Compares "{side_effect}" rates across BC types
-- Reports prevalence/incidence of "{side_effect}" in BC users
-- Reviews side effects of BC and mentions "{side_effect}"
+    def assess_papers_bulk(self, side_effect: str, papers_batch: List[Dict]) -> List[Dict]:
+        """
+        Assess several papers with one request (falls back to one request per
+        paper if the reply can't be matched to every paper)
 
-A paper is NOT RELEVANT if it:
-- Only mentions BC or "{side_effect}" in passing/unrelated context
-- Studies "{side_effect}" in non-BC populations (pregnancy, abortion, general population)
-- Focuses on unrelated topics that happen to mention the terms
-- Studies BC for reasons unrelated to "{side_effect}"
+        Args:
+            side_effect: Name of the side effect
+            papers_batch: Papers to assess together (a handful; each adds to the prompt)
 
-Examples:
-- "{side_effect}" + "timing of pregnancy" = NOT relevant (pregnancy study, not BC side effect study)
-- "{side_effect}" + "oral contraceptives increase risk" = RELEVANT
-- "{side_effect}" + "women seeking abortion" = NOT relevant (abortion study, not BC)
+        Returns:
+            One assessment per paper (same format as assess_relevance), in order
+        """
+        if len(papers_batch) == 1:
+            return [self.assess_relevance(side_effect, papers_batch[0])]
 
-Be strict: Only mark as relevant if the paper is ACTUALLY studying this side effect in BC context.
-"""
+        request = self._build_bulk_request(side_effect, papers_batch)
+        cached = self._cached_bulk_assessments(request, papers_batch)
+        if cached is not None:
+            return cached
 
+        client = self.client
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a medical research analyst assessing paper relevance."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1,  # Low temperature for consistency
-                max_tokens=200
-            )
+            response = client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            assessments = self._parse_bulk_assessments(content, papers_batch)
 
-            result = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            print(f"Bulk assessment failed for '{side_effect}' ({e}); assessing papers individually")
+            return [self.assess_relevance(side_effect, paper) for paper in papers_batch]
 
-            # Add original paper info
-            result['pmid'] = paper.get('pmid', '')
-            result['title'] = paper['title']
+        self._save_cached(request, content)
+        return assessments
 
-            return result
+    def _async_client(self):
+        """New async client (created per event loop, so it is not reused across asyncio.run calls)."""
+        self._require_api_key()
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=self.api_key, max_retries=self.MAX_RETRIES)
+
+    async def _assess_relevance_async(self, get_client: Callable, side_effect: str, paper: Dict) -> Dict:
+        """Async version of assess_relevance (get_client returns the shared async client)."""
+        prefiltered = self._cheap_prefilter(paper)
+        if prefiltered is not None:
+            return prefiltered
+
+        request = self._build_request(side_effect, paper)
+        cached = self._cached_assessment(request, paper)
+        if cached is not None:
+            return cached
+
+        client = get_client()
+        try:
+            response = await client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            assessment = self._parse_assessment(content, paper)
 
         except Exception as e:
-            print(f"Error assessing relevance for PMID {paper.get('pmid', 'unknown')}: {e}")
-            # Return conservative assessment on error
-            return {
-                'is_relevant': False,
-                'relevance_score': 0.0,
-                'reason': f"Error during assessment: {str(e)}",
-                'connection': '',
-                'pmid': paper.get('pmid', ''),
-                'title': paper['title']
-            }
+            return self._error_assessment(paper, e)
+
+        self._save_cached(request, content)
+        return assessment
+
+    async def _assess_papers_bulk_async(self, get_client: Callable, side_effect: str,
+                                        papers_batch: List[Dict]) -> List[Dict]:
+        """Async version of assess_papers_bulk."""
+        if len(papers_batch) == 1:
+            return [await self._assess_relevance_async(get_client, side_effect, papers_batch[0])]
+
+        request = self._build_bulk_request(side_effect, papers_batch)
+        cached = self._cached_bulk_assessments(request, papers_batch)
+        if cached is not None:
+            return cached
+
+        client = get_client()
+        try:
+            response = await client.chat.completions.create(**request)
+            content = response.choices[0].message.content
+            assessments = self._parse_bulk_assessments(content, papers_batch)
+
+        except Exception as e:
+            print(f"Bulk assessment failed for '{side_effect}' ({e}); assessing papers individually")
+            return [
+                await self._assess_relevance_async(get_client, side_effect, paper)
+                for paper in papers_batch
+            ]
+
+        self._save_cached(request, content)
+        return assessments
+
+    def _chunks(self, papers: List[Dict]) -> List[List[Dict]]:
+        """Split papers into groups of papers_per_prompt."""
+        size = self.papers_per_prompt
+        return [papers[i:i + size] for i in range(0, len(papers), size)]
+
+    async def _assess_all_async(self, jobs: List[Tuple[str, List[Dict]]]) -> List[List[Dict]]:
+        """
+        Assess every (side effect, papers) job concurrently.
+
+        All jobs share one client and one semaphore, so at most
+        max_concurrent_requests requests are in flight across all side effects.
+        The client is only created on the first cache miss.
+        """
+        from tqdm import tqdm
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        chunked_jobs = [(side_effect, self._chunks(papers)) for side_effect, papers in jobs]
+        clients = []
+
+        def get_client():
+            if not clients:
+                clients.append(self._async_client())
+            return clients[0]
+
+        # Advanced once per finished request (by its paper count) and redrawn
+        # at most every PROGRESS_INTERVAL seconds
+        with tqdm(total=sum(len(papers) for _, papers in jobs), desc="Checking papers",
+                  unit="paper", mininterval=self.PROGRESS_INTERVAL) as progress:
+            async def assess_chunk(side_effect: str, chunk: List[Dict]) -> List[Dict]:
+                async with semaphore:
+                    assessments = await self._assess_papers_bulk_async(get_client, side_effect, chunk)
+                progress.update(len(chunk))
+                return assessments
+
+            try:
+                results = iter(await asyncio.gather(*[
+                    assess_chunk(side_effect, chunk)
+                    for side_effect, chunks in chunked_jobs for chunk in chunks
+                ]))
+            finally:
+                if clients:
+                    await clients[0].close()
+
+        return [
+            [assessment for _ in chunks for assessment in next(results)]
+            for _, chunks in chunked_jobs
+        ]
+
+    def _assess_many(self, jobs: List[Tuple[str, List[Dict]]]) -> List[List[Dict]]:
+        """
+        One list of assessments per (side effect, papers) job, each in paper order.
+
+        Requests run concurrently unless an event loop is already running
+        (e.g. inside Jupyter), where papers are assessed one at a time.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._assess_all_async(jobs))
+
+        from tqdm import tqdm
+
+        results = []
+        for side_effect, papers in jobs:
+            assessments = []
+            with tqdm(total=len(papers), desc=f"Checking {side_effect}", unit="paper",
+                      mininterval=self.PROGRESS_INTERVAL) as progress:
+                for chunk in self._chunks(papers):
+                    assessments.extend(self.assess_papers_bulk(side_effect, chunk))
+                    progress.update(len(chunk))
+            results.append(assessments)
+
+        return results
+
+    def _assess_until_target(self, jobs: List[Tuple[str, List[Dict]]],
+                             min_relevance: float) -> List[List[Dict]]:
+        """
+        Like _assess_many, but stops on a side effect once target_relevant of its
+        papers score at least min_relevance.
+
+        Papers are assessed in paper order, one round of max_concurrent_requests
+        requests per unfinished side effect at a time, so where a side effect
+        stops doesn't depend on which requests happen to finish first.
+        """
+        round_size = self.max_concurrent_requests * self.papers_per_prompt
+        job_results = [[] for _ in jobs]
+        relevant = [0] * len(jobs)
+
+        while True:
+            pending = [
+                j for j, (_, papers) in enumerate(jobs)
+                if relevant[j] < self.target_relevant and len(job_results[j]) < len(papers)
+            ]
+            if not pending:
+                break
+
+            round_jobs = [
+                (jobs[j][0], jobs[j][1][len(job_results[j]):len(job_results[j]) + round_size])
+                for j in pending
+            ]
+            for j, results in zip(pending, self._assess_many(round_jobs)):
+                job_results[j].extend(results)
+                relevant[j] += sum(result['relevance_score'] >= min_relevance for result in results)
+
+        for (_, papers), results in zip(jobs, job_results):
+            results.extend(self._unassessed(paper) for paper in papers[len(results):])
+
+        return job_results
+
+    def _run_batch_job(self, requests: List[Dict]) -> Dict[str, Dict]:
+        """
+        Run chat completion requests as one OpenAI Batch API job.
+
+        Args:
+            requests: Batch input lines ({'custom_id', 'method', 'url', 'body'})
+
+        Returns:
+            Dict mapping custom_id to its chat completion body (failed
+            requests are missing)
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+            for request in requests:
+                f.write(json.dumps(request) + "\n")
+            input_path = f.name
+
+        try:
+            with open(input_path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.remove(input_path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"  Submitted batch {batch.id} ({len(requests)} requests)")
+
+        # Poll with exponential backoff until the job finishes
+        delay = self.BATCH_POLL_INTERVAL
+        while batch.status not in self.BATCH_FINAL_STATUSES:
+            time.sleep(delay)
+            delay = min(delay * 2, self.BATCH_MAX_POLL_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            print(f"  ❌ Batch {batch.id} {batch.status}")
+        if not batch.output_file_id:
+            return {}
+
+        results = {}
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') == 200:
+                results[record['custom_id']] = response['body']
+
+        return results
+
+    def assess_relevance_batched(self, side_effect: str, papers: List[Dict]) -> List[Dict]:
+        """
+        Assess relevance for a list of papers with a single Batch API job
+
+        Args:
+            side_effect: Name of the side effect
+            papers: List of paper dictionaries
+
+        Returns:
+            One assessment per paper (same format as assess_relevance), in order
+        """
+        return self._assess_pairs_batched([(side_effect, paper) for paper in papers])
+
+    def _assess_pairs_batched(self, pairs: List[Tuple[str, Dict]]) -> List[Dict]:
+        """One assessment per (side effect, paper) pair, from a single Batch API job."""
+        assessments = [None] * len(pairs)
+        requests = {}  # index -> request body, for pairs not in the cache
+        for i, (side_effect, paper) in enumerate(pairs):
+            request = self._build_request(side_effect, paper)
+            assessments[i] = self._cached_assessment(request, paper)
+            if assessments[i] is None:
+                requests[i] = request
+
+        if not requests:
+            return assessments
+
+        self._require_api_key()
+        try:
+            # Index-based ids: PMIDs can be missing or repeated
+            results = self._run_batch_job([
+                {"custom_id": str(i), "method": "POST", "url": "/v1/chat/completions", "body": request}
+                for i, request in requests.items()
+            ])
+        except Exception as e:
+            results = {}
+            for i in requests:
+                assessments[i] = self._error_assessment(pairs[i][1], e)
+
+        for i, request in requests.items():
+            if assessments[i] is not None:
+                continue
+            paper = pairs[i][1]
+            body = results.get(str(i))
+            if body is None:
+                assessments[i] = self._error_assessment(paper, "no result in batch output")
+                continue
+            try:
+                content = body['choices'][0]['message']['content']
+                assessments[i] = self._parse_assessment(content, paper)
+            except Exception as e:
+                assessments[i] = self._error_assessment(paper, e)
+                continue
+            self._save_cached(request, content)
+
+        return assessments
 
     def assess_paper_list(self, side_effect: str, papers: List[Dict], min_relevance: float = 0.7) -> List[Dict]:
         """
@@ -142,30 +800,111 @@ Be strict: Only mark as relevant if the paper is ACTUALLY studying this side eff
         if not papers:
             return []
 
-        assessed_papers = []
+        return self.assess_paper_lists({side_effect: papers}, min_relevance)[side_effect]
 
-        print(f"\nAssessing relevance of {len(papers)} papers for '{side_effect}'...")
+    def assess_paper_lists(self, papers_by_side_effect: Dict[str, List[Dict]],
+                           min_relevance: float = 0.7) -> Dict[str, List[Dict]]:
+        """
+        Assess relevance for several side effects' papers together and filter by minimum score
 
-        for paper in tqdm(papers, desc=f"Checking {side_effect}", unit="paper"):
-            assessment = self.assess_relevance(side_effect, paper)
+        Requests for all side effects run concurrently under one
+        max_concurrent_requests limit (or go into one Batch API job), rather
+        than one side effect after another. target_relevant is not applied to
+        Batch API jobs, which are submitted in one go.
 
-            # Add assessment fields to paper dict
-            paper_with_relevance = paper.copy()
-            paper_with_relevance['relevance_score'] = assessment['relevance_score']
-            paper_with_relevance['relevance_reason'] = assessment['reason']
-            paper_with_relevance['relevance_connection'] = assessment['connection']
-            paper_with_relevance['is_relevant'] = assessment['is_relevant']
+        Args:
+            papers_by_side_effect: Dict of {side_effect: [paper, ...]}
+            min_relevance: Minimum relevance score to include (default: 0.7)
 
-            # Only include if meets minimum relevance threshold
-            if assessment['relevance_score'] >= min_relevance:
-                assessed_papers.append(paper_with_relevance)
+        Returns:
+            Dict of {side_effect: papers with relevance scores, filtered by min_relevance}
+        """
+        assessments = {}
+        jobs = []  # (side effect, papers that need the API)
+
+        for side_effect, papers in papers_by_side_effect.items():
+            if not papers:
+                continue
+
+            print(f"\nAssessing relevance of {len(papers)} papers for '{side_effect}'...")
+
+            # Papers that never mention birth control are settled without the API
+            assessments[side_effect] = [self._cheap_prefilter(paper) for paper in papers]
+            to_assess = [
+                paper for paper, assessment in zip(papers, assessments[side_effect])
+                if assessment is None
+            ]
+            if to_assess:
+                jobs.append((side_effect, to_assess))
+
+        if self.use_batch_api and sum(len(papers) for _, papers in jobs) >= self.BATCH_MIN_PAPERS:
+            pair_results = iter(self._assess_pairs_batched([
+                (side_effect, paper) for side_effect, papers in jobs for paper in papers
+            ]))
+            job_results = [[next(pair_results) for _ in papers] for _, papers in jobs]
+        elif jobs and self.target_relevant is not None:
+            job_results = self._assess_until_target(jobs, min_relevance)
+        elif jobs:
+            job_results = self._assess_many(jobs)
+        else:
+            job_results = []
+
+        if self.judge is not None:
+            self._rejudge(jobs, job_results)
+
+        for (side_effect, _), results in zip(jobs, job_results):
+            results = iter(results)
+            assessments[side_effect] = [
+                assessment if assessment is not None else next(results)
+                for assessment in assessments[side_effect]
+            ]
+
+        relevant_by_side_effect = {}
+        for side_effect, papers in papers_by_side_effect.items():
+            assessed_papers = []
+
+            for paper, assessment in zip(papers, assessments.get(side_effect, [])):
+                # Only include if meets minimum relevance threshold
+                if assessment['relevance_score'] < min_relevance:
+                    continue
+
+                # Paper with assessment fields added (built only for papers that are kept)
+                assessed_papers.append(dict(
+                    paper,
+                    relevance_score=assessment['relevance_score'],
+                    relevance_reason=assessment['reason'],
+                    relevance_connection=assessment['connection'],
+                    is_relevant=assessment['is_relevant']
+                ))
 
-            # Rate limiting: ~1 request per second to avoid OpenAI rate limits
-            time.sleep(0.1)
+            if papers:
+                print(f"  ✓ {side_effect}: {len(assessed_papers)}/{len(papers)} papers passed "
+                      f"relevance threshold ({min_relevance})")
+            relevant_by_side_effect[side_effect] = assessed_papers
 
-        print(f"  ✓ {len(assessed_papers)}/{len(papers)} papers passed relevance threshold ({min_relevance})")
+        return relevant_by_side_effect
 
-        return assessed_papers
+    def _rejudge(self, jobs: List[Tuple[str, List[Dict]]], job_results: List[List[Dict]]):
+        """Replace borderline assessments (score in uncertainty_band) with judge_model's, in place."""
+        low, high = self.uncertainty_band
+        judge_jobs = []
+        positions = []  # (job index, paper indices) for each judge job
+
+        for j, ((side_effect, papers), results) in enumerate(zip(jobs, job_results)):
+            borderline = [i for i, result in enumerate(results) if low <= result['relevance_score'] < high]
+            if borderline:
+                judge_jobs.append((side_effect, [papers[i] for i in borderline]))
+                positions.append((j, borderline))
+
+        if not judge_jobs:
+            return
+
+        print(f"\nRe-checking {sum(len(indices) for _, indices in positions)} borderline papers "
+              f"with {self.judge.model}...")
+
+        for (j, indices), verdicts in zip(positions, self.judge._assess_many(judge_jobs)):
+            for i, verdict in zip(indices, verdicts):
+                job_results[j][i] = verdict
 
     def assess_all_symptoms(self, validated_database: Dict, min_relevance: float = 0.7) -> Dict:
         """
@@ -183,24 +922,27 @@ Be strict: Only mark as relevant if the paper is ACTUALLY studying this side eff
         total_papers_before = 0
         total_papers_after = 0
 
+        # Assess every symptom's papers together (requests run concurrently)
+        relevant_by_symptom = self.assess_paper_lists(
+            {symptom: data.get('pubmed_papers', []) for symptom, data in validated_database.items()},
+            min_relevance
+        )
+
         for symptom, data in validated_database.items():
             papers = data.get('pubmed_papers', [])
             total_papers_before += len(papers)
 
             if papers:
-                # Assess relevance for all papers
-                relevant_papers = self.assess_paper_list(symptom, papers, min_relevance)
+                relevant_papers = relevant_by_symptom[symptom]
                 total_papers_after += len(relevant_papers)
 
-                # Update data with filtered papers
-                updated_data = data.copy()
-                updated_data['pubmed_papers'] = relevant_papers
-                updated_data['paper_count'] = len(relevant_papers)
-
-                # Recalculate research coverage based on filtered count
-                updated_data['research_coverage'] = min(len(relevant_papers) / 10, 1.0)
-
-                updated_database[symptom] = updated_data
+                # Filtered papers, with research coverage recalculated from the filtered count
+                updated_database[symptom] = {
+                    **data,
+                    'pubmed_papers': relevant_papers,
+                    'paper_count': len(relevant_papers),
+                    'research_coverage': min(len(relevant_papers) / 10, 1.0)
+                }
             else:
                 # No papers to assess
                 updated_database[symptom] = data
@@ -209,27 +951,40 @@ Be strict: Only mark as relevant if the paper is ACTUALLY studying this side eff
         print(f"   Papers before: {total_papers_before}")
         print(f"   Papers after: {total_papers_after}")
         print(f"   Filtered out: {total_papers_before - total_papers_after} irrelevant papers")
+        if self.prefilter:
+            print(f"   Rejected by keyword prefilter: {self.prefiltered}")
+        if self.target_relevant is not None:
+            print(f"   Left unassessed after reaching {self.target_relevant} relevant: {self.unassessed}")
+        if self.cache_dir is not None:
+            print(f"   Cache: {self.stats['hits']} hits, {self.stats['misses']} misses")
 
         return updated_database
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Filter PubMed papers in the validated database by LLM relevance.")
+    parser.add_argument('--batch', action='store_true',
+                        help="Submit assessments as OpenAI Batch API jobs (half the cost, up to 24h)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Example usage: Assess relevance for validated symptoms database
     """
-    import json
+    args = parse_args(argv)
 
     # Load validated database
     database_path = 'data/validated/validated_side_effects_database.json'
 
     try:
-        with open(database_path, 'r') as f:
-            validated_database = json.load(f)
+        validated_database = read_json(database_path)
 
         print(f"Loaded {len(validated_database)} validated symptoms")
 
         # Initialize relevance checker
-        checker = PubMedRelevanceChecker()
+        checker = PubMedRelevanceChecker(use_batch_api=args.batch)
 
         # Assess all symptoms
         updated_database = checker.assess_all_symptoms(
@@ -239,8 +994,7 @@ def main():
 
         # Save updated database
         output_path = 'data/validated/validated_side_effects_database_filtered.json'
-        with open(output_path, 'w') as f:
-            json.dump(updated_database, f, indent=2)
+        write_json(output_path, updated_database)
 
         print(f"\n✅ Saved relevance-filtered database to: {output_path}")
 
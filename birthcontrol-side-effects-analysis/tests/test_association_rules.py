@@ -0,0 +1,154 @@
+"""
+Tests for Association Rule Mining Module
+========================================
+Tests frequent itemset discovery and rule metrics on small symptom sets.
+"""
+
+import pytest
+from src.analyzers import association_rules
+from src.analyzers.association_rules import AssociationRulesMiner
+
+
+def _rule_key(rule):
+    """Order-independent key for a rule's antecedent and consequent."""
+    return (frozenset(rule['antecedent']), frozenset(rule['consequent']))
+
+
+class TestAssociationRulesMiner:
+    """Test suite for the Apriori-based association rules miner."""
+
+    @pytest.fixture
+    def mock_posts(self):
+        """Posts with two clear symptom profiles plus noise."""
+        return [
+            {'symptoms': {'acne': 1, 'hair_loss': 1, 'post_pill_acne': 1}},
+            {'symptoms': {'acne': 1, 'hair_loss': 1}},
+            {'symptoms': {'acne': 1, 'post_pill_acne': 1}},
+            {'symptoms': {'yeast_infection': 1, 'vaginal_dryness': 1, 'low_libido': 1}},
+            {'symptoms': {'yeast_infection': 1, 'vaginal_dryness': 1}},
+            {'symptoms': {'yeast_infection': 1, 'vaginal_dryness': 1}},
+            {'symptoms': {'depression': 1, 'anxiety': 1}},
+            {'symptoms': {'depression': 1, 'anxiety': 1, 'mood_swings': 1}},
+            {'symptoms': {}},
+        ]
+
+    @pytest.mark.unit
+    def test_empty_input(self):
+        """Test that no posts (or no symptoms) produce no rules."""
+        miner = AssociationRulesMiner(min_support=2)
+        assert miner.find_patterns([]) == []
+        assert miner.find_patterns([{'symptoms': {}}]) == []
+
+    @pytest.mark.unit
+    def test_frequent_pair_rules(self, mock_posts):
+        """Test that frequently co-occurring pairs produce rules both ways."""
+        miner = AssociationRulesMiner(min_support=2, min_confidence=0.6)
+        rules = {_rule_key(rule): rule for rule in miner.find_patterns(mock_posts)}
+
+        key = (frozenset({'yeast_infection'}), frozenset({'vaginal_dryness'}))
+        assert key in rules
+        assert (frozenset({'vaginal_dryness'}), frozenset({'yeast_infection'})) in rules
+
+        rule = rules[key]
+        assert rule['support'] == 3
+        assert rule['confidence'] == pytest.approx(1.0)
+        # 8 posts with symptoms, vaginal_dryness in 3 of them
+        assert rule['lift'] == pytest.approx(8 / 3)
+        assert rule['support_pct'] == pytest.approx(3 / 8 * 100)
+
+    @pytest.mark.unit
+    def test_multi_symptom_consequent_lift(self, mock_posts):
+        """Test lift for a rule whose consequent has more than one symptom."""
+        miner = AssociationRulesMiner(min_support=1, min_confidence=0.1, min_lift=1.0)
+        rules = {_rule_key(rule): rule for rule in miner.find_patterns(mock_posts)}
+
+        key = (frozenset({'low_libido'}), frozenset({'yeast_infection', 'vaginal_dryness'}))
+        assert key in rules
+
+        # low_libido in 1 post (always with the pair), pair in 3 of 8 posts
+        rule = rules[key]
+        assert rule['confidence'] == pytest.approx(1.0)
+        assert rule['lift'] == pytest.approx(1.0 / (3 / 8))
+
+    @pytest.mark.unit
+    def test_rules_sorted_by_lift(self, mock_posts):
+        """Test that rules are returned strongest lift first."""
+        miner = AssociationRulesMiner(min_support=2, min_confidence=0.5)
+        lifts = [rule['lift'] for rule in miner.find_patterns(mock_posts)]
+
+        assert lifts == sorted(lifts, reverse=True)
+
+    @pytest.mark.unit
+    def test_min_support_filters_rules(self, mock_posts):
+        """Test that no rule is supported by fewer posts than min_support."""
+        miner = AssociationRulesMiner(min_support=3, min_confidence=0.5)
+        rules = miner.find_patterns(mock_posts)
+
+        assert rules
+        assert all(rule['support'] >= 3 for rule in rules)
+        assert {_rule_key(rule) for rule in rules} == {
+            (frozenset({'yeast_infection'}), frozenset({'vaginal_dryness'})),
+            (frozenset({'vaginal_dryness'}), frozenset({'yeast_infection'})),
+        }
+
+    @pytest.mark.unit
+    def test_large_vocabulary_itemsets(self):
+        """Test itemsets spanning more than 64 symptoms (multi-word bitmasks)."""
+        filler = [{'symptoms': {f"symptom_{i}": 1}} for i in range(100)]
+        posts = filler + [
+            {'symptoms': {'symptom_3': 1, 'symptom_70': 1, 'symptom_99': 1}}
+            for _ in range(4)
+        ]
+
+        miner = AssociationRulesMiner(min_support=4, min_confidence=0.5, min_lift=1.0)
+        rules = {_rule_key(rule): rule for rule in miner.find_patterns(posts)}
+
+        key = (frozenset({'symptom_3', 'symptom_70'}), frozenset({'symptom_99'}))
+        assert key in rules
+        assert rules[key]['support'] == 4
+        assert rules[key]['confidence'] == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('use_mlxtend', [True, False], ids=['fpgrowth', 'apriori'])
+    def test_fewer_posts_than_min_support(self, use_mlxtend, monkeypatch):
+        """Test that fewer symptom posts than min_support yield no rules on either backend."""
+        if use_mlxtend and not association_rules.MLXTEND_AVAILABLE:
+            pytest.skip("mlxtend not installed")
+        monkeypatch.setattr(association_rules, 'MLXTEND_AVAILABLE', use_mlxtend)
+
+        posts = [
+            {'symptoms': {'acne': 1, 'hair_loss': 1}},
+            {'symptoms': {'acne': 1, 'hair_loss': 1}},
+        ]
+
+        assert AssociationRulesMiner(min_support=5).find_patterns(posts) == []
+
+    @pytest.mark.unit
+    def test_apriori_matches_fpgrowth(self, mock_posts, monkeypatch):
+        """Test that the bitmask Apriori fallback finds the same rules as FP-growth."""
+        if not association_rules.MLXTEND_AVAILABLE:
+            pytest.skip("mlxtend not installed")
+
+        miner = AssociationRulesMiner(min_support=1, min_confidence=0.3, min_lift=1.0)
+        fpgrowth_rules = miner.find_patterns(mock_posts)
+
+        monkeypatch.setattr(association_rules, 'MLXTEND_AVAILABLE', False)
+        apriori_rules = miner.find_patterns(mock_posts)
+
+        def summary(rules):
+            return sorted(
+                (sorted(rule['antecedent']), sorted(rule['consequent']), rule['support'])
+                for rule in rules
+            )
+
+        assert summary(apriori_rules) == summary(fpgrowth_rules)
+
+    @pytest.mark.unit
+    def test_symptom_clusters(self, mock_posts):
+        """Test exact symptom cluster counting."""
+        miner = AssociationRulesMiner(min_support=2)
+        clusters = miner.find_symptom_clusters(mock_posts, min_cluster_size=2)
+
+        assert clusters[0]['symptoms'] == ['vaginal_dryness', 'yeast_infection']
+        assert clusters[0]['count'] == 2
+        assert len(clusters) == 1
@@ -9,15 +9,41 @@ import json
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_json(file_path):
+    """Parse a JSON data file, or return None if it doesn't exist."""
+    if not file_path.exists():
+        return None
+    raw = file_path.read_bytes()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+@pytest.fixture(scope="session")
+def data_dir():
+    """Get data directory path."""
+    return Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture(scope="session")
+def validated_data(data_dir):
+    """Validated side effects database, parsed once per session (None if missing)."""
+    return _load_json(data_dir / "validated_side_effects_database.json")
+
+
+@pytest.fixture(scope="session")
+def long_term_data(data_dir):
+    """Long-term side effects data, parsed once per session (None if missing)."""
+    return _load_json(data_dir / "long_term_validated_side_effects.json")
+
 
 class TestDataFileStructure:
     """Test suite for validating data file structures."""
 
-    @pytest.fixture
-    def data_dir(self):
-        """Get data directory path."""
-        return Path(__file__).parent.parent / "data"
-
     @pytest.mark.data
     def test_validated_side_effects_exists(self, data_dir):
         """Test that validated side effects file exists."""
@@ -26,15 +52,12 @@ class TestDataFileStructure:
             assert file_path.is_file()
 
     @pytest.mark.data
-    def test_validated_side_effects_structure(self, data_dir):
+    def test_validated_side_effects_structure(self, validated_data):
         """Test validated side effects JSON structure."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         # Should be a list
         assert isinstance(data, list), "Data should be a list"
@@ -54,15 +77,12 @@ class TestDataFileStructure:
             assert field in first_item, f"Missing required field: {field}"
 
     @pytest.mark.data
-    def test_reddit_data_structure(self, data_dir):
+    def test_reddit_data_structure(self, validated_data):
         """Test reddit_data field structure."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         for item in data:
             reddit_data = item['reddit_data']
@@ -83,15 +103,12 @@ class TestDataFileStructure:
             assert reddit_data['post_count'] >= 0
 
     @pytest.mark.data
-    def test_pubmed_data_structure(self, data_dir):
+    def test_pubmed_data_structure(self, validated_data):
         """Test pubmed_data field structure."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         for item in data:
             pubmed_data = item['pubmed_data']
@@ -107,15 +124,12 @@ class TestDataFileStructure:
                 assert isinstance(pubmed_data['papers'], list)
 
     @pytest.mark.data
-    def test_evidence_tiers_valid(self, data_dir):
+    def test_evidence_tiers_valid(self, validated_data):
         """Test that evidence tiers are valid."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         valid_tiers = [1, 2, 3, 4]
         valid_labels = [
@@ -132,30 +146,24 @@ class TestDataFileStructure:
                 f"Invalid tier label: {item['tier_label']}"
 
     @pytest.mark.data
-    def test_no_duplicate_side_effects(self, data_dir):
+    def test_no_duplicate_side_effects(self, validated_data):
         """Test that there are no duplicate side effects."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         side_effects = [item['side_effect'] for item in data]
         assert len(side_effects) == len(set(side_effects)), \
             "Duplicate side effects found"
 
     @pytest.mark.data
-    def test_side_effect_names_standardized(self, data_dir):
+    def test_side_effect_names_standardized(self, validated_data):
         """Test that side effect names follow standardization."""
-        file_path = data_dir / "validated_side_effects_database.json"
-
-        if not file_path.exists():
+        if validated_data is None:
             pytest.skip("Validated side effects file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = validated_data
 
         for item in data:
             side_effect = item['side_effect']
@@ -172,10 +180,6 @@ class TestDataFileStructure:
 class TestLongTermDataValidation:
     """Validate long-term side effects data file."""
 
-    @pytest.fixture
-    def data_dir(self):
-        return Path(__file__).parent.parent / "data"
-
     @pytest.mark.data
     def test_long_term_file_exists(self, data_dir):
         """Test that long-term side effects file exists."""
@@ -184,15 +188,12 @@ class TestLongTermDataValidation:
             assert file_path.is_file()
 
     @pytest.mark.data
-    def test_long_term_structure(self, data_dir):
+    def test_long_term_structure(self, long_term_data):
         """Test long-term side effects structure."""
-        file_path = data_dir / "long_term_validated_side_effects.json"
-
-        if not file_path.exists():
+        if long_term_data is None:
             pytest.skip("Long-term data file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = long_term_data
 
         assert isinstance(data, list)
 
@@ -208,15 +209,12 @@ class TestLongTermDataValidation:
                 assert field in first_item, f"Missing required field: {field}"
 
     @pytest.mark.data
-    def test_clinical_significance_valid(self, data_dir):
+    def test_clinical_significance_valid(self, long_term_data):
         """Test that clinical significance values are valid."""
-        file_path = data_dir / "long_term_validated_side_effects.json"
-
-        if not file_path.exists():
+        if long_term_data is None:
             pytest.skip("Long-term data file not found")
 
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        data = long_term_data
 
         valid_significance = ["high", "moderate", "low"]
 
@@ -229,10 +227,6 @@ class TestLongTermDataValidation:
 class TestRedditPostsData:
     """Validate Reddit posts data file."""
 
-    @pytest.fixture
-    def data_dir(self):
-        return Path(__file__).parent.parent / "data"
-
     @pytest.mark.data
     def test_reddit_posts_structure(self, data_dir):
         """Test Reddit posts file structure if it exists."""
@@ -0,0 +1,50 @@
+"""
+Tests for Evidence Validator Module
+===================================
+Tests the on-disk PubMed result cache with a stubbed network.
+"""
+
+import sys
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("numpy")
+
+from src.validation.evidence_validator import EvidenceValidator
+
+
+class TestPubMedResultCache:
+    """Test suite for caching PubMed lookups per side effect."""
+
+    @pytest.fixture
+    def validator(self, tmp_path, monkeypatch):
+        """Create a validator caching to a scratch directory, with threaded (not aiohttp) searches."""
+        validator = EvidenceValidator(cache_dir=str(tmp_path / "cache"))
+        monkeypatch.setattr(sys.modules[type(validator.pubmed).__module__], "AIOHTTP_AVAILABLE", False)
+        validator.pubmed.rate_limit_delay = 0
+        validator.pubmed._bucket.refill_rate = 1e6
+        return validator
+
+    @pytest.mark.unit
+    def test_failed_lookups_not_cached(self, validator, tmp_path, monkeypatch):
+        """Test that a network failure (empty results) isn't cached as 'no papers'."""
+        def offline(*args, **kwargs):
+            raise ConnectionError("network unreachable")
+        monkeypatch.setattr(validator.pubmed.session, "get", offline)
+
+        results = validator.search_pubmed_for_side_effects(["acne", "hair loss"])
+        single = validator.search_pubmed_for_side_effect("anxiety")
+
+        assert [result['paper_count'] for result in results] == [0, 0]
+        assert single['paper_count'] == 0
+        assert not (tmp_path / "cache").exists()
+
+    @pytest.mark.unit
+    def test_successful_empty_lookups_cached(self, validator, tmp_path, monkeypatch):
+        """Test that a lookup that genuinely finds no papers is cached."""
+        monkeypatch.setattr(validator.pubmed.session, "get", lambda url, params=None, **kwargs: SimpleNamespace(
+            raise_for_status=lambda: None, json=lambda: {"esearchresult": {"idlist": []}}))
+
+        validator.search_pubmed_for_side_effects(["acne", "hair loss"])
+
+        assert len(list((tmp_path / "cache").iterdir())) == 2
@@ -0,0 +1,48 @@
+"""
+Tests for JSON I/O Helpers
+==========================
+Tests JSON round trips and atomic writes.
+"""
+
+import json
+import pytest
+from src.data_collection.json_io import read_json, write_json, write_jsonl, atomic_open
+
+
+class TestJsonIO:
+    """Test suite for the shared JSON read/write helpers."""
+
+    @pytest.mark.unit
+    def test_round_trip_keeps_unicode(self, tmp_path):
+        """Test that written JSON reads back unchanged and is stored as indented UTF-8."""
+        path = tmp_path / "data.json"
+        data = [{'side_effect': 'café au lait spots', 'count': 3}]
+
+        write_json(path, data)
+
+        assert read_json(path) == data
+        assert path.read_text(encoding='utf-8') == json.dumps(data, indent=2, ensure_ascii=False)
+
+    @pytest.mark.unit
+    def test_jsonl_one_record_per_line(self, tmp_path):
+        """Test that JSON Lines output has one compact record per line."""
+        path = tmp_path / "data.jsonl"
+        records = [{'a': 1}, {'b': [1, 2]}]
+
+        write_jsonl(path, records)
+
+        assert [json.loads(line) for line in path.read_text().splitlines()] == records
+
+    @pytest.mark.unit
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """Test that an error mid-write leaves the old file and no temp file behind."""
+        path = tmp_path / "data.json"
+        write_json(path, {'version': 1})
+
+        with pytest.raises(RuntimeError):
+            with atomic_open(path, 'wb') as f:
+                f.write(b'{"version": ')
+                raise RuntimeError("disk full")
+
+        assert read_json(path) == {'version': 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
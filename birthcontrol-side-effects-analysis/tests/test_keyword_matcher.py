@@ -0,0 +1,47 @@
+"""
+Tests for Keyword Matcher Module
+================================
+Tests whole-word and substring keyword matching with and without pyahocorasick.
+"""
+
+import pytest
+from src.data_collection import keyword_matcher
+from src.data_collection.keyword_matcher import KeywordMatcher
+
+
+@pytest.fixture(params=[True, False], ids=["ahocorasick", "regex"])
+def backend(request, monkeypatch):
+    """Run each test with the Aho-Corasick automaton and with the regex fallback."""
+    if request.param and not keyword_matcher.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(keyword_matcher, "AHOCORASICK_AVAILABLE", request.param)
+
+
+class TestKeywordMatcher:
+    """Test suite for the shared keyword matcher."""
+
+    @pytest.mark.unit
+    def test_whole_word_match(self, backend):
+        """Test that whole-word matching ignores case and partial words, in keyword order."""
+        matcher = KeywordMatcher(['Pain', 'acne', 'hair loss'])
+
+        assert matcher.match("Severe ACNE, hair loss and painful cramps") == ['acne', 'hair loss']
+        assert matcher.contains_any("painful") is False
+
+    @pytest.mark.unit
+    def test_substring_match(self, backend):
+        """Test that whole_words=False matches keywords inside longer words."""
+        matcher = KeywordMatcher(['pain', 'iud'], whole_words=False)
+
+        assert matcher.contains_any("painful periods") is True
+        assert matcher.contains_any("fluid retention") is False
+        assert matcher.match("IUD pain") == ['pain', 'iud']
+
+    @pytest.mark.unit
+    def test_no_keywords(self, backend):
+        """Test that a matcher without keywords finds nothing on either backend."""
+        for whole_words in (True, False):
+            matcher = KeywordMatcher([], whole_words=whole_words)
+
+            assert matcher.match("acne and hair loss") == []
+            assert matcher.contains_any("acne and hair loss") is False
@@ -0,0 +1,83 @@
+"""
+Tests for Long-Term Evidence Validator Module
+=============================================
+Tests merging of duplicate long-term side effect entries.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.validation.long_term_evidence_validator import (
+    LongTermEvidenceValidator,
+    DEFAULT_LONG_TERM_POSTS
+)
+
+
+class TestDeduplicateSideEffects:
+    """Test suite for merging duplicate side effect entries."""
+
+    @pytest.fixture
+    def validator(self):
+        """Create a quiet validator without a PubMed cache (no requests are made)."""
+        return LongTermEvidenceValidator(cache_dir=None, verbose=False)
+
+    @pytest.fixture
+    def side_effects(self):
+        """Three spellings of one side effect plus an unrelated entry."""
+        return [
+            {
+                'side_effect': 'mood swings', 'mention_count': 12, 'post_count': 10,
+                'category': 'mood', 'examples': ['a', 'b'],
+                'temporal_contexts': ['', 'after 5 years'],
+                'avg_years_when_appeared': 2.0, 'persists_after_stopping': None,
+                'severity_distribution': {'mild': 1}
+            },
+            {
+                'side_effect': 'mood-swing', 'mention_count': 30, 'post_count': 25,
+                'category': 'emotional', 'examples': ['b', 'c', 'd'],
+                'temporal_contexts': ['after 5 years', 'after 7 years', 'after 9 years'],
+                'avg_years_when_appeared': None, 'persists_after_stopping': False,
+                'severity_distribution': {'mild': 2, 'severe': 1}
+            },
+            {
+                'side_effect': 'mood swing', 'mention_count': 5, 'post_count': 5,
+                'examples': ['e'], 'temporal_contexts': ['after 10 years'],
+                'avg_years_when_appeared': 4.0, 'persists_after_stopping': True,
+                'severity_distribution': {'severe': 3}
+            },
+            {
+                'side_effect': 'hair loss', 'mention_count': 50, 'post_count': 45,
+                'category': 'physical'
+            },
+        ]
+
+    @pytest.mark.unit
+    def test_merges_spelling_variants(self, validator, side_effects):
+        """Test that a merged entry combines statistics from every variant."""
+        deduplicated = validator.deduplicate_side_effects(side_effects)
+
+        assert [effect['side_effect'] for effect in deduplicated] == ['hair loss', 'mood-swing']
+        assert deduplicated[1] == {
+            # Named after the most reported spelling
+            'side_effect': 'mood-swing',
+            'mention_count': 47,
+            'post_count': 40,
+            'frequency': round(40 / DEFAULT_LONG_TERM_POSTS, 3),
+            'category': 'mood',
+            # First 3 unique examples / non-empty contexts, in order
+            'examples': ['a', 'b', 'c'],
+            'temporal_contexts': ['after 5 years', 'after 7 years', 'after 9 years'],
+            # Mean of the entries that report it
+            'avg_years_when_appeared': 3.0,
+            # True if any entry says so
+            'persists_after_stopping': True,
+            'severity_distribution': {'mild': 3, 'severe': 4}
+        }
+
+    @pytest.mark.unit
+    def test_single_entries_unchanged(self, validator, side_effects):
+        """Test that an entry without duplicates is passed through as-is."""
+        deduplicated = validator.deduplicate_side_effects(side_effects)
+
+        assert deduplicated[0] is side_effects[3]
@@ -0,0 +1,301 @@
+"""
+Tests for PubMed Fetcher Module
+===============================
+Tests EFetch XML parsing and prevalence extraction without network access.
+"""
+
+import gzip
+import io
+import time
+import pytest
+from types import SimpleNamespace
+from urllib3.response import HTTPResponse
+from src.data_collection import pubmed_fetcher
+from src.data_collection.pubmed_fetcher import PubMedFetcher
+
+
+SAMPLE_EFETCH_XML = b"""<?xml version="1.0" ?>
+<PubmedArticleSet>
+<PubmedArticle>
+  <MedlineCitation>
+    <PMID Version="1">12345678</PMID>
+    <Article>
+      <Journal>
+        <Title>Contraception</Title>
+        <JournalIssue><PubDate><Year>2019</Year></PubDate></JournalIssue>
+      </Journal>
+      <ArticleTitle>Hormonal contraception and anxiety</ArticleTitle>
+      <Abstract>
+        <AbstractText Label="BACKGROUND">Anxiety is common.</AbstractText>
+        <AbstractText Label="RESULTS">23% of women reported anxiety on birth control.</AbstractText>
+      </Abstract>
+      <AuthorList>
+        <Author><LastName>Smith</LastName><ForeName>Jane</ForeName></Author>
+        <Author><LastName>Doe</LastName></Author>
+        <Author><CollectiveName>Study Group</CollectiveName></Author>
+        <Author><LastName>Lee</LastName><ForeName>Ann</ForeName></Author>
+      </AuthorList>
+    </Article>
+  </MedlineCitation>
+  <PubmedData>
+    <ArticleIdList>
+      <ArticleId IdType="pubmed">12345678</ArticleId>
+      <ArticleId IdType="doi">10.1000/xyz123</ArticleId>
+    </ArticleIdList>
+  </PubmedData>
+</PubmedArticle>
+<PubmedArticle>
+  <MedlineCitation>
+    <PMID Version="1">87654321</PMID>
+    <Article>
+      <Journal><Title>J Womens Health</Title></Journal>
+      <ArticleTitle>Acne outcomes</ArticleTitle>
+    </Article>
+  </MedlineCitation>
+</PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class TestPubMedXmlParsing:
+    """Test suite for EFetch XML parsing."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create a fetcher (no requests are made in these tests)."""
+        return PubMedFetcher()
+
+    @pytest.mark.unit
+    def test_parses_all_fields(self, fetcher):
+        """Test that every paper field is extracted from a full article."""
+        paper = fetcher._parse_pubmed_xml(SAMPLE_EFETCH_XML)[0]
+
+        assert paper == {
+            "pmid": "12345678",
+            "title": "Hormonal contraception and anxiety",
+            "abstract": "Anxiety is common. 23% of women reported anxiety on birth control.",
+            "authors": ["Jane Smith", "Doe"],
+            "year": "2019",
+            "journal": "Contraception",
+            "doi": "10.1000/xyz123",
+            "url": "https://pubmed.ncbi.nlm.nih.gov/12345678/"
+        }
+
+    @pytest.mark.unit
+    def test_missing_fields_default(self, fetcher):
+        """Test defaults for articles without abstract, authors, year or DOI."""
+        papers = fetcher._parse_pubmed_xml(SAMPLE_EFETCH_XML)
+
+        assert len(papers) == 2
+        assert papers[1]["pmid"] == "87654321"
+        assert papers[1]["abstract"] is None
+        assert papers[1]["authors"] == []
+        assert papers[1]["year"] is None
+        assert papers[1]["doi"] is None
+
+    @pytest.mark.unit
+    def test_parses_binary_stream(self, fetcher):
+        """Test that a streamed response body parses like in-memory bytes."""
+        streamed = fetcher._parse_pubmed_xml(io.BytesIO(SAMPLE_EFETCH_XML))
+
+        assert streamed == fetcher._parse_pubmed_xml(SAMPLE_EFETCH_XML)
+
+    @pytest.mark.unit
+    def test_parses_gzip_encoded_stream(self, fetcher):
+        """Test that a gzip-encoded EFetch body is decoded inline while parsing."""
+        raw = HTTPResponse(
+            body=io.BytesIO(gzip.compress(SAMPLE_EFETCH_XML)),
+            headers={"Content-Encoding": "gzip"},
+            preload_content=False
+        )
+        raw.decode_content = True
+
+        assert fetcher._parse_pubmed_xml(raw) == fetcher._parse_pubmed_xml(SAMPLE_EFETCH_XML)
+
+    @pytest.mark.unit
+    def test_malformed_xml_returns_empty(self, fetcher):
+        """Test that truncated XML is reported rather than raised."""
+        assert fetcher._parse_pubmed_xml(b"<PubmedArticleSet><PubmedArticle>") == []
+
+    @pytest.mark.unit
+    def test_truncated_xml_keeps_complete_articles(self):
+        """Test that a document cut off mid-article keeps earlier articles but is flagged partial."""
+        truncated = SAMPLE_EFETCH_XML[:SAMPLE_EFETCH_XML.index(b"<PMID Version=\"1\">87654321")]
+
+        papers, complete = pubmed_fetcher._parse_efetch_xml(truncated)
+
+        assert [paper["pmid"] for paper in papers] == ["12345678"]
+        assert complete is False
+        assert pubmed_fetcher._parse_efetch_xml(SAMPLE_EFETCH_XML)[1] is True
+
+
+class TestPrevalenceExtraction:
+    """Test suite for prevalence extraction from abstracts."""
+
+    @pytest.fixture
+    def fetcher(self):
+        """Create a fetcher (no requests are made in these tests)."""
+        return PubMedFetcher()
+
+    @pytest.mark.unit
+    def test_extracts_relevant_percentages(self, fetcher):
+        """Test that percentages near the side effect or birth control are kept."""
+        paper = {
+            "pmid": "1",
+            "title": "Test",
+            "abstract": (
+                "Among oral contraceptive users, 23% of women reported Anxiety. "
+                "Unrelated filler text that is long enough to push the next number "
+                "well outside any context window: 41.5% of participants were smokers."
+            )
+        }
+
+        result = fetcher.extract_prevalence_data(paper, "anxiety")
+
+        assert result["pmid"] == "1"
+        assert [m["percentage"] for m in result["prevalence_mentions"]] == [23.0]
+        assert "23% of women reported anxiety" in result["prevalence_mentions"][0]["context"]
+
+    @pytest.mark.unit
+    def test_no_abstract_or_no_match(self, fetcher):
+        """Test that papers without abstracts or relevant numbers return None."""
+        assert fetcher.extract_prevalence_data({"abstract": None}, "acne") is None
+        assert fetcher.extract_prevalence_data(
+            {"pmid": "2", "title": "T", "abstract": "No numbers about acne here."}, "acne"
+        ) is None
+
+
+class TestDiskCache:
+    """Test suite for the on-disk response cache."""
+
+    @pytest.fixture
+    def fetcher(self, tmp_path):
+        """Create a fetcher caching to a scratch directory."""
+        return PubMedFetcher(cache_dir=str(tmp_path / "cache"))
+
+    @pytest.mark.unit
+    def test_round_trip_and_expiry(self, fetcher):
+        """Test that cached values are returned until their TTL passes."""
+        fetcher._cache_set("pm:search:abc", 60, ["1", "2"])
+        assert fetcher._cache_get("pm:search:abc") == ["1", "2"]
+
+        fetcher._cache_set("pm:search:old", -1, ["3"])
+        assert fetcher._cache_get("pm:search:old") is None
+        assert fetcher._cache_get("pm:search:missing") is None
+
+    @pytest.mark.unit
+    def test_search_served_from_cache(self, fetcher, monkeypatch):
+        """Test that a repeated search doesn't hit the network."""
+        params = fetcher._search_params("pill acne", 5, 2010)
+        fetcher._cache_set(fetcher._cache_key("search", params), 60, ["42"])
+
+        def offline(*args, **kwargs):
+            raise AssertionError("network access")
+        monkeypatch.setattr(fetcher.session, "get", offline)
+
+        assert fetcher.search_papers("pill acne", max_results=5, min_year=2010) == ["42"]
+
+
+class TestRateLimiting:
+    """Test suite for the fetcher's shared request rate limit."""
+
+    @pytest.fixture
+    def fetcher(self, monkeypatch):
+        """Create a keyed fetcher (10 requests/s) whose ESearch calls are recorded, not sent."""
+        fetcher = PubMedFetcher(api_key="test-key")
+        sent = []
+
+        def fake_get(url, params=None, **kwargs):
+            sent.append(time.monotonic())
+            return SimpleNamespace(raise_for_status=lambda: None,
+                                   json=lambda: {"esearchresult": {"idlist": []}})
+
+        monkeypatch.setattr(fetcher.session, "get", fake_get)
+        monkeypatch.setattr(pubmed_fetcher, "AIOHTTP_AVAILABLE", False)
+        fetcher.sent = sent
+        return fetcher
+
+    @pytest.mark.unit
+    def test_no_burst_across_calls(self, fetcher):
+        """Test that back-to-back threaded searches share one bucket with no initial burst."""
+        fetcher.search_papers_many(["a", "b", "c"])
+        fetcher.search_papers_many(["d", "e", "f"])
+
+        sent = sorted(fetcher.sent)
+        assert len(sent) == 6
+        # Five gaps of 0.1s: at most one request goes out without waiting
+        assert sent[-1] - sent[0] >= 5 * fetcher.rate_limit_delay * 0.9
+
+    @pytest.mark.unit
+    def test_retries_take_tokens(self):
+        """Test that the session's urllib3 retries draw from the fetcher's bucket."""
+        fetcher = PubMedFetcher(api_key="test-key")
+        retry = fetcher.session.get_adapter("https://eutils.ncbi.nlm.nih.gov").max_retries
+        acquired = []
+        fetcher._bucket.acquire = lambda n=1: acquired.append(n)
+
+        # urllib3 copies the Retry for every attempt
+        retry.new(total=2).sleep()
+
+        assert acquired == [1]
+
+
+class TestBatchedFetch:
+    """Test suite for fetching several EFetch batches."""
+
+    @pytest.mark.unit
+    def test_small_batches_parsed_in_process(self, monkeypatch):
+        """Test that a few small batches are parsed without starting worker processes."""
+        fetcher = PubMedFetcher(api_key="test-key")
+        monkeypatch.setattr(fetcher.session, "get", lambda url, params=None, **kwargs: SimpleNamespace(
+            raise_for_status=lambda: None, content=SAMPLE_EFETCH_XML))
+
+        def no_processes(*args, **kwargs):
+            raise AssertionError("worker processes started")
+        monkeypatch.setattr(pubmed_fetcher, "ProcessPoolExecutor", no_processes)
+
+        papers = fetcher._fetch_batches([["12345678", "87654321"], ["1"]])
+
+        assert [paper["pmid"] for paper in papers] == ["12345678", "87654321"] * 2
+
+    @pytest.mark.unit
+    def test_large_downloads_parsed_in_workers(self, monkeypatch):
+        """Test that downloads above PARSE_PROCESS_MIN_BYTES are parsed in worker processes."""
+        fetcher = PubMedFetcher(api_key="test-key")
+        fetcher.PARSE_PROCESS_MIN_BYTES = 1
+        monkeypatch.setattr(pubmed_fetcher.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(fetcher.session, "get", lambda url, params=None, **kwargs: SimpleNamespace(
+            raise_for_status=lambda: None, content=SAMPLE_EFETCH_XML))
+
+        papers = fetcher._fetch_batches([["12345678", "87654321"], ["1"]])
+
+        assert [paper["pmid"] for paper in papers] == ["12345678", "87654321"] * 2
+
+    @pytest.mark.unit
+    def test_truncated_batch_not_cached(self, tmp_path, monkeypatch):
+        """Test that a batch whose XML was cut off is returned but not cached."""
+        fetcher = PubMedFetcher(api_key="test-key", cache_dir=str(tmp_path / "cache"))
+        truncated = SAMPLE_EFETCH_XML[:SAMPLE_EFETCH_XML.index(b"<PMID Version=\"1\">87654321")]
+        body = {"xml": truncated}
+
+        class StreamedResponse:
+            def __init__(self):
+                self.raw = io.BytesIO(body["xml"])
+                self.content = body["xml"]
+            def __enter__(self):
+                return self
+            def __exit__(self, *exc):
+                return False
+            def raise_for_status(self):
+                pass
+
+        monkeypatch.setattr(fetcher.session, "get", lambda url, params=None, **kwargs: StreamedResponse())
+
+        assert [paper["pmid"] for paper in fetcher._fetch_batch(["12345678", "87654321"])] == ["12345678"]
+        assert [paper["pmid"] for paper in fetcher._fetch_batches([["12345678", "87654321"], ["1"]])] == ["12345678"] * 2
+        assert not (tmp_path / "cache").exists()
+
+        # A complete response is cached as before
+        body["xml"] = SAMPLE_EFETCH_XML
+        fetcher._fetch_batch(["12345678", "87654321"])
+        assert len(list((tmp_path / "cache").iterdir())) == 1
@@ -0,0 +1,432 @@
+"""
+Tests for PubMed Relevance Checker Module
+=========================================
+Tests assessment caching and result handling with a stubbed OpenAI client.
+"""
+
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("openai")
+
+from src.validation.pubmed_relevance_checker import PubMedRelevanceChecker
+
+
+class StubCompletions:
+    """Records requests and replies with a fixed relevance score."""
+
+    def __init__(self, score):
+        self.score = score
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        content = json.dumps({
+            'is_relevant': self.score >= 0.7,
+            'relevance_score': self.score,
+            'reason': 'Studies the side effect in pill users.',
+            'connection': 'Reports rates in oral contraceptive users.'
+        })
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class TestRelevanceCache:
+    """Test suite for the on-disk assessment cache."""
+
+    @pytest.fixture
+    def paper(self):
+        """A paper as stored in the validated database."""
+        return {
+            'pmid': '12345678',
+            'title': 'Oral contraceptive use and acne',
+            'abstract': 'Acne was reported by 12% of combined pill users.'
+        }
+
+    @pytest.fixture
+    def checker(self, tmp_path):
+        """Create a checker with a stub client caching to a scratch directory."""
+        checker = PubMedRelevanceChecker(api_key="test-key", cache_dir=str(tmp_path / "cache"))
+        checker.client = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions(0.9)))
+        return checker
+
+    @pytest.mark.unit
+    def test_repeat_assessment_served_from_cache(self, checker, paper):
+        """Test that a repeated (side effect, paper) pair doesn't call the API."""
+        first = checker.assess_relevance("acne", paper)
+        second = checker.assess_relevance("acne", paper)
+
+        assert first == second
+        assert first['relevance_score'] == 0.9
+        assert first['pmid'] == '12345678'
+        assert len(checker.client.chat.completions.requests) == 1
+        assert checker.stats == {'hits': 1, 'misses': 1}
+
+    @pytest.mark.unit
+    def test_cache_keyed_on_side_effect(self, checker, paper):
+        """Test that the same paper is assessed separately per side effect."""
+        checker.assess_relevance("acne", paper)
+        checker.assess_relevance("anxiety", paper)
+
+        assert len(checker.client.chat.completions.requests) == 2
+
+    @pytest.mark.unit
+    def test_errors_are_not_cached(self, checker, paper):
+        """Test that a failed call is retried on the next run."""
+        def failing(**request):
+            raise RuntimeError("service unavailable")
+        checker.client.chat.completions.create = failing
+
+        assessment = checker.assess_relevance("acne", paper)
+        assert assessment['is_relevant'] is False
+        assert assessment['relevance_score'] == 0.0
+
+        checker.client.chat.completions = StubCompletions(0.8)
+        assert checker.assess_relevance("acne", paper)['relevance_score'] == 0.8
+
+
+class TestKeywordPrefilter:
+    """Test suite for the birth control keyword prefilter."""
+
+    @pytest.fixture
+    def checker(self):
+        """Create a checker with a stub client and no cache."""
+        checker = PubMedRelevanceChecker(api_key="test-key", cache_dir=None)
+        checker.client = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions(0.9)))
+        return checker
+
+    @pytest.mark.unit
+    def test_rejects_papers_without_birth_control_terms(self, checker):
+        """Test that papers never mentioning birth control skip the API."""
+        paper = {'pmid': '1', 'title': 'Timing of pregnancy and anxiety', 'abstract': 'Pregnant women.'}
+
+        assessment = checker.assess_relevance("anxiety", paper)
+
+        assert assessment['is_relevant'] is False
+        assert assessment['relevance_score'] == 0.0
+        assert checker.client.chat.completions.requests == []
+        assert checker.prefiltered == 1
+
+    @pytest.mark.unit
+    def test_async_path_matches_sync(self, checker):
+        """Test that the async path rejects the same papers without creating a client."""
+        paper = {'pmid': '1', 'title': 'Timing of pregnancy and anxiety', 'abstract': 'Pregnant women.'}
+
+        def get_client():
+            raise AssertionError("prefiltered paper should not need a client")
+
+        sync_assessment = checker.assess_relevance("anxiety", paper)
+        async_assessment = asyncio.run(checker._assess_relevance_async(get_client, "anxiety", paper))
+
+        assert async_assessment == sync_assessment
+        assert checker.prefiltered == 2
+
+    @pytest.mark.unit
+    def test_keeps_papers_naming_a_method_or_hormone(self, checker):
+        """Test that drug and method names count as birth control terms."""
+        titles = [
+            'Drospirenone and venous thromboembolism',
+            'Depression after LNG-IUS insertion',
+            'Mood in DMPA users',
+        ]
+        for title in titles:
+            checker.assess_relevance("depression", {'pmid': '2', 'title': title, 'abstract': ''})
+
+        assert len(checker.client.chat.completions.requests) == len(titles)
+        assert checker.prefiltered == 0
+
+    @pytest.mark.unit
+    def test_keeps_papers_naming_abbreviations_or_brands(self, checker):
+        """Test that title-only records using COC/OCP/OC/LARC or a brand name reach the model."""
+        titles = [
+            'Depression among COC users',
+            'OCP use and acne',
+            'Acne in women taking OCs',
+            'LARC users and weight gain',
+            'Yasmin and mood',
+        ]
+        for title in titles:
+            checker.assess_relevance("depression", {'pmid': '3', 'title': title, 'abstract': None})
+
+        assert len(checker.client.chat.completions.requests) == len(titles)
+        assert checker.prefiltered == 0
+
+
+class StubBulkCompletions(StubCompletions):
+    """Replies to the first (bulk) request with fixed content, then per paper with a fixed score."""
+
+    def __init__(self, bulk_content, score):
+        super().__init__(score)
+        self.bulk_content = bulk_content
+
+    def create(self, **request):
+        if self.requests:
+            return super().create(**request)
+        self.requests.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.bulk_content))])
+
+
+def bulk_reply(*indices):
+    """Bulk reply with a relevant result for each paper_index (None leaves it out)."""
+    results = []
+    for index in indices:
+        result = {'is_relevant': True, 'relevance_score': 0.9, 'reason': 'r', 'connection': 'c'}
+        if index is not None:
+            result['paper_index'] = index
+        results.append(result)
+    return json.dumps({'results': results})
+
+
+class TestBulkAssessments:
+    """Test suite for matching multi-paper replies back to their papers."""
+
+    @pytest.fixture
+    def papers(self):
+        """Three birth control papers."""
+        return [
+            {'pmid': str(i), 'title': f'Oral contraceptives and acne {i}', 'abstract': ''}
+            for i in range(3)
+        ]
+
+    @pytest.fixture
+    def checker(self):
+        """Create a checker without a cache."""
+        return PubMedRelevanceChecker(api_key="test-key", cache_dir=None)
+
+    @pytest.mark.unit
+    def test_results_matched_by_paper_index(self, papers):
+        """Test that out-of-order results are assigned to the paper they name."""
+        content = json.dumps({'results': [
+            {'paper_index': 3, 'relevance_score': 0.3},
+            {'paper_index': 1, 'relevance_score': 0.9},
+            {'paper_index': 2, 'relevance_score': 0.6},
+        ]})
+
+        assessments = PubMedRelevanceChecker._parse_bulk_assessments(content, papers)
+
+        assert [(a['pmid'], a['relevance_score']) for a in assessments] == [('0', 0.9), ('1', 0.6), ('2', 0.3)]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content", [
+        bulk_reply(1, None, 3),   # missing paper_index
+        bulk_reply(1, 2, 4),      # out of range
+        bulk_reply(1, 2, 3, 4),   # extra, out of range
+        bulk_reply(1, 1, 2),      # duplicate, one paper missing
+        bulk_reply(1, 2, 2, 3),   # duplicate, every paper present
+        '{"results": [{"paper_index": 1,',  # malformed JSON
+    ], ids=["missing", "out-of-range", "extra", "duplicate", "duplicate-complete", "malformed"])
+    def test_bad_reply_falls_back_to_per_paper(self, checker, papers, content):
+        """Test that each paper gets its own assessment when the bulk reply can't be trusted."""
+        with pytest.raises(ValueError):
+            PubMedRelevanceChecker._parse_bulk_assessments(content, papers)
+
+        checker.client = SimpleNamespace(chat=SimpleNamespace(completions=StubBulkCompletions(content, 0.5)))
+
+        assessments = checker.assess_papers_bulk("acne", papers)
+
+        requests = checker.client.chat.completions.requests
+        assert len(requests) == 1 + len(papers)
+        for paper, request in zip(papers, requests[1:]):
+            assert paper['title'] in request['messages'][-1]['content']
+        assert [(a['pmid'], a['relevance_score']) for a in assessments] == [('0', 0.5), ('1', 0.5), ('2', 0.5)]
+
+
+class TestTargetRelevant:
+    """Test suite for stopping once enough relevant papers are found."""
+
+    @pytest.fixture
+    def checker(self):
+        """Create a checker that stops after 2 relevant papers, one request per round."""
+        checker = PubMedRelevanceChecker(api_key="test-key", cache_dir=None,
+                                         max_concurrent_requests=1, target_relevant=2)
+        checker.client = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions(0.9)))
+        # Assess through the sync stub client instead of an async one
+        checker._assess_many = lambda jobs: [
+            [checker.assess_relevance(side_effect, paper) for paper in papers]
+            for side_effect, papers in jobs
+        ]
+        return checker
+
+    @pytest.mark.unit
+    def test_stops_after_target_reached(self, checker):
+        """Test that papers after the target are left unassessed and dropped."""
+        papers = [
+            {'pmid': str(i), 'title': f'Oral contraceptives and acne {i}', 'abstract': ''}
+            for i in range(5)
+        ]
+
+        relevant = checker.assess_paper_list("acne", papers)
+
+        assert [paper['pmid'] for paper in relevant] == ['0', '1']
+        assert len(checker.client.chat.completions.requests) == 2
+        assert checker.unassessed == 3
+
+
+class StubBatchClient:
+    """Stands in for the OpenAI Files and Batches APIs."""
+
+    def __init__(self, statuses, output_lines=None):
+        # Batch status after creation and after each poll
+        self.statuses = list(statuses)
+        self.output_lines = output_lines
+        self.uploads = []
+        self.polls = 0
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def _batch(self):
+        status = self.statuses[min(self.polls, len(self.statuses) - 1)]
+        output_file_id = "file-out" if self.output_lines is not None else None
+        return SimpleNamespace(id="batch-1", status=status, output_file_id=output_file_id)
+
+    def _create_file(self, file, purpose):
+        self.uploads.append((purpose, [json.loads(line) for line in file.read().splitlines()]))
+        return SimpleNamespace(id="file-in")
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert input_file_id == "file-in"
+        return self._batch()
+
+    def _retrieve_batch(self, batch_id):
+        self.polls += 1
+        return self._batch()
+
+    def _file_content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(line) for line in self.output_lines))
+
+
+def batch_output_line(custom_id, score, status_code=200):
+    """One line of a Batch API output file."""
+    content = json.dumps({'is_relevant': score >= 0.7, 'relevance_score': score,
+                          'reason': 'r', 'connection': 'c'})
+    body = {'choices': [{'message': {'content': content}}]} if status_code == 200 else {}
+    return {'custom_id': custom_id, 'response': {'status_code': status_code, 'body': body}}
+
+
+class TestBatchAPI:
+    """Test suite for assessing papers as one OpenAI Batch API job."""
+
+    @pytest.fixture
+    def papers(self):
+        """Three birth control papers."""
+        return [
+            {'pmid': str(i), 'title': f'Oral contraceptives and acne {i}', 'abstract': ''}
+            for i in range(3)
+        ]
+
+    @pytest.fixture
+    def checker(self, tmp_path):
+        """Create a checker caching to a scratch directory that doesn't wait between polls."""
+        checker = PubMedRelevanceChecker(api_key="test-key", cache_dir=str(tmp_path / "cache"))
+        checker.BATCH_POLL_INTERVAL = 0
+        return checker
+
+    @pytest.mark.unit
+    def test_results_mapped_back_by_custom_id(self, checker, papers):
+        """Test the uploaded JSONL, polling until done, and out-of-order results."""
+        checker.client = StubBatchClient(
+            ["validating", "in_progress", "completed"],
+            # Output order doesn't follow input order; paper 1's request failed
+            [batch_output_line("2", 0.3), batch_output_line("1", 0.0, status_code=500),
+             batch_output_line("0", 0.9)]
+        )
+
+        assessments = checker.assess_relevance_batched("acne", papers)
+
+        [(purpose, lines)] = checker.client.uploads
+        assert purpose == "batch"
+        assert [line['custom_id'] for line in lines] == ["0", "1", "2"]
+        assert all(line['method'] == "POST" and line['url'] == "/v1/chat/completions" for line in lines)
+        assert lines[0]['body'] == checker._build_request("acne", papers[0])
+        assert checker.client.polls == 2
+
+        assert [a['pmid'] for a in assessments] == ['0', '1', '2']
+        assert [a['relevance_score'] for a in assessments] == [0.9, 0.0, 0.3]
+        assert assessments[1]['reason'].startswith("Error during assessment")
+
+    @pytest.mark.unit
+    def test_only_successful_results_cached(self, checker, papers):
+        """Test that a rerun serves successes from the cache and resubmits only the failure."""
+        checker.client = StubBatchClient(
+            ["completed"],
+            [batch_output_line("0", 0.9), batch_output_line("1", 0.0, status_code=500),
+             batch_output_line("2", 0.3)]
+        )
+        checker.assess_relevance_batched("acne", papers)
+
+        checker.client = StubBatchClient(["completed"], [batch_output_line("1", 0.8)])
+        assessments = checker.assess_relevance_batched("acne", papers)
+
+        [(_, lines)] = checker.client.uploads
+        assert [line['custom_id'] for line in lines] == ["1"]
+        assert lines[0]['body'] == checker._build_request("acne", papers[1])
+        assert [a['relevance_score'] for a in assessments] == [0.9, 0.8, 0.3]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("status", ["failed", "expired"])
+    def test_unfinished_job(self, checker, papers, status):
+        """Test that a job ending without output gives every paper an error assessment."""
+        checker.client = StubBatchClient(["in_progress", status])
+
+        assessments = checker.assess_relevance_batched("acne", papers)
+
+        assert checker.client.polls == 1
+        assert [a['pmid'] for a in assessments] == ['0', '1', '2']
+        assert all(a['relevance_score'] == 0.0 and a['is_relevant'] is False for a in assessments)
+        assert all("no result in batch output" in a['reason'] for a in assessments)
+
+    @pytest.mark.unit
+    def test_expired_job_keeps_partial_output(self, checker, papers):
+        """Test that requests finished before a job expired are still used."""
+        checker.client = StubBatchClient(["expired"], [batch_output_line("1", 0.9)])
+
+        assessments = checker.assess_relevance_batched("acne", papers)
+
+        assert [a['relevance_score'] for a in assessments] == [0.0, 0.9, 0.0]
+
+
+class AsyncStubClient:
+    """Async client replying with a score looked up by paper title."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **request):
+        self.requests.append(request)
+        prompt = request['messages'][-1]['content']
+        score = next(score for title, score in self.scores.items() if title in prompt)
+        content = json.dumps({'is_relevant': score >= 0.7, 'relevance_score': score,
+                              'reason': f"{request['model']} verdict", 'connection': ''})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def close(self):
+        pass
+
+
+class TestJudge:
+    """Test suite for re-assessing borderline papers with a judge model."""
+
+    @pytest.mark.unit
+    def test_borderline_verdict_replaced_by_judge(self):
+        """Test that only a paper scored in uncertainty_band goes to the judge, whose verdict is kept."""
+        papers = [
+            {'pmid': '1', 'title': 'Oral contraceptives and acne', 'abstract': ''},
+            {'pmid': '2', 'title': 'Pill use and acne severity', 'abstract': ''},
+        ]
+        checker = PubMedRelevanceChecker(api_key="test-key", cache_dir=None, judge_model="gpt-4o")
+        primary = AsyncStubClient({papers[0]['title']: 0.9, papers[1]['title']: 0.5})
+        judge = AsyncStubClient({papers[1]['title']: 0.8})
+        checker._async_client = lambda: primary
+        checker.judge._async_client = lambda: judge
+
+        relevant = checker.assess_paper_list("acne", papers)
+
+        assert [request['model'] for request in judge.requests] == ["gpt-4o"]
+        assert papers[1]['title'] in judge.requests[0]['messages'][-1]['content']
+        assert [(paper['pmid'], paper['relevance_score'], paper['relevance_reason']) for paper in relevant] == [
+            ('1', 0.9, "gpt-4o-mini verdict"),
+            ('2', 0.8, "gpt-4o verdict"),
+        ]
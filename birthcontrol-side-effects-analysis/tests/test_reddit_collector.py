@@ -0,0 +1,45 @@
+"""
+Tests for Reddit Collector Module
+=================================
+Tests post extraction and saving without connecting to Reddit.
+"""
+
+import sys
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("praw")
+
+from src.data_collection.reddit_collector import RedditCollector
+
+
+class TestSavePosts:
+    """Test suite for saving collected posts."""
+
+    @pytest.fixture
+    def collector(self, tmp_path, monkeypatch):
+        """Create a collector without Reddit credentials that saves into tmp_path."""
+        collector = RedditCollector.__new__(RedditCollector)
+        # The collector imports config via sys.path, not as src.config
+        config = sys.modules[RedditCollector.__module__].Config
+        monkeypatch.setattr(config, "RAW_DATA_DIR", tmp_path)
+        return collector
+
+    @pytest.mark.unit
+    def test_missing_score(self, collector, tmp_path, capsys):
+        """Test that a post whose listing had no score is saved and counted as 0."""
+        listing = SimpleNamespace(
+            id='abc123', created_utc=1700000000, title='Acne on the pill',
+            selftext='Breakouts since starting', subreddit='birthcontrol',
+            permalink='/r/birthcontrol/comments/abc123/'
+        )
+        posts = [
+            collector._extract_post_data(listing, include_comments=False),
+            {'text_length': 10, 'score': 4},
+        ]
+        assert posts[0]['score'] is None
+
+        collector.save_posts(posts, "posts.json")
+
+        assert (tmp_path / "posts.json").exists()
+        assert "Average post score: 2.0" in capsys.readouterr().out
@@ -7,6 +7,7 @@ Tests the standardization of side effect names to canonical forms.
 import pytest
 from src.analysis.side_effect_standardization import (
     standardize_side_effect,
+    variant_key,
     STANDARDIZATION_RULES
 )
 
@@ -188,3 +189,17 @@ class TestSideEffectStandardization:
             second_pass = standardize_side_effect(first_pass)
             assert first_pass == second_pass, \
                 "Standardization should be idempotent"
+
+    @pytest.mark.unit
+    def test_variant_key_groups_spelling_variants(self):
+        """Test that punctuation, case and plural variants share a key."""
+        assert variant_key("Mood-Swing") == variant_key("mood swings")
+        assert variant_key("heavy-flow") == variant_key("heavy  flow")
+        assert variant_key("headaches") == variant_key("headache")
+        assert variant_key("hair loss") == "hair loss"
+
+    @pytest.mark.unit
+    def test_variant_key_keeps_distinct_terms_apart(self):
+        """Test that near-identical but different side effects are not merged."""
+        assert variant_key("increased libido") != variant_key("decreased libido")
+        assert variant_key("weight gain") != variant_key("weight loss")
@@ -0,0 +1,139 @@
+"""
+Tests for Statistical Validator Module
+======================================
+Tests data loading and statistical calculations on validated side effects.
+"""
+
+import pytest
+import json
+
+pytest.importorskip("scipy")
+pytest.importorskip("statsmodels")
+
+from src.analysis.statistical_validator import StatisticalValidator
+
+
+def _make_entry(name, frequency, mention_count, paper_count, surprise_score, tier, category=None):
+    """Build a validated database entry in the evidence validator's format."""
+    reddit_data = {
+        'frequency': frequency,
+        'mention_count': mention_count,
+        'post_count': mention_count
+    }
+    if category is not None:
+        reddit_data['category'] = category
+
+    return {
+        'side_effect': name,
+        'reddit_data': reddit_data,
+        'pubmed_data': {'paper_count': paper_count},
+        'surprise_score': surprise_score,
+        'evidence_tier': tier,
+        'tier_label': f"Tier {tier}"
+    }
+
+
+class TestStatisticalValidator:
+    """Test suite for the statistical validator."""
+
+    @pytest.fixture
+    def validated_file(self, tmp_path, monkeypatch):
+        """Write a small validated database and run from a scratch directory."""
+        monkeypatch.chdir(tmp_path)
+        entries = [
+            _make_entry('acne', 0.30, 160, 40, 0.05, 1, category='skin'),
+            _make_entry('hair loss', 0.12, 65, 12, 0.15, 2),
+            _make_entry('brain fog', 0.08, 43, 1, 0.45, 3),
+            _make_entry('anxiety', 0.20, 107, 25, 0.08, 1, category='mood'),
+            _make_entry('joint pain', 0.05, 27, 0, 0.60, 4),
+        ]
+        file_path = tmp_path / "validated.json"
+        file_path.write_text(json.dumps(entries))
+        return file_path
+
+    @pytest.mark.unit
+    def test_dataframe_columns(self, validated_file):
+        """Test that the validator flattens entries into the expected columns."""
+        validator = StatisticalValidator(str(validated_file))
+
+        assert list(validator.df.columns) == [
+            'side_effect', 'patient_frequency', 'mention_count', 'post_count',
+            'paper_count', 'surprise_score', 'evidence_tier', 'tier_label', 'category'
+        ]
+        assert len(validator.df) == 5
+        assert validator.df['paper_count'].tolist() == [40, 12, 1, 25, 0]
+
+    @pytest.mark.unit
+    def test_missing_category_defaults_to_unknown(self, validated_file):
+        """Test that entries without a category are labelled 'unknown'."""
+        validator = StatisticalValidator(str(validated_file))
+
+        assert validator.df['category'].tolist() == ['skin', 'unknown', 'unknown', 'mood', 'unknown']
+
+    @pytest.mark.unit
+    def test_missing_file_raises(self, tmp_path):
+        """Test that a missing database path raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            StatisticalValidator(str(tmp_path / "missing.json"))
+
+    @pytest.mark.unit
+    def test_total_posts_loaded_once(self, validated_file, tmp_path):
+        """Test that total_posts comes from the stats file, defaulting to 537."""
+        assert StatisticalValidator(str(validated_file)).total_posts == 537
+
+        stats_file = tmp_path / "stats.json"
+        stats_file.write_text(json.dumps({'total_posts': 1200}))
+        validator = StatisticalValidator(str(validated_file), stats_path=str(stats_file))
+
+        assert validator.total_posts == 1200
+
+    @pytest.mark.unit
+    def test_spearman_matches_scipy(self):
+        """Test that the rank-based Spearman matches scipy.stats.spearmanr."""
+        from scipy.stats import spearmanr
+
+        x = [0.30, 0.12, 0.08, 0.20, 0.05, 0.12, 0.01]
+        y = [40, 12, 1, 25, 0, 7, 3]
+
+        rho, p_value = StatisticalValidator._spearman(x, y)
+        expected_rho, expected_p = spearmanr(x, y)
+
+        assert rho == pytest.approx(expected_rho)
+        assert p_value == pytest.approx(expected_p)
+
+    @pytest.mark.unit
+    def test_contingency_table_bins(self, tmp_path, monkeypatch):
+        """Test surprise bins are right-inclusive and unobserved bins are dropped."""
+        monkeypatch.chdir(tmp_path)
+        entries = [
+            _make_entry('a', 0.1, 10, 5, 0.10, 1),
+            _make_entry('b', 0.1, 10, 5, 0.05, 2),
+            _make_entry('c', 0.1, 10, 5, 0.30, 1),
+            _make_entry('d', 0.1, 10, 5, 0.20, 2),
+        ]
+        file_path = tmp_path / "validated.json"
+        file_path.write_text(json.dumps(entries))
+
+        result = StatisticalValidator(str(file_path)).evidence_tier_contingency_test()
+
+        assert result['contingency_table'] == {
+            'Low': {1: 1, 2: 1},
+            'Medium': {1: 1, 2: 1}
+        }
+
+    @pytest.mark.unit
+    def test_spearman_skips_constant_input(self, tmp_path, monkeypatch):
+        """Test that constant research coverage skips the correlation and plot."""
+        monkeypatch.chdir(tmp_path)
+        entries = [
+            _make_entry(f"effect {i}", 0.05 * (i + 1), 10 * (i + 1), 0, 0.5, 4)
+            for i in range(5)
+        ]
+        file_path = tmp_path / "validated.json"
+        file_path.write_text(json.dumps(entries))
+
+        result = StatisticalValidator(str(file_path)).spearman_correlation_analysis()
+
+        assert result['skipped'] == "constant input"
+        assert result['significant'] is False
+        assert not (tmp_path / "data" / "analysis" / "correlation_analysis.png").exists()